@@ -0,0 +1,16 @@
+import os
+
+from utt.api import _v1
+
+
+class FooHookHandler:
+    def __call__(self, entries):
+        with open(os.path.expanduser("~/foo-hook.log"), "a") as hook_file:
+            for entry in entries:
+                print(f"Added: {entry}", file=hook_file)
+
+
+foo_hook = _v1.Hook(name="foo", handler_class=FooHookHandler)
+
+
+_v1.register_hook(foo_hook)
@@ -0,0 +1,29 @@
+import os
+import tempfile
+
+from utt.components.entry_lines import EntryLines
+
+# Lines of a data file, as `add` writes them
+LINES = [
+    "2014-03-14 08:00 hello\n",
+    "2014-03-14 09:00 hard work\n",
+    "\n",
+    "2014-03-17 09:00 hello\n",
+    "2014-03-17 10:15 hard work\n",
+    "\n",
+    "2014-03-19 09:00 hello\n",
+    "2014-03-19 12:00 asd: A-526\n",
+    "2014-03-19 13:00 lunch**\n",
+    "\n",
+    "2014-03-20 09:00 hello\n",
+    "2014-03-20 10:00 qwer: b-73\n",
+]
+
+
+def temporary_entry_lines(test_case, lines):
+    """Lines of a temporary data file holding `lines`, removed once `test_case` is done."""
+    fd, filename = tempfile.mkstemp()
+    with os.fdopen(fd, "wb") as data_file:
+        data_file.writelines(line.encode() if isinstance(line, str) else line for line in lines)
+    test_case.addCleanup(os.unlink, filename)
+    return EntryLines(filename)
@@ -0,0 +1,54 @@
+import datetime
+import unittest
+
+import pytz
+
+from utt.components.check_log import LogCheck, check_chunk
+from utt.components.entry_parser import EntryParser
+
+from .fixtures import temporary_entry_lines
+
+MAX_GAP = datetime.timedelta(hours=12)
+
+LINES = [
+    b"2014-03-14 08:00 hello\n",
+    b"2014-03-14 09:00 hard work\n",
+    b"2014-03-14 0\n",
+    b"2014-03-14 08:30 oops\n",
+    b"2014-03-14 08:30 oops again\n",
+    b"\n",
+    b"2014-03-17 09:00 hello\n",
+    b"2014-03-17 10:15 hard work\n",
+    b"2014-03-19 10:15 more work\n",
+]
+
+
+class CheckLog(unittest.TestCase):
+    def setUp(self):
+        self.entry_parser = EntryParser(pytz.timezone("UTC"))
+
+    def check(self, lines):
+        return [(problem.line_number, problem.kind) for problem in LogCheck(self.entry_parser, MAX_GAP).check(lines)]
+
+    def test_report_every_problem(self):
+        self.assertEqual(
+            self.check(enumerate(LINES, 1)),
+            [(3, "syntax"), (4, "order"), (5, "duplicate"), (9, "gap")],
+        )
+
+    def test_no_gap_before_hello(self):
+        self.assertEqual(self.check(enumerate([b"2014-03-14 09:00 a\n", b"2014-03-17 09:00 hello\n"], 1)), [])
+
+    def test_check_chunk(self):
+        start, end = len(b"".join(LINES[:2])), len(b"".join(LINES[:5]))
+        chunk = check_chunk(temporary_entry_lines(self, LINES), self.entry_parser, start, end, MAX_GAP)
+
+        # Line numbers are relative to the chunk, and its first entry is
+        # not compared to the entries before it
+        self.assertEqual(
+            [(problem.line_number, problem.kind) for problem in chunk.problems], [(1, "syntax"), (3, "duplicate")]
+        )
+        self.assertEqual(chunk.first_entry.name, "oops")
+        self.assertEqual(chunk.first_entry_line_number, 2)
+        self.assertEqual(chunk.last_entry.name, "oops again")
+        self.assertEqual(chunk.line_count, 3)
@@ -0,0 +1,120 @@
+import importlib
+import os
+import tempfile
+import unittest
+
+import pytz
+
+from utt.components.entry_parser import EntryParser
+from utt.components.timezone_config import TimezoneConfig
+
+compact_plugin = importlib.import_module("utt.plugins.0_compact")
+
+PARIS = pytz.timezone("Europe/Paris")
+
+
+def canonical_entry(timezone_enabled=False):
+    handler = compact_plugin.CompactHandler(
+        *[None] * 7,
+        local_timezone=PARIS,
+        sqlite_storage=None,
+        timezone_config=TimezoneConfig(timezone_enabled),
+        output=None,
+    )
+    return handler._canonical_entry
+
+
+class Compaction(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dirname.cleanup)
+        self.filename = os.path.join(self.dirname.name, "utt.log")
+
+    def write(self, lines):
+        with open(self.filename, "wb") as data_file:
+            data_file.writelines(lines)
+        return self.filename
+
+    def compact(self, lines):
+        filename = self.write(lines)
+        compaction = compact_plugin._Compaction(filename, EntryParser(PARIS), canonical_entry())
+        compaction.run()
+        with open(filename, "rb") as data_file:
+            return compaction, data_file.read()
+
+    def test_canonical_lines(self):
+        compaction, data = self.compact(
+            [
+                b"2014-03-14 08:00 hello\r\n",
+                b"2014-03-14 09:00  hard work \n",
+                b"2014-03-17 09:00 hello\n",
+                b"\n",
+                b"\n",
+                b"2014-03-17 10:15 asd: A-526\n",
+            ]
+        )
+
+        self.assertEqual(
+            data,
+            b"2014-03-14 08:00 hello\n"
+            b"2014-03-14 09:00 hard work\n"
+            b"\n"
+            b"2014-03-17 09:00 hello\n"
+            b"2014-03-17 10:15 asd: A-526\n",
+        )
+        self.assertEqual((compaction.entry_count, compaction.rewritten_count), (4, 1))
+        self.assertTrue(compaction.changed)
+
+    def test_redundant_hello(self):
+        compaction, data = self.compact(
+            [
+                b"2014-03-14 08:00 hello\n",
+                b"2014-03-14 08:05 hello\n",
+                b"2014-03-14 09:00 hello  # late\n",
+                b"2014-03-14 09:05 hello\n",
+                b"2014-03-14 10:00 hello\n",
+            ]
+        )
+
+        self.assertEqual(
+            data,
+            b"2014-03-14 09:00 hello  # late\n2014-03-14 10:00 hello\n",
+        )
+        self.assertEqual(compaction.removed_count, 3)
+
+    def test_already_compact(self):
+        lines = [b"2014-03-14 08:00 hello\n", b"\n", b"2014-03-17 09:00 hard work\n"]
+        filename = self.write(lines)
+        inode = os.stat(filename).st_ino
+
+        compaction = compact_plugin._Compaction(filename, EntryParser(PARIS), canonical_entry())
+        compaction.run()
+
+        self.assertFalse(compaction.changed)
+        self.assertEqual(os.stat(filename).st_ino, inode)
+
+    def test_mode_is_kept(self):
+        filename = self.write([b"2014-03-14 08:00  hello\n"])
+        os.chmod(filename, 0o640)
+
+        compact_plugin._Compaction(filename, EntryParser(PARIS), canonical_entry()).run()
+
+        self.assertEqual(os.stat(filename).st_mode & 0o777, 0o640)
+
+
+class CanonicalEntry(unittest.TestCase):
+    def canonical_entry(self, line, timezone_enabled=False):
+        return str(canonical_entry(timezone_enabled)(EntryParser(PARIS).parse(line)))
+
+    def test_offset_removed(self):
+        self.assertEqual(self.canonical_entry("2014-03-14 07:00+0000 hello"), "2014-03-14 08:00 hello")
+
+    def test_repeated_time_keeps_offset(self):
+        # Clocks are wound back from 03:00 to 02:00 on 2014-10-26
+        self.assertEqual(self.canonical_entry("2014-10-26 02:30+0200 hello"), "2014-10-26 02:30+0200 hello")
+        self.assertEqual(self.canonical_entry("2014-10-26 02:30+0100 hello"), "2014-10-26 02:30 hello")
+
+    def test_timezone_enabled(self):
+        self.assertEqual(
+            self.canonical_entry("2014-03-14 07:00+0000 hello", timezone_enabled=True), "2014-03-14 07:00+0000 hello"
+        )
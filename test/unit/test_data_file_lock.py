@@ -0,0 +1,46 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from utt.components.data_file_lock import locked_data_file
+
+
+class LockedDataFile(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dirname.name, "utt.log")
+        with open(self.filename, "wb") as data_file:
+            data_file.write(b"a\n")
+
+    def tearDown(self):
+        self.dirname.cleanup()
+
+    def read(self):
+        with open(self.filename, "rb") as data_file:
+            return data_file.read()
+
+    def append(self, data):
+        with locked_data_file(self.filename, os.O_WRONLY | os.O_APPEND) as fd:
+            os.write(fd, data)
+
+    def test_append_to_replaced_file(self):
+        with locked_data_file(self.filename):
+            appender = threading.Thread(target=self.append, args=(b"c\n",))
+            appender.start()
+            # The appender waits for the lock on the file being replaced
+            appender.join(0.1)
+            self.assertTrue(appender.is_alive())
+
+            replacement = self.filename + ".tmp"
+            with open(replacement, "wb") as data_file:
+                data_file.write(b"b\n")
+            os.replace(replacement, self.filename)
+
+        appender.join()
+        self.assertEqual(self.read(), b"b\nc\n")
+
+    def test_missing_file(self):
+        with self.assertRaises(FileNotFoundError):
+            with locked_data_file(os.path.join(self.dirname.name, "missing.log")):
+                pass
@@ -0,0 +1,193 @@
+import datetime
+import gzip
+import lzma
+import os
+import tempfile
+import unittest
+
+import pytz
+
+from utt.components.data_segments import DataSegments, Segment
+from utt.components.entry_parser import EntryParser
+from utt.components.storage_config import SEGMENTED_LAYOUT, SINGLE_FILE_LAYOUT, StorageConfig
+
+UTC = pytz.timezone("UTC")
+
+
+def segment(filename, start, end, entry_count):
+    return Segment(filename, UTC.localize(start), UTC.localize(end), entry_count)
+
+
+SEGMENTS = [
+    segment("2014-01.log", datetime.datetime(2014, 1, 6, 9), datetime.datetime(2014, 1, 31, 17), 40),
+    segment("2014-02.log", datetime.datetime(2014, 2, 28, 9), datetime.datetime(2014, 2, 28, 9), 1),
+    segment("2014-03.log", datetime.datetime(2014, 3, 3, 9), datetime.datetime(2014, 3, 31, 17), 40),
+    segment("2014-04.log", datetime.datetime(2014, 4, 1, 9), datetime.datetime(2014, 4, 30, 17), 40),
+    segment("2014-05.log", datetime.datetime(2014, 5, 1, 9), datetime.datetime(2014, 5, 30, 17), 40),
+]
+
+
+class Overlapping(unittest.TestCase):
+    def setUp(self):
+        self.data_segments = DataSegments("/tmp/utt", StorageConfig(SEGMENTED_LAYOUT))
+        self.data_segments._segments = SEGMENTS
+
+    def overlapping(self, start, end):
+        segments = self.data_segments.overlapping(UTC.localize(start), UTC.localize(end))
+        return [segment.filename for segment in segments]
+
+    def test_includes_segment_after_range(self):
+        self.assertEqual(
+            self.overlapping(datetime.datetime(2014, 1, 1), datetime.datetime(2014, 1, 8)),
+            ["2014-01.log", "2014-02.log"],
+        )
+
+    def test_includes_last_two_entries_before_range(self):
+        self.assertEqual(
+            self.overlapping(datetime.datetime(2014, 3, 10), datetime.datetime(2014, 3, 11)),
+            ["2014-01.log", "2014-02.log", "2014-03.log", "2014-04.log"],
+        )
+
+    def test_range_within_segment_with_entries_before(self):
+        self.assertEqual(
+            self.overlapping(datetime.datetime(2014, 4, 10), datetime.datetime(2014, 4, 11)),
+            ["2014-03.log", "2014-04.log", "2014-05.log"],
+        )
+
+    def test_range_after_last_segment(self):
+        self.assertEqual(
+            self.overlapping(datetime.datetime(2015, 1, 1), datetime.datetime(2015, 1, 2)),
+            ["2014-05.log"],
+        )
+
+
+class Record(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dirname.cleanup)
+        self.entry_parser = EntryParser(UTC)
+
+    def data_segments(self):
+        return DataSegments(self.dirname.name, StorageConfig(SEGMENTED_LAYOUT))
+
+    def entries(self, *lines):
+        return [self.entry_parser.parse(line) for line in lines]
+
+    def test_record_entries(self):
+        data_segments = self.data_segments()
+        data_segments.record(self.entries("2014-01-31 09:00 hello", "2014-02-03 09:00 hello"))
+        data_segments.record(self.entries("2014-02-03 10:00 work"))
+
+        self.assertEqual(
+            self.data_segments().segments(),
+            [
+                segment("2014-01.log", datetime.datetime(2014, 1, 31, 9), datetime.datetime(2014, 1, 31, 9), 1),
+                segment("2014-02.log", datetime.datetime(2014, 2, 3, 9), datetime.datetime(2014, 2, 3, 10), 2),
+            ],
+        )
+
+    def test_manifest_updated_by_another_process(self):
+        data_segments = self.data_segments()
+        # The manifest is read before it's updated by another process
+        self.assertEqual(data_segments.segments(), [])
+        self.data_segments().record(self.entries("2014-01-31 09:00 hello"))
+
+        data_segments.record(self.entries("2014-01-31 10:00 work"))
+
+        self.assertEqual([segment.entry_count for segment in self.data_segments().segments()], [2])
+
+    def test_nested_locks(self):
+        data_segments = self.data_segments()
+        with data_segments.locked():
+            data_segments.record(self.entries("2014-01-31 09:00 hello"))
+
+        self.assertEqual(len(self.data_segments().segments()), 1)
+        self.assertTrue(os.path.exists(os.path.join(self.dirname.name, "manifest.json.lock")))
+
+
+class Archive(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dirname.cleanup)
+        self.entry_parser = EntryParser(UTC)
+
+    def path(self, filename):
+        return os.path.join(self.dirname.name, filename)
+
+    def write(self, filename, lines):
+        with open(self.path(filename), "w") as data_file:
+            data_file.writelines(line + "\n" for line in lines)
+
+    def filenames(self, segments):
+        return [segment.filename for segment in segments]
+
+    def test_archive_segments_before_month(self):
+        data_segments = DataSegments(self.dirname.name, StorageConfig(SEGMENTED_LAYOUT))
+        data_segments.record(
+            [
+                self.entry_parser.parse(line)
+                for line in ("2014-01-31 09:00 hello", "2014-02-03 09:00 hello", "2014-03-03 09:00 hello")
+            ]
+        )
+        for filename, line in (
+            ("2014-01.log", "2014-01-31 09:00 hello"),
+            ("2014-02.log", "2014-02-03 09:00 hello"),
+            ("2014-03.log", "2014-03-03 09:00 hello"),
+        ):
+            self.write(filename, [line])
+
+        archived = data_segments.archive_segments(UTC.localize(datetime.datetime(2014, 3, 1)), ".gz")
+
+        self.assertEqual(self.filenames(archived), ["2014-01.log.gz", "2014-02.log.gz"])
+        segments = DataSegments(self.dirname.name, StorageConfig(SEGMENTED_LAYOUT)).segments()
+        self.assertEqual(self.filenames(segments), ["2014-01.log.gz", "2014-02.log.gz", "2014-03.log"])
+        self.assertFalse(os.path.exists(self.path("2014-01.log")))
+        with gzip.open(self.path("2014-02.log.gz"), "rt") as archive_file:
+            self.assertEqual(archive_file.read(), "2014-02-03 09:00 hello\n")
+
+        # Archives are not archived again
+        archived = data_segments.archive_segments(UTC.localize(datetime.datetime(2014, 4, 1)), ".gz")
+        self.assertEqual(self.filenames(archived), ["2014-03.log.gz"])
+        self.assertEqual(
+            self.filenames(data_segments.archives()), ["2014-01.log.gz", "2014-02.log.gz", "2014-03.log.gz"]
+        )
+
+    def test_archive_file(self):
+        lines = [
+            "2014-01-30 09:00 hello",
+            "",
+            "2014-01-31 09:00 hello",
+            "",
+            "2014-02-03 09:00 hello",
+            "",
+            "2014-03-03 09:00 hello",
+        ]
+        self.write("utt.log", lines)
+        data_segments = DataSegments(self.path("utt.log"), StorageConfig(SINGLE_FILE_LAYOUT))
+
+        archives, offset = data_segments.archive_file(
+            self.path("utt.log"), self.entry_parser, UTC.localize(datetime.datetime(2014, 3, 1)), ".xz"
+        )
+
+        self.assertEqual(
+            archives,
+            [
+                segment("2014-01.log.xz", datetime.datetime(2014, 1, 30, 9), datetime.datetime(2014, 1, 31, 9), 2),
+                segment("2014-02.log.xz", datetime.datetime(2014, 2, 3, 9), datetime.datetime(2014, 2, 3, 9), 1),
+            ],
+        )
+        # The first line that is not archived
+        self.assertEqual(offset, len("\n".join(lines[:6])) + 1)
+        self.assertEqual(data_segments.archives(), archives)
+        with lzma.open(self.path("2014-01.log.xz"), "rt") as archive_file:
+            self.assertEqual(archive_file.read(), "2014-01-30 09:00 hello\n\n2014-01-31 09:00 hello\n\n")
+
+    def test_archive_whole_file(self):
+        self.write("utt.log", ["2014-01-30 09:00 hello"])
+        data_segments = DataSegments(self.path("utt.log"), StorageConfig(SINGLE_FILE_LAYOUT))
+
+        _, offset = data_segments.archive_file(
+            self.path("utt.log"), self.entry_parser, UTC.localize(datetime.datetime(2014, 3, 1)), ".gz"
+        )
+
+        self.assertEqual(offset, os.path.getsize(self.path("utt.log")))
@@ -0,0 +1,141 @@
+import argparse
+import os
+import tempfile
+import unittest
+
+import pytz
+
+from utt.components.cache_config import CacheConfig
+from utt.components.entries import cached_entries
+from utt.components.entries_cache import EntriesCache
+from utt.components.entry_lines import EntryLines
+from utt.components.entry_parser import EntryParser
+from utt.components.parallel_parser import ParallelParser
+from utt.components.parse_config import ParseConfig
+from utt.components.timezone_config import TimezoneConfig
+
+from .fixtures import LINES
+
+
+class EntriesCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dirname.cleanup)
+        self.data_filename = os.path.join(self.dirname.name, "utt.log")
+        self.timezone = pytz.timezone("UTC")
+        self.entry_parser = EntryParser(self.timezone)
+        self.write(LINES)
+
+    def entries_cache(self, timezone=None):
+        return EntriesCache(
+            self.data_filename,
+            os.path.join(self.dirname.name, "cache"),
+            CacheConfig(True),
+            timezone or self.timezone,
+            argparse.Namespace(timezone_engine=None),
+            TimezoneConfig(False),
+        )
+
+    def write(self, lines, mode="w"):
+        with open(self.data_filename, mode) as data_file:
+            data_file.writelines(lines)
+
+    def cached_entries(self, entries_cache):
+        return cached_entries(
+            EntryLines(self.data_filename),
+            self.entry_parser,
+            entries_cache,
+            ParallelParser(ParseConfig(1), self.entry_parser),
+        )
+
+    def names(self, entries):
+        return [entry.name for entry in entries]
+
+    def store(self, entries_cache):
+        self.cached_entries(entries_cache)
+        return entries_cache.load()
+
+    def set_mtime(self, mtime_ns):
+        os.utime(self.data_filename, ns=(mtime_ns, mtime_ns))
+
+
+class Load(EntriesCacheTest):
+    def test_store_and_load(self):
+        snapshot = self.store(self.entries_cache())
+        self.assertEqual(len(snapshot.entries), 9)
+        self.assertEqual(snapshot.end_offset, os.path.getsize(self.data_filename))
+        self.assertEqual(snapshot.next_line_number, len(LINES) + 1)
+
+    def test_appended_entries(self):
+        self.store(self.entries_cache())
+        self.write(["2014-03-20 11:00 appended\n"], mode="a")
+
+        # The cached entries are still valid, up to where they end
+        snapshot = self.entries_cache().load()
+        self.assertEqual(len(snapshot.entries), 9)
+
+    def test_resume_after_appended_entries(self):
+        self.store(self.entries_cache())
+        self.write(["2014-03-20 11:00 appended\n"], mode="a")
+
+        entries = self.cached_entries(self.entries_cache())
+        self.assertEqual(self.names(entries)[-2:], ["qwer: b-73", "appended"])
+        self.assertEqual(self.entries_cache().load().next_line_number, len(LINES) + 2)
+
+    def test_same_size_edit(self):
+        self.store(self.entries_cache())
+        self.write([line.replace("hard work", "easy work") for line in LINES])
+
+        self.assertIsNone(self.entries_cache().load())
+
+    def test_touched_data_file(self):
+        self.store(self.entries_cache())
+        self.set_mtime(os.stat(self.data_filename).st_mtime_ns + 10**9)
+
+        self.assertIsNotNone(self.entries_cache().load())
+
+    def test_inserted_bytes_outside_the_fingerprint(self):
+        # The first and last 4 KiB of the cached region are the same
+        # after a line is inserted between them
+        padding = ["\n"] * 5000
+        self.write(LINES[:6] + padding + LINES[6:] + padding)
+        self.store(self.entries_cache())
+        self.write(LINES[:6] + padding + ["2014-03-19 08:00 inserted\n"] + LINES[6:] + padding)
+
+        self.assertIsNone(self.entries_cache().load())
+        self.assertIn("inserted", self.names(self.cached_entries(self.entries_cache())))
+
+    def test_other_timezone(self):
+        self.store(self.entries_cache())
+
+        self.assertIsNone(self.entries_cache(pytz.timezone("Europe/Paris")).load())
+
+
+class InvalidateFrom(EntriesCacheTest):
+    def test_keep_entries_before_offset(self):
+        entries_cache = self.entries_cache()
+        self.store(entries_cache)
+        offset = len("".join(LINES[:6]))
+
+        entries_cache.invalidate_from(offset)
+
+        snapshot = entries_cache.load()
+        self.assertEqual((snapshot.end_offset, snapshot.next_line_number), (offset, 7))
+        self.assertEqual(self.names(snapshot.entries), ["hello", "hard work", "hello", "hard work"])
+
+    def test_offset_after_cached_entries(self):
+        entries_cache = self.entries_cache()
+        snapshot = self.store(entries_cache)
+
+        entries_cache.invalidate_from(snapshot.end_offset)
+
+        self.assertEqual(entries_cache.load().end_offset, snapshot.end_offset)
+
+    def test_edited_entries_are_parsed_again(self):
+        entries_cache = self.entries_cache()
+        self.store(entries_cache)
+        self.write(LINES[:6] + ["2014-03-19 09:00 hello again\n"] + LINES[7:])
+
+        entries_cache.invalidate_from(len("".join(LINES[:6])))
+
+        self.assertIn("hello again", self.names(self.cached_entries(entries_cache)))
@@ -1,4 +1,5 @@
 import datetime
+import pickle
 import unittest
 
 import ddt
@@ -91,6 +92,20 @@ VALID_ENTRIES = [
         "expected_comment": "a comment",
         "tz": pytz.timezone("GMT"),
     },
+    {
+        "name": "2014-07-23 10:30 a-project: a_task  # a comment",
+        "expected_utc": datetime.datetime(2014, 7, 23, 14, 30),
+        "expected_name": "a-project: a_task",
+        "expected_comment": "a comment",
+        "tz": pytz.timezone("US/Eastern"),
+    },
+    {
+        "name": "2014-01-23 10:30+01:00\tbreak**",
+        "expected_utc": datetime.datetime(2014, 1, 23, 9, 30),
+        "expected_name": "break**",
+        "expected_comment": None,
+        "tz": pytz.timezone("US/Pacific"),
+    },
 ]
 
 INVALID_ENTRIES = [
@@ -100,6 +115,11 @@ INVALID_ENTRIES = [
     ("9:15",),
     ("2015-1-1 9:15",),
     ("2014-03-23 An activity",),
+    ("2014-03-23 04:15",),
+    ("2014-03-23 04:15   ",),
+    ("2014-03-23 04:15+0100",),
+    ("2014-03-23 04:15+01:0 An activity",),
+    ("2014-03-23 04:150 An activity",),
 ]
 
 
@@ -116,6 +136,48 @@ class ValidEntry(unittest.TestCase):
         self.assertEqual(entry.comment, expected_comment)
 
 
+@ddt.ddt
+class ValidBytesEntry(unittest.TestCase):
+    @ddt.data(*VALID_ENTRIES)
+    @ddt.unpack
+    def test(self, name, expected_utc, expected_name, expected_comment, tz):
+        entry_parser = EntryParser(tz)
+        entry = entry_parser.parse(name.encode())
+        expected_datetime = tz.fromutc(expected_utc)
+        self.assertEqual(entry.datetime, expected_datetime)
+        self.assertEqual(entry.name, expected_name)
+        self.assertEqual(entry.comment, expected_comment)
+
+
+@ddt.ddt
+class LazyEntry(unittest.TestCase):
+    @ddt.data(*VALID_ENTRIES)
+    @ddt.unpack
+    def test(self, name, expected_utc, expected_name, expected_comment, tz):
+        entry_parser = EntryParser(tz, lazy=True)
+        entry = entry_parser.parse(name.encode())
+        expected_datetime = tz.fromutc(expected_utc)
+        self.assertEqual(entry.datetime, expected_datetime)
+        self.assertEqual(entry.name, expected_name)
+        self.assertEqual(entry.comment, expected_comment)
+
+    @ddt.data(*INVALID_ENTRIES)
+    @ddt.unpack
+    def test_invalid(self, text):
+        entry_parser = EntryParser(pytz.timezone("US/Pacific"), lazy=True)
+        self.assertIsNone(entry_parser.parse(text.encode()))
+
+    def test_name_parsed_when_accessed(self):
+        entry_parser = EntryParser(pytz.timezone("GMT"), lazy=True)
+        entry = entry_parser.parse(b"2014-03-23 04:15 a-project: a_task  # a comment")
+        self.assertNotIn("name", vars(entry))
+
+        entry = pickle.loads(pickle.dumps(entry))
+        self.assertEqual(entry.comment, "a comment")
+        self.assertEqual(entry.name, "a-project: a_task")
+        self.assertEqual(str(entry), "2014-03-23 04:15+0000 a-project: a_task  # a comment")
+
+
 @ddt.ddt
 class InvalidEntry(unittest.TestCase):
     @ddt.data(*INVALID_ENTRIES)
@@ -124,3 +186,22 @@ class InvalidEntry(unittest.TestCase):
         entry_parser = EntryParser(pytz.timezone("US/Pacific"))
         entry = entry_parser.parse(text)
         self.assertIsNone(entry)
+
+    @ddt.data(*INVALID_ENTRIES)
+    @ddt.unpack
+    def test_bytes(self, text):
+        entry_parser = EntryParser(pytz.timezone("US/Pacific"))
+        entry = entry_parser.parse(text.encode())
+        self.assertIsNone(entry)
+
+
+class OutOfRangeDate(unittest.TestCase):
+    def test(self):
+        entry_parser = EntryParser(pytz.timezone("US/Pacific"))
+        with self.assertRaisesRegex(ValueError, "month must be in 1..12"):
+            entry_parser.parse(b"2014-13-23 10:30 work")
+
+    def test_lazy(self):
+        entry_parser = EntryParser(pytz.timezone("US/Pacific"), lazy=True)
+        with self.assertRaisesRegex(ValueError, "month must be in 1..12"):
+            entry_parser.parse(b"2014-13-23 10:30 work")
@@ -0,0 +1,118 @@
+import datetime
+import os
+import tempfile
+import unittest
+
+from utt.components.entry_index import FILE_START, EntryIndex, IndexRecord
+from utt.components.entry_lines import EntryLines
+from utt.components.index_config import IndexConfig
+
+from .fixtures import LINES
+
+
+def offset(line_index):
+    return len("".join(LINES[:line_index]).encode())
+
+
+class EntryIndexTest(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dirname.cleanup)
+        self.data_filename = os.path.join(self.dirname.name, "utt.log")
+        self.write(LINES)
+        self.entry_index = self.new_entry_index()
+
+    def new_entry_index(self):
+        return EntryIndex(self.data_filename, EntryLines(self.data_filename), IndexConfig(True))
+
+    def write(self, lines, mode="w"):
+        with open(self.data_filename, mode) as data_file:
+            data_file.writelines(lines)
+
+    def records(self):
+        return self.entry_index._load().records
+
+
+class Update(EntryIndexTest):
+    def test_index_first_entry_of_each_day(self):
+        self.entry_index.update()
+        self.assertEqual(
+            self.records(),
+            [
+                IndexRecord(datetime.date(2014, 3, 14), offset(0), 1),
+                IndexRecord(datetime.date(2014, 3, 17), offset(3), 4),
+                IndexRecord(datetime.date(2014, 3, 19), offset(6), 7),
+                IndexRecord(datetime.date(2014, 3, 20), offset(10), 11),
+            ],
+        )
+
+    def test_last_line_without_newline(self):
+        self.write(["2014-03-21 09:00 hello"], mode="a")
+        self.entry_index.update()
+        self.assertEqual(self.records()[-1].day, datetime.date(2014, 3, 20))
+
+    def test_appended_entries(self):
+        self.entry_index.update()
+        appended_to = os.stat(self.data_filename)
+        self.write(["\n", "2014-03-21 09:00 hello\n"], mode="a")
+
+        self.entry_index.update(appended_to)
+
+        self.assertEqual(self.records()[-1], IndexRecord(datetime.date(2014, 3, 21), offset(12) + 1, 14))
+
+    def test_data_file_modified_in_place(self):
+        padding = ["\n"] * 5000
+        self.write(LINES[:6] + padding + LINES[6:] + padding)
+        self.entry_index.update()
+        # The first and last 4 KiB of the data file are the same
+        self.write(LINES[:6] + padding + ["2014-03-18 09:00 hello\n"] + LINES[7:] + padding)
+        # Modification times may be too coarse to differ
+        os.utime(self.data_filename, ns=(0, 0))
+
+        self.assertIsNone(self.new_entry_index().start_record(datetime.date(2014, 3, 25)))
+
+        self.entry_index.update()
+        self.assertEqual(self.records()[2].day, datetime.date(2014, 3, 18))
+
+
+class InvalidateFrom(EntryIndexTest):
+    def test_keep_days_before_offset(self):
+        self.entry_index.update()
+        self.write(LINES[:6] + ["2014-03-18 09:00 hello\n"] + LINES[7:])
+
+        self.entry_index.invalidate_from(offset(6))
+
+        self.assertEqual(
+            self.records()[1:],
+            [
+                IndexRecord(datetime.date(2014, 3, 17), offset(3), 4),
+                IndexRecord(datetime.date(2014, 3, 18), offset(6), 7),
+                IndexRecord(datetime.date(2014, 3, 19), offset(7), 8),
+                IndexRecord(datetime.date(2014, 3, 20), offset(10), 11),
+            ],
+        )
+
+    def test_without_index(self):
+        self.entry_index.invalidate_from(offset(6))
+        self.assertEqual(len(self.records()), 4)
+
+
+class StartRecord(EntryIndexTest):
+    def setUp(self):
+        super().setUp()
+        self.entry_index.update()
+
+    def test_second_to_last_day_before_margin(self):
+        # Days up to 2014-03-19 may hold entries of 2014-03-22 written
+        # with a timezone offset
+        self.assertEqual(
+            self.entry_index.start_record(datetime.date(2014, 3, 22)),
+            IndexRecord(datetime.date(2014, 3, 17), offset(3), 4),
+        )
+
+    def test_day_within_margin_of_first_days(self):
+        self.assertEqual(self.entry_index.start_record(datetime.date(2014, 3, 19)), FILE_START)
+
+    def test_disabled(self):
+        entry_index = EntryIndex(self.data_filename, EntryLines(self.data_filename), IndexConfig(False))
+        self.assertIsNone(entry_index.start_record(datetime.date(2014, 3, 23)))
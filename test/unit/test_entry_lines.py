@@ -0,0 +1,110 @@
+import gzip
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from utt.components import entry_lines
+from utt.components.entry_lines import block_checksums, changed_region
+
+from .fixtures import temporary_entry_lines
+
+
+@mock.patch.object(entry_lines, "CHECKSUM_BLOCK_SIZE", 8)
+class ChangedRegion(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.dirname.name, "utt.log")
+
+    def tearDown(self):
+        self.dirname.cleanup()
+
+    def changed_region(self, before, after):
+        with open(self.filename, "wb") as data_file:
+            data_file.write(before)
+        checksums = block_checksums(self.filename)
+
+        with open(self.filename, "wb") as data_file:
+            data_file.write(after)
+        return changed_region(checksums, block_checksums(self.filename))
+
+    def test_unchanged(self):
+        self.assertIsNone(self.changed_region(b"0123456789abcdef0123", b"0123456789abcdef0123"))
+
+    def test_replaced(self):
+        self.assertEqual(self.changed_region(b"0123456789abcdef0123", b"0123456789xbcdef0123"), (8, 12))
+
+    def test_inserted(self):
+        start, end = self.changed_region(b"0123456789abcdef0123", b"0123456789abcdefXXXX0123")
+        self.assertEqual(start, 16)
+        self.assertEqual(end, 24)
+
+    def test_appended(self):
+        self.assertEqual(self.changed_region(b"0123456789abcdef", b"0123456789abcdef0123"), (16, 20))
+
+    def test_truncated(self):
+        self.assertEqual(self.changed_region(b"0123456789abcdef0123", b"0123456789"), (8, 10))
+
+    def test_new_file(self):
+        self.assertEqual(self.changed_region(b"", b"0123"), (0, 4))
+
+    def test_emptied_file(self):
+        self.assertEqual(self.changed_region(b"0123456789", b""), (0, 0))
+
+    def test_replaced_in_first_block(self):
+        self.assertEqual(self.changed_region(b"0123456789abcdef0123", b"0x23456789abcdef0123"), (0, 4))
+
+    def test_removed_from_middle(self):
+        # The last block is unchanged after the 4 bytes before it are removed
+        self.assertEqual(self.changed_region(b"0123456789abcdef01234567", b"0123456789ab01234567"), (8, 12))
+
+    def test_unchanged_blocks_overlap(self):
+        # The unchanged blocks at the end cover the unchanged blocks at the start
+        self.assertEqual(self.changed_region(b"01234567" * 2, b"01234567" * 3), (16, 24))
+
+    def test_same_size_replaced_last_byte(self):
+        self.assertEqual(self.changed_region(b"0123456789abcdef0123", b"0123456789abcdef012X"), (16, 20))
+
+
+@mock.patch.object(entry_lines, "REVERSE_BLOCK_SIZE", 8)
+class ReversedLines(unittest.TestCase):
+    def reversed_lines(self, data, end=None):
+        return list(temporary_entry_lines(self, [data]).reversed_lines(end))
+
+    def test_lines_spanning_blocks(self):
+        self.assertEqual(
+            self.reversed_lines(b"first line\nsecond line\n\nlast\n"),
+            [(24, "last"), (23, ""), (11, "second line"), (0, "first line")],
+        )
+
+    def test_last_line_without_newline(self):
+        self.assertEqual(self.reversed_lines(b"first line\nlast"), [(11, "last"), (0, "first line")])
+
+    def test_newline_at_block_boundary(self):
+        self.assertEqual(self.reversed_lines(b"1234567\n1234567\n"), [(8, "1234567"), (0, "1234567")])
+
+    def test_empty_lines_at_end(self):
+        self.assertEqual(self.reversed_lines(b"a\n\n\n"), [(3, ""), (2, ""), (0, "a")])
+
+    def test_end(self):
+        data = b"first line\nsecond line\nlast\n"
+        self.assertEqual(self.reversed_lines(data, end=23), [(11, "second line"), (0, "first line")])
+        # A line cut by `end` is yielded up to `end`
+        self.assertEqual(self.reversed_lines(data, end=17), [(11, "second"), (0, "first line")])
+
+    def test_empty_file(self):
+        self.assertEqual(self.reversed_lines(b""), [])
+
+    def test_missing_file(self):
+        self.assertEqual(list(entry_lines.EntryLines("/nonexistent/utt.log").reversed_lines()), [])
+
+    def test_compressed_file(self):
+        dirname = tempfile.TemporaryDirectory()
+        self.addCleanup(dirname.cleanup)
+        filename = os.path.join(dirname.name, "utt.log.gz")
+        with gzip.open(filename, "wb") as data_file:
+            data_file.write(b"first line\nsecond line\nlast")
+
+        self.assertEqual(
+            list(entry_lines.EntryLines(filename).reversed_lines(end=17)), [(11, "second"), (0, "first line")]
+        )
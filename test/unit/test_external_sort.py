@@ -0,0 +1,57 @@
+import unittest
+from unittest import mock
+
+from utt.components import external_sort as external_sort_module
+from utt.components.external_sort import external_sort
+
+
+class ExternalSort(unittest.TestCase):
+    def test_single_run(self):
+        self.assertEqual(list(external_sort([3, 1, 2], key=lambda item: item)), [1, 2, 3])
+
+    def test_several_runs(self):
+        items = [(i * 7919) % 1000 for i in range(1000)]
+        self.assertEqual(list(external_sort(items, key=lambda item: item, run_size=64)), sorted(items))
+
+    def test_run_size_multiple(self):
+        items = list(range(12, 0, -1))
+        self.assertEqual(list(external_sort(items, key=lambda item: item, run_size=4)), sorted(items))
+
+    def test_stable(self):
+        items = [(i % 3, i) for i in range(30)]
+        self.assertEqual(
+            list(external_sort(items, key=lambda item: item[0], run_size=4)),
+            sorted(items, key=lambda item: item[0]),
+        )
+
+    def test_empty(self):
+        self.assertEqual(list(external_sort([], key=lambda item: item)), [])
+
+    def test_exactly_one_run(self):
+        # A full run may be followed by more items, so it is spilled
+        with mock.patch.object(external_sort_module, "_spill", wraps=external_sort_module._spill) as spill:
+            self.assertEqual(list(external_sort([2, 1, 0], key=lambda item: item, run_size=3)), [0, 1, 2])
+        self.assertEqual(spill.call_count, 1)
+
+    def test_merge_of_interleaved_runs(self):
+        # Each run holds items that go between the items of the others
+        items = [0, 3, 6, 9, 1, 4, 7, 10, 2, 5, 8]
+        with mock.patch.object(external_sort_module, "_spill", wraps=external_sort_module._spill) as spill:
+            self.assertEqual(list(external_sort(items, key=lambda item: item, run_size=4)), list(range(11)))
+        self.assertEqual(spill.call_count, 3)
+
+    def test_run_files_closed_when_merge_is_not_consumed(self):
+        run_files = []
+        original_spill = external_sort_module._spill
+
+        def spill(run):
+            run_files.append(original_spill(run))
+            return run_files[-1]
+
+        with mock.patch.object(external_sort_module, "_spill", spill):
+            sorted_items = external_sort(range(10, 0, -1), key=lambda item: item, run_size=4)
+            self.assertEqual(next(sorted_items), 1)
+        sorted_items.close()
+
+        self.assertEqual(len(run_files), 3)
+        self.assertTrue(all(run_file.closed for run_file in run_files))
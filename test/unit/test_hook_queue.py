@@ -0,0 +1,129 @@
+import argparse
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import pytz
+
+from utt.components import hook_queue as hook_queue_module
+from utt.components.entry_parser import EntryParser
+from utt.components.hook_queue import HookQueue
+from utt.hook import Hook
+
+
+class Schedule(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.entry_parser = EntryParser(pytz.timezone("UTC"))
+
+    def tearDown(self):
+        self.dirname.cleanup()
+
+    def hook_queue(self, hooks, data_filename="utt.log", timezone=None):
+        return HookQueue(
+            hooks,
+            os.path.join(self.dirname.name, "cache"),
+            os.path.join(self.dirname.name, data_filename),
+            argparse.Namespace(timezone=timezone, timezone_engine=None),
+            self.entry_parser,
+        )
+
+    def entries(self, *lines):
+        return [self.entry_parser.parse(line) for line in lines]
+
+    @mock.patch.object(HookQueue, "_start_worker")
+    def test_take_scheduled_entries(self, start_worker):
+        hook_queue = self.hook_queue([Hook("foo", mock.Mock())])
+        hook_queue.schedule(self.entries("2014-03-14 08:00 a"))
+        hook_queue.schedule(self.entries("2014-03-14 09:00 b", "2014-03-14 10:00 c"))
+
+        self.assertEqual(start_worker.call_count, 2)
+        self.assertTrue(hook_queue.pending())
+        self.assertEqual(
+            [str(entry) for entry in hook_queue.take()],
+            ["2014-03-14 08:00+0000 a", "2014-03-14 09:00+0000 b", "2014-03-14 10:00+0000 c"],
+        )
+        self.assertFalse(hook_queue.pending())
+        self.assertEqual(hook_queue.take(), [])
+
+    @mock.patch.object(HookQueue, "_start_worker")
+    def test_no_hooks(self, start_worker):
+        hook_queue = self.hook_queue([])
+        hook_queue.schedule(self.entries("2014-03-14 08:00 a"))
+
+        start_worker.assert_not_called()
+        self.assertFalse(hook_queue.pending())
+
+    @mock.patch.object(HookQueue, "_start_worker")
+    def test_comments_are_kept(self, start_worker):
+        hook_queue = self.hook_queue([Hook("foo", mock.Mock())])
+        hook_queue.schedule(self.entries("2014-03-14 08:00 a  # with a comment"))
+
+        self.assertEqual([entry.comment for entry in hook_queue.take()], ["with a comment"])
+
+    @mock.patch.object(HookQueue, "_start_worker")
+    def test_one_queue_per_data_file(self, start_worker):
+        hooks = [Hook("foo", mock.Mock())]
+        self.hook_queue(hooks).schedule(self.entries("2014-03-14 08:00 a"))
+
+        self.assertEqual(self.hook_queue(hooks, data_filename="other.log").take(), [])
+        self.assertEqual(len(self.hook_queue(hooks).take()), 1)
+
+    def test_take_without_queue(self):
+        self.assertEqual(self.hook_queue([Hook("foo", mock.Mock())]).take(), [])
+
+    @mock.patch.object(hook_queue_module.subprocess, "Popen")
+    def test_start_worker(self, popen):
+        hook_queue = self.hook_queue([Hook("foo", mock.Mock())], timezone="Europe/Paris")
+        hook_queue.schedule(self.entries("2014-03-14 08:00 a"))
+
+        (command,), kwargs = popen.call_args
+        self.assertEqual(
+            command,
+            [
+                sys.executable,
+                "-m",
+                "utt",
+                "--data",
+                os.path.join(self.dirname.name, "utt.log"),
+                "--timezone",
+                "Europe/Paris",
+                "hooks",
+                "--run",
+                "--background",
+            ],
+        )
+        self.assertTrue(kwargs["start_new_session"])
+
+    @mock.patch.object(hook_queue_module.subprocess, "Popen", side_effect=OSError)
+    def test_entries_stay_queued_if_worker_does_not_start(self, popen):
+        hook_queue = self.hook_queue([Hook("foo", mock.Mock())])
+        hook_queue.schedule(self.entries("2014-03-14 08:00 a"))
+
+        self.assertTrue(hook_queue.pending())
+
+
+class WorkerLock(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dirname.cleanup)
+
+    def hook_queue(self):
+        return HookQueue(
+            [],
+            os.path.join(self.dirname.name, "cache"),
+            os.path.join(self.dirname.name, "utt.log"),
+            argparse.Namespace(timezone=None, timezone_engine=None),
+            EntryParser(pytz.timezone("UTC")),
+        )
+
+    def test_held_by_another_worker(self):
+        with self.hook_queue().worker_lock() as acquired:
+            self.assertTrue(acquired)
+            with self.hook_queue().worker_lock(blocking=False) as other_acquired:
+                self.assertFalse(other_acquired)
+
+        with self.hook_queue().worker_lock(blocking=False) as acquired:
+            self.assertTrue(acquired)
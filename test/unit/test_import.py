@@ -0,0 +1,79 @@
+import argparse
+import functools
+import importlib
+import io
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import pytz
+
+from utt.components.external_sort import external_sort
+
+import_plugin = importlib.import_module("utt.plugins.0_import")
+
+
+class ImportHandler(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dirname.cleanup)
+        self.add_entry = mock.Mock()
+
+    def run_import(self, filename, data, sort=False):
+        path = os.path.join(self.dirname.name, filename)
+        with open(path, "w", newline="") as import_file:
+            import_file.write(data)
+
+        args = argparse.Namespace(filename=path, format=None, sort=sort)
+        output = io.StringIO()
+        import_plugin.ImportHandler(args, self.add_entry, pytz.timezone("Europe/Paris"), output)()
+        return output.getvalue()
+
+    def added(self):
+        (entries,), _ = self.add_entry.add_all.call_args
+        return [str(entry) for entry in entries]
+
+    def test_csv(self):
+        output = self.run_import(
+            "entries.csv",
+            "datetime,name,comment\r\n"
+            "2014-03-14 08:00,hello,\r\n"
+            '2014-03-14T09:00:00+00:00,asd: A-526,"with, a comma"\r\n',
+        )
+
+        self.assertEqual(output, "Imported 2 entries\n")
+        self.assertEqual(
+            self.added(),
+            ["2014-03-14 08:00+0100 hello", "2014-03-14 10:00+0100 asd: A-526  # with, a comma"],
+        )
+
+    def test_jsonl(self):
+        self.run_import(
+            "entries.jsonl",
+            '{"datetime": "2014-03-14T08:00", "name": "hello"}\n'
+            "\n"
+            '{"datetime": "2014-03-14T09:00", "name": "lunch**", "comment": "late"}\n',
+        )
+
+        self.assertEqual(self.added(), ["2014-03-14 08:00+0100 hello", "2014-03-14 09:00+0100 lunch**  # late"])
+
+    def test_invalid_record_number(self):
+        with self.assertRaisesRegex(ValueError, "Invalid record 3"):
+            self.run_import("entries.csv", "datetime,name\n2014-03-14 08:00,hello\n2014-03-14 09:00,\n")
+
+        with self.assertRaisesRegex(ValueError, "Invalid record 2"):
+            self.run_import("entries.jsonl", '{"datetime": "2014-03-14T08:00", "name": "hello"}\nnot json\n')
+
+    def test_unknown_extension(self):
+        with self.assertRaisesRegex(Exception, "use --format"):
+            self.run_import("entries.txt", "")
+
+    def test_sort_across_runs(self):
+        lines = ["2014-03-%02d 09:00,day %d" % (day, day) for day in (5, 3, 9, 1, 7, 2, 8, 4, 6)]
+
+        # Runs of 2 entries are spilled and merged
+        with mock.patch.object(import_plugin, "external_sort", functools.partial(external_sort, run_size=2)):
+            self.run_import("entries.csv", "datetime,name\n" + "\n".join(lines) + "\n", sort=True)
+
+        self.assertEqual(self.added(), ["2014-03-%02d 09:00+0100 day %d" % (day, day) for day in range(1, 10)])
@@ -0,0 +1,86 @@
+import argparse
+import datetime
+import importlib
+import io
+import os
+import tempfile
+import unittest
+
+import pytz
+
+from utt.components.data_segments import DataSegments
+from utt.components.entry_lines import EntryLines
+from utt.components.entry_parser import EntryParser
+from utt.components.sqlite_storage import SQLiteStorage
+from utt.components.storage_config import SINGLE_FILE_LAYOUT, StorageConfig
+from utt.components.timezone_config import TimezoneConfig
+
+from .fixtures import LINES
+
+log_plugin = importlib.import_module("utt.plugins.0_log")
+
+
+class LogHandler(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dirname.cleanup)
+        self.entry_parser = EntryParser(pytz.timezone("UTC"))
+        self.data_filename = self.write("utt.log", LINES)
+
+    def write(self, filename, lines):
+        path = os.path.join(self.dirname.name, filename)
+        with open(path, "w") as data_file:
+            data_file.writelines(lines)
+        return path
+
+    def log(self, since=None, last=log_plugin.DEFAULT_ENTRY_COUNT, json=False, data_filenames=None):
+        data_filenames = data_filenames or [self.data_filename]
+        storage_config = StorageConfig(SINGLE_FILE_LAYOUT)
+        output = io.StringIO()
+        log_plugin.LogHandler(
+            argparse.Namespace(since=since, last=last, json=json),
+            data_filenames,
+            EntryLines(data_filenames[0]),
+            self.entry_parser,
+            DataSegments(data_filenames[0], storage_config),
+            SQLiteStorage(data_filenames[0], storage_config, self.entry_parser),
+            TimezoneConfig(False),
+            output,
+        )()
+        return output.getvalue().splitlines()
+
+    def test_last(self):
+        self.assertEqual(
+            self.log(last=3),
+            ["2014-03-19 13:00 lunch**", "2014-03-20 09:00 hello", "2014-03-20 10:00 qwer: b-73"],
+        )
+
+    def test_since(self):
+        self.assertEqual(len(self.log(since=datetime.date(2014, 3, 19))), 5)
+
+    def test_more_than_all_entries(self):
+        self.assertEqual(len(self.log(last=100)), 9)
+
+    def test_invalid_lines_are_skipped(self):
+        self.write("utt.log", LINES + ["\n", "not an entry\n"])
+        self.assertEqual(self.log(last=1), ["2014-03-20 10:00 qwer: b-73"])
+
+    def test_json(self):
+        self.write("utt.log", ["2014-03-20 10:00 qwer: b-73  # review\n"])
+        self.assertEqual(
+            self.log(json=True),
+            ['{"datetime": "2014-03-20T10:00:00", "name": "qwer: b-73", "comment": "review"}'],
+        )
+
+    def test_several_data_files(self):
+        other_filename = self.write("other.log", ["2014-03-19 12:30 other\n", "2014-03-21 09:00 hello\n"])
+
+        self.assertEqual(
+            self.log(last=4, data_filenames=[self.data_filename, other_filename]),
+            [
+                "2014-03-19 13:00 lunch**",
+                "2014-03-20 09:00 hello",
+                "2014-03-20 10:00 qwer: b-73",
+                "2014-03-21 09:00 hello",
+            ],
+        )
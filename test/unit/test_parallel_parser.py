@@ -0,0 +1,56 @@
+import unittest
+from unittest import mock
+
+import pytz
+
+from utt.components import parallel_parser
+from utt.components.entry_parser import EntryParser
+from utt.components.parse_config import ParseConfig
+from utt.components.parse_log import _parse_log
+
+from .fixtures import LINES, temporary_entry_lines
+
+
+@mock.patch.object(parallel_parser, "MIN_CHUNK_SIZE", 16)
+class ParallelParser(unittest.TestCase):
+    def setUp(self):
+        self.entry_parser = EntryParser(pytz.timezone("UTC"))
+        self.parallel_parser = parallel_parser.ParallelParser(ParseConfig(2), self.entry_parser)
+
+    def entry_lines(self, lines):
+        return temporary_entry_lines(self, lines)
+
+    def parse(self, lines):
+        size = len("".join(lines).encode())
+        return self.parallel_parser.parse(self.entry_lines(lines), 0, size, 1)
+
+    def test_same_entries_as_sequential_parse(self):
+        parsed = self.parse(LINES)
+        expected = _parse_log(enumerate(LINES, 1), self.entry_parser)
+        self.assertEqual([str(entry) for entry in parsed.entries], [str(entry) for entry in expected])
+        self.assertEqual(parsed.line_count, len(LINES))
+
+    def test_parse_from_offset(self):
+        entry_lines = self.entry_lines(LINES)
+        start = len("".join(LINES[:6]).encode())
+        parsed = self.parallel_parser.parse(entry_lines, start, entry_lines.size(), 7)
+        self.assertEqual(
+            [entry.name for entry in parsed.entries], ["hello", "asd: A-526", "lunch**", "hello", "qwer: b-73"]
+        )
+        self.assertEqual(parsed.line_count, 6)
+
+    def test_invalid_line_number(self):
+        lines = LINES[:10] + ["2014-03-20 0\n"] + LINES[11:]
+        with self.assertRaisesRegex(SyntaxError, "^Invalid syntax at line 11: 2014-03-20 0$"):
+            self.parse(lines)
+
+    def test_not_in_chronological_order_across_chunks(self):
+        lines = LINES[:9] + ["\n", "2014-03-18 09:00 hello\n"] + LINES[11:]
+        with self.assertRaisesRegex(Exception, "^Error line 11. Not in chronological order"):
+            self.parse(lines)
+
+    def test_enabled(self):
+        self.assertFalse(self.parallel_parser.enabled(parallel_parser.PARALLEL_PARSE_SIZE - 1))
+        self.assertTrue(self.parallel_parser.enabled(parallel_parser.PARALLEL_PARSE_SIZE))
+        single_worker_parser = parallel_parser.ParallelParser(ParseConfig(1), self.entry_parser)
+        self.assertFalse(single_worker_parser.enabled(parallel_parser.PARALLEL_PARSE_SIZE))
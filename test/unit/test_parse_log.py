@@ -0,0 +1,55 @@
+import unittest
+
+import pytz
+
+from utt.components.entry_parser import EntryParser
+from utt.components.parse_log import _parse_log, merge_logs
+
+
+class MergeLogs(unittest.TestCase):
+    def setUp(self):
+        self.entry_parser = EntryParser(pytz.timezone("UTC"))
+
+    def log(self, *lines):
+        return [self.entry_parser.parse(line) for line in lines]
+
+    def test_merge_chronologically(self):
+        merged = merge_logs(
+            [
+                self.log("2014-03-14 08:00 a", "2014-03-14 12:00 a"),
+                self.log("2014-03-14 09:00 b", "2014-03-15 09:00 b"),
+                self.log("2014-03-14 10:00+0000 c"),
+            ]
+        )
+        self.assertEqual(
+            [str(entry) for entry in merged],
+            [
+                "2014-03-14 08:00+0000 a",
+                "2014-03-14 09:00+0000 b",
+                "2014-03-14 10:00+0000 c",
+                "2014-03-14 12:00+0000 a",
+                "2014-03-15 09:00+0000 b",
+            ],
+        )
+
+    def test_same_datetime_in_log_order(self):
+        merged = merge_logs([self.log("2014-03-14 08:00 a"), self.log("2014-03-14 08:00 b")])
+        self.assertEqual([entry.name for entry in merged], ["a", "b"])
+
+
+class SkipPartialLine(unittest.TestCase):
+    def setUp(self):
+        self.entry_parser = EntryParser(pytz.timezone("UTC"))
+
+    def parse(self, lines):
+        return [entry.name for entry in _parse_log(enumerate(lines, 1), self.entry_parser, skip_partial_line=True)]
+
+    def test_skip_invalid_last_line_without_newline(self):
+        self.assertEqual(self.parse([b"2014-03-14 08:00 a\n", b"2014-03-14 0"]), ["a"])
+
+    def test_valid_last_line_without_newline(self):
+        self.assertEqual(self.parse([b"2014-03-14 08:00 a\n", b"2014-03-14 09:00 b"]), ["a", "b"])
+
+    def test_invalid_complete_line(self):
+        with self.assertRaises(SyntaxError):
+            self.parse([b"2014-03-14 0\n", b"2014-03-14 09:00 b\n"])
@@ -0,0 +1,34 @@
+import unittest
+from unittest import mock
+
+from utt.api import _v1
+from utt.components.entries import Entries
+from utt.components.last_entry import LastEntry, entries_last_entry
+from utt.components.report_entries import ReportEntries, entries_report_entries
+
+
+def plugin_entries() -> Entries:
+    return []
+
+
+def plugin_report_entries() -> ReportEntries:
+    return ReportEntries([])
+
+
+class RegisterComponent(unittest.TestCase):
+    def setUp(self):
+        patcher = mock.patch.multiple(_v1._private, components={}, container=_v1._private.create_container())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_overridden_entries(self):
+        _v1.register_component(Entries, plugin_entries)
+
+        self.assertIs(_v1._private.components[ReportEntries], entries_report_entries)
+        self.assertIs(_v1._private.components[LastEntry], entries_last_entry)
+
+    def test_overridden_entries_and_report_entries(self):
+        _v1.register_component(ReportEntries, plugin_report_entries)
+        _v1.register_component(Entries, plugin_entries)
+
+        self.assertIs(_v1._private.components[ReportEntries], plugin_report_entries)
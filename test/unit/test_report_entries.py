@@ -0,0 +1,101 @@
+import datetime
+import unittest
+from unittest import mock
+
+import pytz
+
+from utt.components import report_entries
+from utt.components.entry_parser import EntryParser
+from utt.components.report_args import DateRange, ReportArgs
+
+from .fixtures import LINES
+
+
+class InMemoryEntryLines:
+    def __init__(self, lines):
+        self._data = "".join(lines).encode()
+
+    def size(self):
+        return len(self._data)
+
+    def lines_at(self, offset):
+        if offset > 0:
+            offset = self._data.index(b"\n", offset - 1) + 1
+        while offset < len(self._data):
+            end = self._data.index(b"\n", offset) + 1
+            yield offset, self._data[offset:end]
+            offset = end
+
+    def count_lines(self, offset):
+        return self._data[:offset].count(b"\n")
+
+
+class FindOffset(unittest.TestCase):
+    def setUp(self):
+        self.tz = pytz.timezone("UTC")
+        self.entry_parser = EntryParser(self.tz)
+        self.entry_lines = InMemoryEntryLines(LINES)
+
+    def find_offset(self, start):
+        return report_entries.find_offset(self.entry_lines, self.entry_parser, self.tz.localize(start))
+
+    def line_at(self, offset):
+        return next(self.entry_lines.lines_at(offset))[1].decode()
+
+    @mock.patch.object(report_entries, "LINEAR_SCAN_SIZE", 16)
+    def test_second_to_last_entry_before_start(self):
+        offset = self.find_offset(datetime.datetime(2014, 3, 19))
+        self.assertEqual(self.line_at(offset), "2014-03-17 09:00 hello\n")
+
+    @mock.patch.object(report_entries, "LINEAR_SCAN_SIZE", 16)
+    def test_start_between_entries(self):
+        offset = self.find_offset(datetime.datetime(2014, 3, 19, 12, 30))
+        self.assertEqual(self.line_at(offset), "2014-03-19 09:00 hello\n")
+
+    @mock.patch.object(report_entries, "LINEAR_SCAN_SIZE", 16)
+    def test_start_before_first_entry(self):
+        self.assertEqual(self.find_offset(datetime.datetime(2014, 1, 1)), 0)
+
+    @mock.patch.object(report_entries, "LINEAR_SCAN_SIZE", 16)
+    def test_start_after_last_entry(self):
+        offset = self.find_offset(datetime.datetime(2015, 1, 1))
+        self.assertEqual(self.line_at(offset), "2014-03-20 09:00 hello\n")
+
+
+class ParseRange(unittest.TestCase):
+    def test_stops_after_first_entry_past_end(self):
+        tz = pytz.timezone("UTC")
+        entries = report_entries._parse_range(
+            InMemoryEntryLines(LINES), EntryParser(tz), 0, 1, tz.localize(datetime.datetime(2014, 3, 18))
+        )
+        self.assertEqual([str(entry) for entry in entries][-1], "2014-03-19 09:00+0000 hello")
+        self.assertEqual(len(entries), 5)
+
+
+class EntriesReportEntries(unittest.TestCase):
+    def test_entries_of_the_range(self):
+        tz = pytz.timezone("UTC")
+        entry_parser = EntryParser(tz)
+        entries = [entry_parser.parse(line.strip()) for line in LINES if line.strip()]
+        report_args = ReportArgs(
+            range=DateRange(datetime.date(2014, 3, 17), datetime.date(2014, 3, 17)),
+            current_activity_name=None,
+            project_name_filter=None,
+            csv_section=None,
+            show_comments=False,
+            show_details=False,
+            show_per_day=False,
+        )
+
+        entries = report_entries.entries_report_entries(entries, report_args, tz)
+
+        self.assertEqual(
+            [str(entry) for entry in entries],
+            [
+                "2014-03-14 08:00+0000 hello",
+                "2014-03-14 09:00+0000 hard work",
+                "2014-03-17 09:00+0000 hello",
+                "2014-03-17 10:15+0000 hard work",
+                "2014-03-19 09:00+0000 hello",
+            ],
+        )
@@ -0,0 +1,80 @@
+import datetime
+import itertools
+import unittest
+from unittest import mock
+
+import pytz
+
+from utt.components.entry_parser import EntryParser
+from utt.components.report_entries import _take_range
+from utt.components.sqlite_storage import SQLiteStorage
+from utt.components.storage_config import SQLITE_LAYOUT, StorageConfig
+
+from .fixtures import LINES
+
+
+class Range(unittest.TestCase):
+    def setUp(self):
+        self.tz = pytz.timezone("UTC")
+        entry_parser = EntryParser(self.tz)
+        self.storage = SQLiteStorage("utt.log", StorageConfig(SQLITE_LAYOUT), entry_parser)
+
+        patcher = mock.patch.object(SQLiteStorage, "filename", return_value=":memory:")
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        for line in LINES:
+            line = line.strip()
+            if line:
+                self.storage.add(entry_parser.parse(line), line)
+
+    def range(self, start, end):
+        start_datetime = self.tz.localize(start)
+        end_datetime = self.tz.localize(end)
+        entries = _take_range(self.storage.range(start_datetime, end_datetime), start_datetime, end_datetime)
+        return [str(entry) for entry in entries]
+
+    def test_range_with_surrounding_entries(self):
+        self.assertEqual(
+            self.range(datetime.datetime(2014, 3, 19), datetime.datetime(2014, 3, 20)),
+            [
+                "2014-03-17 09:00+0000 hello",
+                "2014-03-17 10:15+0000 hard work",
+                "2014-03-19 09:00+0000 hello",
+                "2014-03-19 12:00+0000 asd: A-526",
+                "2014-03-19 13:00+0000 lunch**",
+                "2014-03-20 09:00+0000 hello",
+            ],
+        )
+
+    def test_range_before_first_entry(self):
+        self.assertEqual(
+            self.range(datetime.datetime(2014, 1, 1), datetime.datetime(2014, 1, 2)),
+            ["2014-03-14 08:00+0000 hello"],
+        )
+
+    def test_range_after_last_entry(self):
+        self.assertEqual(
+            self.range(datetime.datetime(2015, 1, 1), datetime.datetime(2015, 1, 2)),
+            ["2014-03-20 09:00+0000 hello", "2014-03-20 10:00+0000 qwer: b-73"],
+        )
+
+    def test_last_entry(self):
+        self.assertEqual(str(self.storage.last_entry()), "2014-03-20 10:00+0000 qwer: b-73")
+
+    def test_add_before_last_entry(self):
+        entry_parser = EntryParser(self.tz)
+        line = "2014-03-20 09:30 late"
+        with self.assertRaisesRegex(Exception, "Not in chronological order"):
+            self.storage.add(entry_parser.parse(line), line)
+
+        self.assertEqual(self.storage.count(), 9)
+
+    def test_reversed_entries_skip_invalid_lines(self):
+        with self.storage._connect() as connection:
+            connection.execute("INSERT INTO entries (timestamp, line) VALUES (?, ?)", (2**40, "invalid"))
+
+        self.assertEqual(
+            [str(entry) for entry in itertools.islice(self.storage.reversed_entries(), 2)],
+            ["2014-03-20 10:00+0000 qwer: b-73", "2014-03-20 09:00+0000 hello"],
+        )
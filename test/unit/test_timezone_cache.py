@@ -0,0 +1,48 @@
+import datetime
+import unittest
+
+import pytz
+
+from utt.components.timezone_cache import LocalizationCache, fixed_offset_timezone
+
+
+class FixedOffsetTimezone(unittest.TestCase):
+    def test_offsets(self):
+        self.assertEqual(fixed_offset_timezone("+0100").utcoffset(None), datetime.timedelta(hours=1))
+        self.assertEqual(fixed_offset_timezone(b"-09:30").utcoffset(None), -datetime.timedelta(hours=9, minutes=30))
+
+    def test_same_timezone_for_same_offset(self):
+        self.assertIs(fixed_offset_timezone("+0100"), fixed_offset_timezone("+0100"))
+
+    def test_offset_of_a_day(self):
+        with self.assertRaises(ValueError):
+            fixed_offset_timezone("+2400")
+
+
+class Localize(unittest.TestCase):
+    def setUp(self):
+        self.tz = pytz.timezone("Europe/Paris")
+        self.localization_cache = LocalizationCache(self.tz)
+
+    def assertLocalizedLikePytz(self, naive_datetime):
+        localized = self.localization_cache.localize(naive_datetime)
+        expected = self.tz.localize(naive_datetime)
+        self.assertEqual(localized, expected)
+        self.assertEqual(localized.utcoffset(), expected.utcoffset())
+
+    def test_day_without_transition(self):
+        for hour in range(24):
+            self.assertLocalizedLikePytz(datetime.datetime(2014, 3, 14, hour, 30))
+
+    def test_day_with_transition(self):
+        # Clocks go from 02:00 to 03:00, and back from 03:00 to 02:00
+        for day in [datetime.datetime(2014, 3, 30), datetime.datetime(2014, 10, 26)]:
+            for minute in range(0, 24 * 60, 15):
+                self.assertLocalizedLikePytz(day + datetime.timedelta(minutes=minute))
+
+    def test_hour_with_transition(self):
+        # Paris mean time (+00:09) ended at 00:00 on March 11, 1911, and
+        # clocks went back to 23:51 on March 10
+        day = datetime.datetime(1911, 3, 10)
+        for minute in range(2 * 24 * 60):
+            self.assertLocalizedLikePytz(day + datetime.timedelta(minutes=minute))
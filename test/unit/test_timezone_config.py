@@ -0,0 +1,25 @@
+import configparser
+import unittest
+from unittest import mock
+
+from utt.components.timezone_config import timezone_config
+
+
+class TimezoneConfigEngine(unittest.TestCase):
+    def config(self, engine):
+        config = configparser.ConfigParser()
+        config.read_dict({"timezone": {"enabled": "false", "engine": engine}})
+        return config
+
+    def test_engine(self):
+        self.assertEqual(timezone_config(self.config("zoneinfo")).engine(), "zoneinfo")
+
+    def test_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            timezone_config(self.config("dateutil"))
+
+    @mock.patch("utt.components.timezone_config.sys")
+    def test_zoneinfo_engine_before_python_3_9(self, sys):
+        sys.version_info = (3, 8, 18)
+        with self.assertRaisesRegex(ValueError, "requires Python 3.9"):
+            timezone_config(self.config("zoneinfo"))
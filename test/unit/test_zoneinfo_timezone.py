@@ -0,0 +1,52 @@
+import datetime
+import unittest
+
+import pytest
+import pytz
+
+# zoneinfo is not available before Python 3.9
+pytest.importorskip("zoneinfo")
+
+from utt.components.zoneinfo_timezone import ZoneInfoTimezone  # noqa: E402
+
+
+class Localize(unittest.TestCase):
+    def assertLocalizedLikePytz(self, name, naive_datetime):
+        localized = ZoneInfoTimezone(name).localize(naive_datetime)
+        expected = pytz.timezone(name).localize(naive_datetime)
+        self.assertEqual(
+            (localized, localized.utcoffset(), localized.tzname()),
+            (expected, expected.utcoffset(), expected.tzname()),
+        )
+
+    def test_no_transition(self):
+        self.assertLocalizedLikePytz("Europe/London", datetime.datetime(2018, 7, 1, 12, 30))
+        self.assertLocalizedLikePytz("Europe/London", datetime.datetime(2018, 12, 1, 12, 30))
+
+    def test_ambiguous_time(self):
+        # Clocks go back from 02:00 BST to 01:00 GMT
+        self.assertLocalizedLikePytz("Europe/London", datetime.datetime(2018, 10, 28, 1, 30))
+
+    def test_non_existent_time(self):
+        # Clocks go forward from 01:00 GMT to 02:00 BST
+        self.assertLocalizedLikePytz("Europe/London", datetime.datetime(2018, 3, 25, 1, 30))
+
+    def test_negative_dst(self):
+        # Irish Standard Time is the summer time, and GMT is the negative DST
+        self.assertLocalizedLikePytz("Europe/Dublin", datetime.datetime(2018, 10, 28, 1, 30))
+
+    def test_every_minute_of_a_dst_change(self):
+        for minute in range(0, 4 * 60):
+            self.assertLocalizedLikePytz(
+                "Australia/Lord_Howe", datetime.datetime(2018, 4, 1, 0, 0) + datetime.timedelta(minutes=minute)
+            )
+
+    def test_elapsed_time_across_a_dst_change(self):
+        timezone = ZoneInfoTimezone("Europe/London")
+        start = timezone.localize(datetime.datetime(2018, 10, 28, 0, 0))
+        end = timezone.localize(datetime.datetime(2018, 10, 28, 3, 0))
+        self.assertEqual(end - start, datetime.timedelta(hours=4))
+
+    def test_aware_datetime(self):
+        with self.assertRaises(ValueError):
+            ZoneInfoTimezone("Europe/London").localize(datetime.datetime(2018, 7, 1, tzinfo=datetime.timezone.utc))
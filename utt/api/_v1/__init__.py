@@ -11,9 +11,10 @@ from ...constants import HELLO_ENTRY_NAME
 from ...data_structures.activity import Activity
 from ...data_structures.entry import Entry
 from ...data_structures.name import Name
+from ...hook import Hook
 from ...report.activities.view import ActivitiesView
 from ...report.details.view import DetailsView
 from ...report.per_day.view import PerDayView
 from ...report.projects.view import ProjectsView
 from ...report.summary.view import SummaryView
-from ._private import register_command, register_component
+from ._private import register_command, register_component, register_hook
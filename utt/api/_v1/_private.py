@@ -8,24 +8,40 @@ import cargo
 from ...command import Command
 from ...components.activities import Activities, activities
 from ...components.add_entry import AddEntry
+from ...components.cache_config import CacheConfig, cache_config
+from ...components.cache_dirname import CacheDirname, cache_dirname
 from ...components.commands import Commands
 from ...components.config import config
 from ...components.config_dirname import ConfigDirname, config_dirname
 from ...components.config_filename import ConfigFilename, config_filename
 from ...components.data_dirname import DataDirname, data_dirname
 from ...components.data_filename import DataFilename, data_filename
+from ...components.data_filenames import DataFilenames, data_filenames
+from ...components.data_segments import DataSegments
 from ...components.default_config import DefaultConfig
 from ...components.entries import Entries, entries
+from ...components.entries_cache import EntriesCache
+from ...components.entry_index import EntryIndex
 from ...components.entry_lines import EntryLines
-from ...components.entry_parser import EntryParser
+from ...components.entry_parser import EntryParser, entry_parser
+from ...components.hook_queue import HookQueue
+from ...components.hooks import Hooks
+from ...components.index_config import IndexConfig, index_config
+from ...components.last_entry import LastEntry, entries_last_entry, last_entry
 from ...components.local_timezone import LocalTimezone, local_timezone
 from ...components.now import Now, now
 from ...components.output import Output
+from ...components.parallel_parser import ParallelParser
 from ...components.parse_args import parse_args
+from ...components.parse_config import ParseConfig, parse_config
 from ...components.report_args import ReportArgs, csv_section_name_to_csv_section, report_args  # noqa
+from ...components.report_entries import ReportEntries, entries_report_entries, report_entries
 from ...components.report_model import ReportModel
 from ...components.report_model.model import report
+from ...components.sqlite_storage import SQLiteStorage
+from ...components.storage_config import StorageConfig, storage_config
 from ...components.timezone_config import TimezoneConfig, timezone_config
+from ...hook import Hook
 from ...report.csv_view import CSVReportView
 
 
@@ -35,21 +51,36 @@ def create_container():
     _container[Activities] = activities
     _container[AddEntry] = AddEntry
     _container[argparse.Namespace] = parse_args
+    _container[CacheConfig] = cache_config
+    _container[CacheDirname] = cache_dirname
     _container[Commands] = []
     _container[ConfigParser] = config
     _container[ConfigDirname] = config_dirname
     _container[ConfigFilename] = config_filename
     _container[DataDirname] = data_dirname
     _container[DataFilename] = data_filename
+    _container[DataFilenames] = data_filenames
+    _container[DataSegments] = DataSegments
     _container[DefaultConfig] = DefaultConfig
     _container[Entries] = entries
-    _container[EntryParser] = EntryParser
+    _container[EntriesCache] = EntriesCache
+    _container[EntryParser] = entry_parser
+    _container[EntryIndex] = EntryIndex
     _container[EntryLines] = EntryLines
+    _container[HookQueue] = HookQueue
+    _container[Hooks] = []
+    _container[IndexConfig] = index_config
+    _container[LastEntry] = last_entry
     _container[LocalTimezone] = local_timezone
     _container[Now] = now
     _container[Output] = sys.stdout
+    _container[ParallelParser] = ParallelParser
+    _container[ParseConfig] = parse_config
     _container[ReportArgs] = report_args
+    _container[ReportEntries] = report_entries
     _container[ReportModel] = report
+    _container[SQLiteStorage] = SQLiteStorage
+    _container[StorageConfig] = storage_config
     _container[TimezoneConfig] = timezone_config
     _container[CSVReportView] = CSVReportView
 
@@ -62,9 +93,27 @@ def register_command(command: Command):
     container[command.handler_class] = command.handler_class
 
 
+def register_hook(hook: Hook):
+    container[Hooks].append(hook)
+    container[hook.handler_class] = hook.handler_class
+
+
 def register_component(interface: Type, constructor: Any):
+    components[interface] = constructor
     container[interface] = constructor
 
+    if interface is Entries:
+        # Reports and the last entry are read from the data file without
+        # going through Entries; read them from the overridden entries
+        # instead, unless the plugin overrides them too
+        for derived_interface, derived_constructor in (
+            (ReportEntries, entries_report_entries),
+            (LastEntry, entries_last_entry),
+        ):
+            components.setdefault(derived_interface, derived_constructor)
+            container[derived_interface] = components[derived_interface]
+
 
 commands = {}
+components = {}
 container = create_container()
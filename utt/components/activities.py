@@ -4,10 +4,10 @@ from typing import List, Optional
 
 from ..constants import HELLO_ENTRY_NAME
 from ..data_structures.activity import Activity
-from .entries import Entries
 from .local_timezone import LocalTimezone
 from .now import Now
 from .report_args import DateRange, ReportArgs
+from .report_entries import ReportEntries
 
 Activities = List[Activity]
 
@@ -57,9 +57,10 @@ def remove_hello_activities(activities):
             yield activity
 
 
-def activities(report_args: ReportArgs, now: Now, local_timezone: LocalTimezone, entries: Entries) -> Activities:
-    activities = list(_activities(entries))
-    _filtered_activities = list(filter_activities_by_range(activities, report_args.range, local_timezone))
+def activities(report_args: ReportArgs, now: Now, local_timezone: LocalTimezone, entries: ReportEntries) -> Activities:
+    last_activity = []
+    all_activities = _track_last(_activities(entries), last_activity)
+    _filtered_activities = list(filter_activities_by_range(all_activities, report_args.range, local_timezone))
 
     start_datetime = local_timezone.localize(
         datetime.datetime(
@@ -74,20 +75,22 @@ def activities(report_args: ReportArgs, now: Now, local_timezone: LocalTimezone,
         + datetime.timedelta(days=1)
     )
 
-    last_activity = activities[-1] if activities else None
     current_activity = get_current_activity(
-        report_args.current_activity_name, last_activity, now, start_datetime, end_datetime
+        report_args.current_activity_name,
+        last_activity[0] if last_activity else None,
+        now,
+        start_datetime,
+        end_datetime,
     )
     if current_activity is not None:
         _filtered_activities.append(current_activity)
 
-    _filtered_activities = list(remove_hello_activities(_filtered_activities))
-    _filtered_activities = list(filter_activities_by_project(_filtered_activities, report_args.project_name_filter))
-
-    return _filtered_activities
+    return list(
+        filter_activities_by_project(remove_hello_activities(_filtered_activities), report_args.project_name_filter)
+    )
 
 
-def _activities(entries: Entries):
+def _activities(entries: ReportEntries):
     for prev_entry, next_entry in _pairwise(entries):
         activity = Activity(
             next_entry.name,
@@ -104,3 +107,10 @@ def _pairwise(iterable):
     a, b = itertools.tee(iterable)
     next(b, None)
     return zip(a, b)
+
+
+def _track_last(iterable, last):
+    "Yield the items of iterable and keep the last one in the list last"
+    for item in iterable:
+        last[:] = [item]
+        yield item
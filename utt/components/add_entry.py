@@ -1,47 +1,159 @@
-import copy
 import errno
+import itertools
+import locale
 import os
+from typing import List
 
+from ..constants import STDIN_DATA_FILENAME
+from ..data_structures.entry import Entry
+from .data_file_lock import locked_data_file
 from .data_filename import DataFilename
-from .entries import Entries
+from .data_filenames import DataFilenames
+from .data_segments import DataSegments
+from .entry_index import EntryIndex
+from .entry_lines import EntryLines, is_compressed
+from .entry_parser import EntryParser
+from .hook_queue import HookQueue
+from .last_entry import last_entry
+from .sqlite_storage import SQLiteStorage
+from .storage_config import StorageConfig
 from .timezone_config import TimezoneConfig
 
 
 class AddEntry:
-    def __init__(self, data_filename: DataFilename, timezone_config: TimezoneConfig, entries: Entries):
+    def __init__(
+        self,
+        data_filename: DataFilename,
+        timezone_config: TimezoneConfig,
+        entry_lines: EntryLines,
+        entry_parser: EntryParser,
+        entry_index: EntryIndex,
+        data_segments: DataSegments,
+        sqlite_storage: SQLiteStorage,
+        data_filenames: DataFilenames,
+        storage_config: StorageConfig,
+        hook_queue: HookQueue,
+    ):
         self._data_filename = data_filename
         self._timezone_config = timezone_config
-        self._entries = entries
+        self._entry_lines = entry_lines
+        self._entry_parser = entry_parser
+        self._entry_index = entry_index
+        self._data_segments = data_segments
+        self._sqlite_storage = sqlite_storage
+        self._data_filenames = data_filenames
+        self._storage_config = storage_config
+        self._hook_queue = hook_queue
 
-    def __call__(self, new_entry):
+    def __call__(self, new_entry: Entry):
+        self._add([new_entry])
+
+    def add_all(self, new_entries: List[Entry]) -> None:
+        """Add entries at once, with a single write per data file.
+
+        The entries must be in chronological order and not before the
+        last entry.
+        """
+        self._add(new_entries, check_order=True)
+
+    def _add(self, new_entries, check_order=False):
+        if self._data_filename == STDIN_DATA_FILENAME:
+            raise Exception("Cannot add an entry to the standard input")
+        if len(self._data_filenames) > 1:
+            raise Exception("Cannot add an entry to several data files")
+        if is_compressed(self._data_filename):
+            raise Exception("Cannot add an entry to a compressed data file")
+
+        if not new_entries:
+            return
+
+        if self._sqlite_storage.enabled():
+            # Entries are always checked, since they are stored in
+            # chronological order
+            self._sqlite_storage.add_all(
+                [(new_entry, str(_localize(self._timezone_config, new_entry))) for new_entry in new_entries]
+            )
+        elif self._data_segments.enabled():
+            self._add_to_segments(new_entries, check_order)
+        else:
+            self._add_to_file(new_entries, check_order)
+
+        self._hook_queue.schedule(new_entries)
+
+    def _add_to_file(self, new_entries, check_order):
         _create_directories_for_file(self._data_filename)
-        insert_new_line_before = _insert_new_line(self._entries, new_entry)
-        new_entry = _localize(self._timezone_config, new_entry)
-        _append_line_to_file(
-            self._data_filename,
-            str(new_entry),
-            insert_new_line_before=insert_new_line_before,
-        )
+        with locked_data_file(self._data_filename, os.O_RDWR | os.O_APPEND | os.O_CREAT) as fd:
+            # The last entry is read once the data file is locked, so that
+            # entries added concurrently are taken into account
+            previous_entry = self._last_entry()
+            if check_order:
+                _check_chronological_order(previous_entry, new_entries)
+            appended_to = os.fstat(fd)
+            _append(fd, self._format(previous_entry, new_entries), fsync=self._storage_config.fsync())
 
+            # Only the new entries changed the data file since `appended_to`
+            # until the lock is released
+            self._entry_index.update(appended_to)
 
-def _append_line_to_file(filename, line, insert_new_line_before):
-    try:
-        with open(filename, "rb+") as file:
-            file.seek(-1, os.SEEK_END)
-            last_char = file.read(1)
-            prepend_new_line = last_char != b"\n"
-    except OSError as os_err:
-        if os_err.errno not in [errno.EINVAL, errno.ENOENT]:
-            raise
-        prepend_new_line = False
+    def _add_to_segments(self, new_entries, check_order):
+        # The manifest is locked from reading the last entry through recording
+        # the new ones, so that concurrent adds and archives see each other
+        with self._data_segments.locked():
+            previous_entry = self._last_entry()
+            if check_order:
+                _check_chronological_order(previous_entry, new_entries)
+            for filename, segment_entries in itertools.groupby(
+                new_entries, key=lambda new_entry: self._data_segments.path_for(new_entry.datetime)
+            ):
+                segment_entries = list(segment_entries)
+                _create_directories_for_file(filename)
+                with locked_data_file(filename, os.O_RDWR | os.O_APPEND | os.O_CREAT) as fd:
+                    # A new segment doesn't start with an empty line
+                    _append(
+                        fd,
+                        self._format(previous_entry if os.fstat(fd).st_size > 0 else None, segment_entries),
+                        fsync=self._storage_config.fsync(),
+                    )
+                previous_entry = segment_entries[-1]
+
+            self._data_segments.record(new_entries)
+
+    def _last_entry(self):
+        return last_entry(self._entry_lines, self._entry_parser, self._data_segments, self._sqlite_storage)
 
-    with open(filename, "a") as file:
-        if prepend_new_line:
-            file.write("\n")
-        if insert_new_line_before:
-            file.write("\n")
-        file.write(line)
-        file.write("\n")
+    def _format(self, previous_entry, new_entries):
+        """Lines of `new_entries`, with an empty line before each new day."""
+        lines = []
+        for new_entry in new_entries:
+            if _insert_new_line(previous_entry, new_entry):
+                lines.append("")
+            lines.append(str(_localize(self._timezone_config, new_entry)))
+            previous_entry = new_entry
+
+        return "".join(line + "\n" for line in lines)
+
+
+def _append(fd, text, fsync=False):
+    """Append `text` to a locked data file in a single write.
+
+    A newline is written first if the last line of the file is not
+    terminated by one.
+    """
+    size = os.fstat(fd).st_size
+    prepend_new_line = size > 0 and os.pread(fd, 1, size - 1) != b"\n"
+
+    payload = ("\n" if prepend_new_line else "") + text
+    _write_all(fd, payload.encode(locale.getpreferredencoding(False)))
+
+    if fsync:
+        os.fsync(fd)
+
+
+def _write_all(fd, data):
+    # A regular file is written in one call, unless the disk is full
+    while data:
+        written = os.write(fd, data)
+        data = data[written:]
 
 
 def _create_directories_for_file(filename):
@@ -53,11 +165,17 @@ def _create_directories_for_file(filename):
             raise
 
 
-def _insert_new_line(entries, new_entry):
-    if not entries:
+def _check_chronological_order(last_entry, new_entries):
+    for i, new_entry in enumerate(new_entries):
+        previous_entry = new_entries[i - 1] if i > 0 else last_entry
+        if previous_entry is not None and previous_entry.datetime > new_entry.datetime:
+            raise Exception("Not in chronological order: %s > %s" % (previous_entry, new_entry))
+
+
+def _insert_new_line(last_entry, new_entry):
+    if last_entry is None:
         return False
 
-    last_entry = entries[-1]
     return last_entry.datetime.date() != new_entry.datetime.date()
 
 
@@ -65,6 +183,9 @@ def _localize(timezone_config, new_entry):
     if timezone_config.enabled():
         return new_entry
 
-    new_entry = copy.deepcopy(new_entry)
-    new_entry.datetime = new_entry.datetime.replace(tzinfo=None)
-    return new_entry
+    return Entry(
+        new_entry.datetime.replace(tzinfo=None),
+        new_entry.name,
+        new_entry.is_current_entry,
+        comment=new_entry.comment,
+    )
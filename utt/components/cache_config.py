@@ -0,0 +1,14 @@
+import configparser
+
+
+class CacheConfig:
+    def __init__(self, enabled):
+        self._enabled = enabled
+
+    def enabled(self):
+        return self._enabled
+
+
+def cache_config(config: configparser.ConfigParser) -> CacheConfig:
+    enabled = config.getboolean("cache", "enabled")
+    return CacheConfig(enabled)
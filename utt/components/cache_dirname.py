@@ -0,0 +1,12 @@
+import os
+import typing
+
+from ..constants import CACHE_HOME_DEFAULT_DIRNAME, CACHE_HOME_ENV_VAR_NAME, CACHE_HOME_SUB_DIRNAME
+
+CacheDirname = typing.NewType("CacheDirname", str)
+
+
+def cache_dirname() -> CacheDirname:
+    base_cache_dir_name = os.getenv(CACHE_HOME_ENV_VAR_NAME, os.path.expanduser(CACHE_HOME_DEFAULT_DIRNAME))
+
+    return CacheDirname(os.path.join(base_cache_dir_name, CACHE_HOME_SUB_DIRNAME))
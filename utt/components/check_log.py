@@ -0,0 +1,108 @@
+import datetime
+import itertools
+import locale
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..constants import HELLO_ENTRY_NAME
+from ..data_structures.entry import Entry
+from .entry_lines import EntryLines
+from .entry_parser import EntryParser
+
+SYNTAX_PROBLEM = "syntax"
+ORDER_PROBLEM = "order"
+DUPLICATE_PROBLEM = "duplicate"
+GAP_PROBLEM = "gap"
+
+
+class Problem(NamedTuple):
+    line_number: int
+    kind: str
+    message: str
+
+
+class LogCheck:
+    """Check of numbered lines, one after the other.
+
+    Unlike parsing, checking goes on after an invalid line, so that all
+    the problems are reported at once. Each entry is compared to the
+    entry before it: they must be in chronological order, at different
+    times, and, unless it's a hello entry, no more than `max_gap` apart.
+    """
+
+    def __init__(self, entry_parser: EntryParser, max_gap: datetime.timedelta, previous_entry: Optional[Entry] = None):
+        self._entry_parser = entry_parser
+        self._max_gap = max_gap
+        self._encoding = locale.getpreferredencoding(False)
+        self.previous_entry = previous_entry
+        self.first_entry = None
+        self.first_entry_line_number = None
+        self.line_count = 0
+
+    def check(self, numbered_lines: Iterable[Tuple[int, bytes]]) -> Iterator[Problem]:
+        for line_number, line in numbered_lines:
+            self.line_count += 1
+            line = line.strip()
+            # Ignore empty lines
+            if not line:
+                continue
+
+            entry = self._entry_parser.parse(line)
+            if entry is None:
+                yield Problem(
+                    line_number,
+                    SYNTAX_PROBLEM,
+                    "Invalid syntax: %s" % line.decode(self._encoding, errors="replace"),
+                )
+                continue
+
+            if self.first_entry is None:
+                self.first_entry, self.first_entry_line_number = entry, line_number
+            yield from compare_entries(self.previous_entry, entry, line_number, self._max_gap)
+            self.previous_entry = entry
+
+
+def compare_entries(
+    previous_entry: Optional[Entry], entry: Entry, line_number: int, max_gap: datetime.timedelta
+) -> Iterator[Problem]:
+    if previous_entry is None:
+        return
+
+    if previous_entry.datetime > entry.datetime:
+        yield Problem(line_number, ORDER_PROBLEM, "Not in chronological order: %s > %s" % (previous_entry, entry))
+    elif previous_entry.datetime == entry.datetime:
+        yield Problem(line_number, DUPLICATE_PROBLEM, "Same time as the previous entry: %s" % entry)
+    elif entry.name != HELLO_ENTRY_NAME and entry.datetime - previous_entry.datetime > max_gap:
+        yield Problem(
+            line_number,
+            GAP_PROBLEM,
+            "%s since the previous entry, without hello: %s" % (entry.datetime - previous_entry.datetime, entry),
+        )
+
+
+class CheckedChunk(NamedTuple):
+    problems: List[Problem]
+    first_entry: Optional[Entry]
+    first_entry_line_number: Optional[int]
+    last_entry: Optional[Entry]
+    line_count: int
+
+
+def check_chunk(
+    entry_lines: EntryLines, entry_parser: EntryParser, start: int, end: int, max_gap: datetime.timedelta
+) -> CheckedChunk:
+    """Check the lines that start between byte `start` and byte `end`.
+
+    Line numbers are relative to the start of the chunk, and its first
+    entry is not compared to the entries before it.
+    """
+    log_check = LogCheck(entry_parser, max_gap)
+    lines = itertools.takewhile(lambda offset_line: offset_line[0] < end, entry_lines.lines_at(start))
+    numbered_lines = ((line_number, line) for line_number, (_, line) in enumerate(lines, 1))
+    problems = list(log_check.check(numbered_lines))
+    return CheckedChunk(
+        problems=problems,
+        first_entry=log_check.first_entry,
+        first_entry_line_number=log_check.first_entry_line_number,
+        last_entry=log_check.previous_entry,
+        line_count=log_check.line_count,
+    )
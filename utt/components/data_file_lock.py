@@ -0,0 +1,43 @@
+import contextlib
+import os
+from typing import Iterator
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Not available on Windows, where data files are not locked
+    fcntl = None
+
+
+@contextlib.contextmanager
+def locked_data_file(filename: str, flags: int = os.O_RDONLY) -> Iterator[int]:
+    """Open a data file and hold an exclusive lock on it.
+
+    Every command that modifies a data file takes this lock, so that
+    entries are not appended while the file is rewritten. Since data
+    files are rewritten by replacing them, the file is opened again if
+    it was replaced while the lock was awaited.
+    """
+    while True:
+        fd = os.open(filename, flags, 0o666)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                if not _is_current_file(fd, filename):
+                    continue
+
+            yield fd
+            return
+        finally:
+            # Closing the file releases the lock
+            os.close(fd)
+
+
+def _is_current_file(fd, filename):
+    try:
+        stat = os.stat(filename)
+    except FileNotFoundError:
+        return False
+
+    fd_stat = os.fstat(fd)
+    return (stat.st_dev, stat.st_ino) == (fd_stat.st_dev, fd_stat.st_ino)
@@ -1,15 +1,14 @@
-import argparse
-import os
 import typing
 
-from ..constants import ENTRY_FILENAME
-from .data_dirname import DataDirname
+from .data_filenames import DataFilenames
 
 DataFilename = typing.NewType("DataFilename", str)
 
 
-def data_filename(args: argparse.Namespace, data_dirname: DataDirname) -> DataFilename:
-    if args.data_filename:
-        return args.data_filename
+def data_filename(data_filenames: DataFilenames) -> DataFilename:
+    """The data file, or the first one if there are several.
 
-    return DataFilename(os.path.join(data_dirname, ENTRY_FILENAME))
+    Commands that write to the data file refuse to run with several
+    data files.
+    """
+    return DataFilename(data_filenames[0])
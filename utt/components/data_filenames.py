@@ -0,0 +1,29 @@
+import argparse
+import glob
+import os
+import typing
+from typing import List
+
+from ..constants import ENTRY_FILENAME
+from .data_dirname import DataDirname
+
+DataFilenames = typing.NewType("DataFilenames", List[str])
+
+
+def data_filenames(args: argparse.Namespace, data_dirname: DataDirname) -> DataFilenames:
+    """Data files given with --data, which may be repeated and may be a glob pattern."""
+    if not args.data_filenames:
+        return DataFilenames([os.path.join(data_dirname, ENTRY_FILENAME)])
+
+    filenames = []
+    for pattern in args.data_filenames:
+        if not glob.has_magic(pattern):
+            filenames.append(pattern)
+            continue
+
+        matches = sorted(glob.glob(os.path.expanduser(pattern)))
+        if not matches:
+            raise Exception("No data file matches %s" % pattern)
+        filenames.extend(matches)
+
+    return DataFilenames(filenames)
@@ -0,0 +1,402 @@
+import contextlib
+import datetime
+import glob
+import json
+import os
+import tempfile
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from ..constants import SEGMENT_FILENAME_FORMAT, SEGMENTS_MANIFEST_FILENAME, STDIN_DATA_FILENAME
+from ..data_structures.entry import Entry
+from .data_file_lock import locked_data_file
+from .data_filename import DataFilename
+from .entry_lines import COMPRESSED_FILE_OPENERS, EntryLines, is_compressed, open_data_file
+from .entry_parser import EntryParser
+from .parse_log import _parse_line, parse_data_file
+from .storage_config import SEGMENTED_LAYOUT, StorageConfig
+
+MANIFEST_VERSION = 1
+
+# Compression formats of archives, and the suffix of their filename
+ARCHIVE_SUFFIXES = {
+    "gzip": ".gz",
+    "lzma": ".xz",
+}
+
+
+class Segment(NamedTuple):
+    filename: str
+    start: datetime.datetime
+    end: datetime.datetime
+    entry_count: int
+
+
+class DataSegments:
+    """Segmented storage layout.
+
+    Entries are stored in one file per month (e.g. 2026-10.log) in the
+    data directory, along with a manifest that records the time bounds
+    of each segment, so that only the segments overlapping a report
+    range are read.
+
+    The segmented layout is used if it is enabled in the config or if
+    the data filename is a directory.
+
+    Segments of past months can be archived, i.e. compressed (e.g.
+    2026-10.log.gz). They are read like the other segments, and only
+    when a report reaches back into them. With the single file layout,
+    the manifest only lists the archives of the entries moved out of
+    the data file.
+
+    The manifest is only read, updated and written back while its lock
+    is held (see `locked`), so that concurrent commands don't lose each
+    other's updates.
+    """
+
+    def __init__(self, data_filename: DataFilename, storage_config: StorageConfig):
+        self._data_filename = data_filename
+        self._storage_config = storage_config
+        self._segments = None
+        self._is_locked = False
+
+    def enabled(self) -> bool:
+        if self._data_filename == STDIN_DATA_FILENAME:
+            return False
+
+        return self._storage_config.layout() == SEGMENTED_LAYOUT or os.path.isdir(self._data_filename)
+
+    def dirname(self) -> str:
+        if os.path.isdir(self._data_filename):
+            return self._data_filename
+
+        return os.path.dirname(self._data_filename)
+
+    def path(self, segment: Segment) -> str:
+        return os.path.join(self.dirname(), segment.filename)
+
+    def segments(self) -> List[Segment]:
+        if self._segments is None:
+            self._segments = self._load_manifest()
+        return self._segments
+
+    @contextlib.contextmanager
+    def locked(self) -> Iterator[None]:
+        """Hold the lock of the manifest, which is loaded again once it's held.
+
+        The lock is taken once per process: nested calls don't lock it
+        again.
+        """
+        if self._is_locked:
+            yield
+            return
+
+        os.makedirs(self.dirname(), exist_ok=True)
+        with locked_data_file(self._manifest_filename() + ".lock", os.O_RDWR | os.O_CREAT):
+            self._is_locked = True
+            self._segments = None
+            try:
+                yield
+            finally:
+                self._is_locked = False
+
+    def archives(self) -> List[Segment]:
+        return [segment for segment in self.segments() if is_compressed(segment.filename)]
+
+    def overlapping(self, start_datetime: datetime.datetime, end_datetime: datetime.datetime) -> List[Segment]:
+        """Segments to read to report on entries from `start_datetime` to `end_datetime`.
+
+        Besides the segments overlapping the range, the segments holding
+        the last two entries before the range and the first entry after
+        it are included.
+        """
+        segments = self.segments()
+
+        first = 0
+        while first < len(segments) and segments[first].end < start_datetime:
+            first += 1
+
+        entry_count = 0
+        while first > 0 and entry_count < 2:
+            first -= 1
+            entry_count += segments[first].entry_count
+
+        stop = first
+        while stop < len(segments) and segments[stop].start < end_datetime:
+            stop += 1
+
+        # Include the segment holding the first entry after the range
+        stop += 1
+
+        return segments[first:stop]
+
+    def path_for(self, entry_datetime: datetime.datetime) -> str:
+        return os.path.join(self.dirname(), entry_datetime.strftime(SEGMENT_FILENAME_FORMAT))
+
+    def record(self, entries: List[Entry]) -> None:
+        """Update the manifest after `entries` were appended to their segments."""
+        with self.locked():
+            segments = list(self.segments())
+            positions = {segment.filename: i for i, segment in enumerate(segments)}
+
+            for entry in entries:
+                filename = os.path.basename(self.path_for(entry.datetime))
+                if filename in positions:
+                    i = positions[filename]
+                    segments[i] = segments[i]._replace(end=entry.datetime, entry_count=segments[i].entry_count + 1)
+                else:
+                    positions[filename] = len(segments)
+                    segments.append(Segment(filename=filename, start=entry.datetime, end=entry.datetime, entry_count=1))
+
+            self._save_manifest(segments)
+
+    def rebuild(self, entry_parser: EntryParser) -> None:
+        """Recompute the manifest from the segment files.
+
+        Archives are not modified after they are written and are kept
+        as they are.
+        """
+        with self.locked():
+            pattern = os.path.join(glob.escape(self.dirname()), "[0-9][0-9][0-9][0-9]-[0-9][0-9].log")
+            segments = self.archives()
+
+            for path in sorted(glob.glob(pattern)):
+                entries = list(parse_segment(path, entry_parser))
+                if entries:
+                    segments.append(
+                        Segment(
+                            filename=os.path.basename(path),
+                            start=entries[0].datetime,
+                            end=entries[-1].datetime,
+                            entry_count=len(entries),
+                        )
+                    )
+
+            segments.sort(key=lambda segment: segment.filename)
+            self._save_manifest(segments)
+
+    def refresh(self, segment: Segment, entry_parser: EntryParser) -> None:
+        """Recompute the manifest entry of a segment that was modified."""
+        with self.locked():
+            segments = list(self.segments())
+            # The manifest may have been updated since `segment` was read from it
+            i = [other.filename for other in segments].index(segment.filename)
+            entries = list(parse_segment(self.path(segment), entry_parser))
+
+            if entries and i > 0 and segments[i - 1].end > entries[0].datetime:
+                raise Exception(
+                    "%s: Not in chronological order: %s > %s"
+                    % (self.path(segment), segments[i - 1].end.isoformat(), entries[0].datetime.isoformat())
+                )
+
+            if entries:
+                segments[i] = segment._replace(
+                    start=entries[0].datetime, end=entries[-1].datetime, entry_count=len(entries)
+                )
+            else:
+                del segments[i]
+            self._save_manifest(segments)
+
+    def import_file(self, filename: str, entry_parser: EntryParser) -> List[Segment]:
+        """Split a single data file into segments.
+
+        The segments are added after the existing archives.
+        """
+        with self.locked():
+            segments, _ = self._split_file(filename, entry_parser)
+            self._save_manifest(self.archives() + segments)
+            return segments
+
+    def archive_file(
+        self, filename: str, entry_parser: EntryParser, before: datetime.datetime, suffix: str
+    ) -> Tuple[List[Segment], int]:
+        """Move the entries of a single data file from before `before` into archives.
+
+        Returns the new archives and the offset of the first line of
+        the data file that was not archived. The caller is responsible
+        for removing the archived lines from the data file.
+        """
+        with self.locked():
+            archives, offset = self._split_file(filename, entry_parser, before=before, suffix=suffix)
+            self._save_manifest(self.segments() + archives)
+            return archives, offset
+
+    def archive_segments(self, before: datetime.datetime, suffix: str) -> List[Segment]:
+        """Compress the segments of the months before the month of `before`."""
+        with self.locked():
+            before_filename = before.strftime(SEGMENT_FILENAME_FORMAT)
+            segments = list(self.segments())
+            archived = []
+
+            for i, segment in enumerate(segments):
+                if is_compressed(segment.filename) or segment.filename >= before_filename:
+                    continue
+
+                archive = segment._replace(filename=segment.filename + suffix)
+                with open(self.path(segment), "rb") as segment_file:
+                    data = segment_file.read()
+                _write_archive(self.path(archive), data, suffix)
+
+                segments[i] = archive
+                archived.append((segment, archive))
+
+            self._save_manifest(segments)
+            for segment, _ in archived:
+                os.unlink(self.path(segment))
+
+            return [archive for _, archive in archived]
+
+    def export_file(self, filename: str) -> None:
+        """Concatenate the segments into a single data file."""
+        with open(filename, "xb") as data_file:
+            for i, segment in enumerate(self.segments()):
+                with open_data_file(self.path(segment)) as segment_file:
+                    data = segment_file.read().strip(b"\n")
+                if i > 0:
+                    data_file.write(b"\n")
+                data_file.write(data + b"\n")
+
+    def _split_file(
+        self,
+        filename: str,
+        entry_parser: EntryParser,
+        before: Optional[datetime.datetime] = None,
+        suffix: str = "",
+    ) -> Tuple[List[Segment], int]:
+        """Write the entries of a data file to the segments of their month.
+
+        If `before` is given, stop at the first entry of the month of
+        `before`. Returns the segments written and the offset where it
+        stopped.
+        """
+        before_filename = None if before is None else before.strftime(SEGMENT_FILENAME_FORMAT)
+        segments = []
+        segment_file = None
+        previous_entry = None
+        offset = 0
+
+        try:
+            for line_number, (offset, line) in enumerate(EntryLines(DataFilename(filename)).lines_at(0), 1):
+                parsed_line = _parse_line(previous_entry, line_number, line.strip(), entry_parser)
+
+                if parsed_line is None:
+                    # Blank lines separate days within a segment
+                    if segment_file is not None:
+                        segment_file.write(b"\n")
+                    continue
+
+                previous_entry, entry = parsed_line
+                path = self.path_for(entry.datetime)
+                if before_filename is not None and os.path.basename(path) >= before_filename:
+                    break
+
+                path += suffix
+                if not segments or segments[-1].filename != os.path.basename(path):
+                    if segment_file is not None:
+                        segment_file.close()
+                    segment_file = open_data_file(path, "xb")
+                    segments.append(Segment(os.path.basename(path), entry.datetime, entry.datetime, 0))
+
+                segment_file.write(line.rstrip(b"\r\n") + b"\n")
+                segments[-1] = segments[-1]._replace(end=entry.datetime, entry_count=segments[-1].entry_count + 1)
+            else:
+                offset = EntryLines(DataFilename(filename)).size()
+        finally:
+            if segment_file is not None:
+                segment_file.close()
+
+        return segments, offset
+
+    def _manifest_filename(self) -> str:
+        return os.path.join(self.dirname(), SEGMENTS_MANIFEST_FILENAME)
+
+    def _load_manifest(self) -> List[Segment]:
+        # An archive read directly is not part of the manifest of its directory
+        if self._data_filename == STDIN_DATA_FILENAME or is_compressed(self._data_filename):
+            return []
+
+        try:
+            with open(self._manifest_filename()) as manifest_file:
+                manifest = json.load(manifest_file)
+        except FileNotFoundError:
+            return []
+
+        if manifest.get("version") != MANIFEST_VERSION:
+            raise Exception("Unsupported segments manifest version: %s" % manifest.get("version"))
+
+        return [
+            Segment(
+                filename=segment["filename"],
+                start=datetime.datetime.fromisoformat(segment["start"]),
+                end=datetime.datetime.fromisoformat(segment["end"]),
+                entry_count=segment["entries"],
+            )
+            for segment in manifest["segments"]
+        ]
+
+    def _save_manifest(self, segments: List[Segment]) -> None:
+        manifest = {
+            "version": MANIFEST_VERSION,
+            "segments": [
+                {
+                    "filename": segment.filename,
+                    "start": segment.start.isoformat(),
+                    "end": segment.end.isoformat(),
+                    "entries": segment.entry_count,
+                }
+                for segment in segments
+            ],
+        }
+
+        os.makedirs(self.dirname(), exist_ok=True)
+        fd, tmp_filename = tempfile.mkstemp(dir=self.dirname())
+        try:
+            with os.fdopen(fd, "w") as manifest_file:
+                json.dump(manifest, manifest_file, indent=2)
+            os.replace(tmp_filename, self._manifest_filename())
+        except BaseException:
+            os.unlink(tmp_filename)
+            raise
+
+        self._segments = segments
+
+
+def _write_archive(filename: str, data: bytes, suffix: str) -> None:
+    fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(filename))
+    os.close(fd)
+    try:
+        with COMPRESSED_FILE_OPENERS[suffix](tmp_filename, "wb") as archive_file:
+            archive_file.write(data)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        os.unlink(tmp_filename)
+        raise
+
+
+def parse_segment(path: str, entry_parser: EntryParser, previous_entry: Optional[Entry] = None) -> Iterator[Entry]:
+    return parse_data_file(path, entry_parser, previous_entry=previous_entry)
+
+
+def parse_segments(data_segments: DataSegments, segments: Iterable[Segment], entry_parser: EntryParser):
+    previous_entry = None
+    for segment in segments:
+        for previous_entry in parse_segment(data_segments.path(segment), entry_parser, previous_entry):
+            yield previous_entry
+
+
+def reversed_segment_entries(
+    data_segments: DataSegments, segments: List[Segment], entry_parser: EntryParser
+) -> Iterator[Entry]:
+    """Valid entries of segments, from the last to the first.
+
+    The segments are read backwards, so reading the last entries does
+    not depend on their size.
+    """
+    for segment in reversed(segments):
+        for _, line in EntryLines(DataFilename(data_segments.path(segment))).reversed_lines():
+            entry = entry_parser.parse(line.strip())
+            if entry is not None:
+                yield entry
+
+
+def last_segment_entry(data_segments: DataSegments, entry_parser: EntryParser) -> Optional[Entry]:
+    return next(reversed_segment_entries(data_segments, data_segments.segments(), entry_parser), None)
@@ -1,6 +1,12 @@
 import configparser
 
-DEFAULTS = {"timezone": {"enabled": "false"}}
+DEFAULTS = {
+    "cache": {"enabled": "true"},
+    "index": {"enabled": "true"},
+    "parse": {"workers": "auto", "lazy": "true"},
+    "storage": {"layout": "single", "fsync": "false"},
+    "timezone": {"enabled": "false", "engine": "pytz"},
+}
 
 
 class DefaultConfig:
@@ -1,36 +1,84 @@
-from typing import Generator, List, Tuple
+from typing import List, Optional
 
 from ..data_structures.entry import Entry
+from .data_filenames import DataFilenames
+from .data_segments import DataSegments, parse_segments
+from .entries_cache import EMPTY_SNAPSHOT, EntriesCache, EntriesSnapshot
 from .entry_lines import EntryLines
 from .entry_parser import EntryParser
+from .parallel_parser import ParallelParser
+from .parse_log import _parse_log, merge_logs, parse_data_file
+from .sqlite_storage import SQLiteStorage
 
 Entries = List[Entry]
 
 
-def entries(entry_lines: EntryLines, entry_parser: EntryParser) -> Entries:
-    return list(_parse_log(entry_lines(), entry_parser))
+def entries(
+    entry_lines: EntryLines,
+    entry_parser: EntryParser,
+    entries_cache: EntriesCache,
+    data_segments: DataSegments,
+    sqlite_storage: SQLiteStorage,
+    data_filenames: DataFilenames,
+    parallel_parser: ParallelParser,
+) -> Entries:
+    if len(data_filenames) > 1:
+        return list(merge_logs(parse_data_file(filename, entry_parser) for filename in data_filenames))
 
+    if sqlite_storage.enabled():
+        return list(sqlite_storage.entries())
 
-def _parse_log(lines: List[Tuple[int, str]], entry_parser: EntryParser) -> Generator[Entry, None, None]:
-    previous_entry = None
-    for line_number, line in lines:
-        parsed_line = _parse_line(previous_entry, line_number, line.strip(), entry_parser)
+    if data_segments.enabled():
+        return list(parse_segments(data_segments, data_segments.segments(), entry_parser))
 
-        if parsed_line is not None:
-            previous_entry, entry = parsed_line
-            yield entry
+    # Entries moved out of the data file by `utt archive`
+    archived_entries = list(parse_segments(data_segments, data_segments.archives(), entry_parser))
 
+    return archived_entries + cached_entries(entry_lines, entry_parser, entries_cache, parallel_parser)
 
-def _parse_line(previous_entry: Entry, line_number: int, line: str, entry_parser: EntryParser):
-    # Ignore empty lines
-    if not line:
-        return None
 
-    new_entry = entry_parser.parse(line)
-    if new_entry is None:
-        raise SyntaxError("Invalid syntax at line %d: %s" % (line_number, line))
+def cached_entries(
+    entry_lines: EntryLines,
+    entry_parser: EntryParser,
+    entries_cache: EntriesCache,
+    parallel_parser: ParallelParser,
+) -> Entries:
+    """Entries of the data file, of which only the lines appended since the cache was stored are parsed."""
+    snapshot = entries_cache.load() or EMPTY_SNAPSHOT
+    cached_end_offset = snapshot.end_offset
 
-    if previous_entry and previous_entry.datetime > new_entry.datetime:
-        raise Exception("Error line %d. Not in chronological order: %s > %s" % (line_number, previous_entry, new_entry))
-    previous_entry = new_entry
-    return previous_entry, new_entry
+    if entry_lines.seekable() and parallel_parser.enabled(entry_lines.size() - snapshot.end_offset):
+        end_offset = entry_lines.complete_size()
+        parsed = parallel_parser.parse(
+            entry_lines, snapshot.end_offset, end_offset, snapshot.next_line_number, _last(snapshot.entries)
+        )
+        snapshot = EntriesSnapshot(
+            entries=snapshot.entries + parsed.entries,
+            end_offset=end_offset,
+            next_line_number=snapshot.next_line_number + parsed.line_count,
+        )
+
+    tail = entry_lines.read_from(snapshot.end_offset, snapshot.next_line_number)
+    numbered_lines = enumerate(tail.lines, tail.first_line_number)
+    new_entries = list(_parse_log(numbered_lines, entry_parser, _last(snapshot.entries)))
+    all_entries = snapshot.entries + new_entries
+
+    if tail.end_offset != cached_end_offset:
+        entries_cache.store(
+            EntriesSnapshot(
+                entries=all_entries,
+                end_offset=tail.end_offset,
+                next_line_number=tail.first_line_number + len(tail.lines),
+            )
+        )
+
+    # The last line is not cached until it is terminated by a newline
+    if tail.partial_line is not None:
+        partial_line = (tail.first_line_number + len(tail.lines), tail.partial_line)
+        all_entries.extend(_parse_log([partial_line], entry_parser, _last(all_entries), skip_partial_line=True))
+
+    return all_entries
+
+
+def _last(entries: Entries) -> Optional[Entry]:
+    return entries[-1] if entries else None
@@ -0,0 +1,192 @@
+import argparse
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import List, NamedTuple, Optional
+
+from ..data_structures.entry import Entry
+from .cache_config import CacheConfig
+from .cache_dirname import CacheDirname
+from .data_filename import DataFilename
+from .entry_lines import data_file_checksum, data_file_fingerprint
+from .local_timezone import LocalTimezone, timezone_engine
+from .timezone_config import TimezoneConfig
+
+# Changed whenever the pickled entries change, e.g. their class or tzinfo
+CACHE_VERSION = 3
+
+
+class EntriesSnapshot(NamedTuple):
+    entries: List[Entry]
+    end_offset: int
+    next_line_number: int
+
+
+EMPTY_SNAPSHOT = EntriesSnapshot(entries=[], end_offset=0, next_line_number=1)
+
+
+class EntriesCache:
+    """On-disk cache of the entries parsed from the data file.
+
+    The cache holds the entries of the first `end_offset` bytes of the
+    data file. It remains valid as long as these bytes are unchanged.
+    If the size and modification time of the data file are the same as
+    when the cache was stored, only a fingerprint of the first and last
+    bytes of the cached region is checked. Otherwise, e.g. once entries
+    were appended, the whole cached region is checked against its
+    checksum, in which case only the new bytes need to be parsed.
+
+    A data file modified in place without changing its size, and whose
+    modification time is then restored, is not detected.
+    """
+
+    def __init__(
+        self,
+        data_filename: DataFilename,
+        cache_dirname: CacheDirname,
+        cache_config: CacheConfig,
+        local_timezone: LocalTimezone,
+        args: argparse.Namespace,
+        timezone_config: TimezoneConfig,
+    ):
+        self._data_filename = data_filename
+        self._cache_dirname = cache_dirname
+        self._cache_config = cache_config
+        self._local_timezone = local_timezone
+        self._timezone_engine = timezone_engine(args, timezone_config)
+
+    def enabled(self) -> bool:
+        return self._cache_config.enabled()
+
+    def load(self) -> Optional[EntriesSnapshot]:
+        if not self._cache_config.enabled():
+            return None
+
+        return self._load(check_fingerprint=True)
+
+    def store(self, snapshot: EntriesSnapshot) -> None:
+        if not self._cache_config.enabled():
+            return
+
+        try:
+            header = self._header(snapshot.end_offset)
+            checksum = data_file_checksum(self._data_filename, snapshot.end_offset)
+            if header is None or checksum is None:
+                return
+            header["checksum"] = checksum
+
+            os.makedirs(self._cache_dirname, exist_ok=True)
+            fd, tmp_filename = tempfile.mkstemp(dir=self._cache_dirname)
+            try:
+                with os.fdopen(fd, "wb") as cache_file:
+                    pickle.dump(header, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+                    pickle.dump(snapshot, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+                os.replace(tmp_filename, self._cache_filename())
+            except BaseException:
+                os.unlink(tmp_filename)
+                raise
+        except OSError:
+            # The cache is an optimization, failing to write it is not an error
+            pass
+
+    def invalidate_from(self, offset: int) -> None:
+        """Drop the cached entries of the data file from byte `offset`.
+
+        Only the bytes from `offset`, which is the start of a line, may
+        have changed since the cache was stored. The entries before it
+        are kept.
+        """
+        if not self._cache_config.enabled():
+            return
+
+        snapshot = self._load(check_fingerprint=False)
+        if snapshot is None:
+            self.invalidate()
+            return
+
+        if snapshot.end_offset <= offset:
+            return
+
+        try:
+            with open(self._data_filename, "rb") as data_file:
+                data = data_file.read(offset)
+        except OSError:
+            self.invalidate()
+            return
+
+        # Entries are the non-empty lines
+        entry_count = sum(1 for line in data.split(b"\n") if line.strip())
+        self.store(
+            EntriesSnapshot(
+                entries=snapshot.entries[:entry_count], end_offset=offset, next_line_number=data.count(b"\n") + 1
+            )
+        )
+
+    def invalidate(self) -> None:
+        try:
+            os.unlink(self._cache_filename())
+        except FileNotFoundError:
+            pass
+
+    def _load(self, check_fingerprint: bool) -> Optional[EntriesSnapshot]:
+        try:
+            with open(self._cache_filename(), "rb") as cache_file:
+                header = pickle.load(cache_file)
+                if check_fingerprint:
+                    is_valid = self._is_unchanged(header)
+                else:
+                    is_valid = all(header.get(key) == value for key, value in self._identity().items())
+                if not is_valid:
+                    return None
+                return pickle.load(cache_file)
+        except Exception:
+            # A missing, corrupted or incompatible cache is a cache miss
+            return None
+
+    def _is_unchanged(self, header: dict) -> bool:
+        """Whether the cached region of the data file is unchanged since `header` was stored."""
+        end_offset = header.get("end_offset", 0)
+        current_header = self._header(end_offset)
+        if current_header is None:
+            return False
+
+        if any(header.get(key) != current_header[key] for key in current_header if key not in ("size", "mtime_ns")):
+            return False
+
+        if (header.get("size"), header.get("mtime_ns")) == (current_header["size"], current_header["mtime_ns"]):
+            return True
+
+        # Bytes may have been inserted or replaced anywhere in the region,
+        # not only where the fingerprint is computed
+        return header.get("checksum") == data_file_checksum(self._data_filename, end_offset)
+
+    def _cache_filename(self) -> str:
+        key = hashlib.sha1(os.path.abspath(self._data_filename).encode("utf-8")).hexdigest()
+        return os.path.join(self._cache_dirname, "entries-%s.cache" % key)
+
+    def _header(self, end_offset: int) -> Optional[dict]:
+        try:
+            stat = os.stat(self._data_filename)
+        except OSError:
+            return None
+
+        fingerprint = data_file_fingerprint(self._data_filename, end_offset)
+        if fingerprint is None:
+            return None
+
+        return dict(
+            self._identity(),
+            end_offset=end_offset,
+            fingerprint=fingerprint,
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+        )
+
+    def _identity(self) -> dict:
+        return {
+            "version": CACHE_VERSION,
+            "data_filename": os.path.abspath(self._data_filename),
+            "timezone": str(self._local_timezone),
+            "timezone_engine": self._timezone_engine,
+        }
@@ -0,0 +1,256 @@
+import datetime
+import os
+import re
+import tempfile
+from typing import List, NamedTuple, Optional
+
+from ..constants import INDEX_FILENAME_SUFFIX
+from .data_filename import DataFilename
+from .entry_lines import EntryLines, data_file_fingerprint
+from .index_config import IndexConfig
+
+INDEX_HEADER = "# utt index v2"
+
+# Entries written with a timezone offset may belong to another local
+# day. Starting this many days before the requested day is always early
+# enough.
+DAY_MARGIN = datetime.timedelta(days=3)
+
+# Days are indexed by the date written at the start of each line, which
+# is much cheaper than parsing the entry and is within DAY_MARGIN of its
+# local date
+LINE_DATE_REGEX = re.compile(rb"\s*(\d{4})-(\d{1,2})-(\d{1,2})\s")
+
+
+class IndexRecord(NamedTuple):
+    day: Optional[datetime.date]
+    offset: int
+    line_number: int
+
+
+class IndexState(NamedTuple):
+    records: List[IndexRecord]
+    end_offset: int
+    next_line_number: int
+
+
+class IndexHeader(NamedTuple):
+    end_offset: int
+    next_line_number: int
+    fingerprint: str
+    # Size and modification time of the data file when the index was written
+    size: int
+    mtime_ns: int
+
+
+FILE_START = IndexRecord(day=None, offset=0, line_number=1)
+
+
+class EntryIndex:
+    """Sidecar index of the data file (e.g. utt.log.idx).
+
+    It maps each day to the byte offset and line number of its first
+    entry, so that the data file can be read from the first entry
+    relevant to a report. Like the entries cache, the index covers the
+    first `end_offset` bytes of the data file and is only used while
+    they are unchanged: the fingerprint of these bytes and the size and
+    modification time of the data file must be the same as when the
+    index was written. Otherwise, reports find where to start reading
+    by bisecting the data file, and the index is built again the next
+    time it's updated.
+    """
+
+    def __init__(
+        self,
+        data_filename: DataFilename,
+        entry_lines: EntryLines,
+        index_config: IndexConfig,
+    ):
+        self._data_filename = data_filename
+        self._entry_lines = entry_lines
+        self._index_config = index_config
+
+    def start_record(self, day: datetime.date) -> Optional[IndexRecord]:
+        """Record to start reading from to get the entries preceding `day`.
+
+        The last two entries before `day` are included. Returns None if
+        there is no usable index.
+        """
+        if not self._index_config.enabled():
+            return None
+
+        state = self._load()
+        if state is None:
+            return None
+
+        records = [record for record in state.records if record.day <= day - DAY_MARGIN]
+        if len(records) < 2:
+            return FILE_START
+
+        return records[-2]
+
+    def update(self, appended_to: Optional[os.stat_result] = None) -> None:
+        """Index the entries appended since the index was last written.
+
+        `appended_to` is the status of the data file before entries were
+        appended to it while it was locked, which is still held: an index
+        written for the data file as it was then is up to date but for
+        the appended entries.
+        """
+        if not self._index_config.enabled():
+            return
+
+        state = self._load(appended_to=appended_to) or IndexState(records=[], end_offset=0, next_line_number=1)
+        self._save(self._scan(state))
+
+    def rebuild(self) -> None:
+        if not self._index_config.enabled():
+            return
+
+        self._save(self._scan(IndexState(records=[], end_offset=0, next_line_number=1)))
+
+    def invalidate_from(self, offset: int) -> None:
+        """Index the data file again from byte `offset`.
+
+        Only the bytes from `offset`, which is the start of a line, may
+        have changed since the index was written. The days before it
+        are kept.
+        """
+        if not self._index_config.enabled():
+            return
+
+        state = self._load(check_data_file=False)
+        if state is None:
+            self.rebuild()
+            return
+
+        if state.end_offset > offset:
+            state = IndexState(
+                records=[record for record in state.records if record.offset < offset],
+                end_offset=offset,
+                next_line_number=self._entry_lines.count_lines(offset) + 1,
+            )
+
+        self._save(self._scan(state))
+
+    def _scan(self, state: IndexState) -> IndexState:
+        records = list(state.records)
+        last_day = records[-1].day if records else None
+        end_offset = state.end_offset
+        line_number = state.next_line_number
+
+        for line_offset, line in self._entry_lines.lines_at(state.end_offset):
+            # The last line is indexed once it is terminated by a newline
+            if not line.endswith(b"\n"):
+                break
+
+            day = _line_day(line)
+            if day is not None and day != last_day:
+                last_day = day
+                records.append(IndexRecord(day=last_day, offset=line_offset, line_number=line_number))
+
+            end_offset = line_offset + len(line)
+            line_number += 1
+
+        return IndexState(records=records, end_offset=end_offset, next_line_number=line_number)
+
+    def _index_filename(self) -> str:
+        return self._data_filename + INDEX_FILENAME_SUFFIX
+
+    def _load(self, check_data_file: bool = True, appended_to: Optional[os.stat_result] = None) -> Optional[IndexState]:
+        try:
+            with open(self._index_filename()) as index_file:
+                header = _parse_header(index_file.readline().split())
+                records = [_parse_record(line) for line in index_file]
+        except (OSError, ValueError):
+            return None
+
+        if header is None:
+            return None
+        if check_data_file and not self._is_unchanged(header, appended_to):
+            return None
+
+        return IndexState(records=records, end_offset=header.end_offset, next_line_number=header.next_line_number)
+
+    def _is_unchanged(self, header: IndexHeader, appended_to: Optional[os.stat_result]) -> bool:
+        """Whether the indexed bytes of the data file are unchanged since `header` was written."""
+        if data_file_fingerprint(self._data_filename, header.end_offset) != header.fingerprint:
+            return False
+
+        if appended_to is not None and (header.size, header.mtime_ns) == (appended_to.st_size, appended_to.st_mtime_ns):
+            return True
+
+        try:
+            stat = os.stat(self._data_filename)
+        except OSError:
+            return False
+
+        # A data file modified in place, e.g. in a text editor, may keep
+        # the bytes of the fingerprint
+        return (header.size, header.mtime_ns) == (stat.st_size, stat.st_mtime_ns)
+
+    def _save(self, state: IndexState) -> None:
+        try:
+            stat = os.stat(self._data_filename)
+        except OSError:
+            return
+
+        fingerprint = data_file_fingerprint(self._data_filename, state.end_offset)
+        if fingerprint is None:
+            return
+
+        dirname = os.path.dirname(os.path.abspath(self._index_filename()))
+        try:
+            fd, tmp_filename = tempfile.mkstemp(dir=dirname)
+            try:
+                with os.fdopen(fd, "w") as index_file:
+                    index_file.write(
+                        "%s %d %d %s %d %d\n"
+                        % (
+                            INDEX_HEADER,
+                            state.end_offset,
+                            state.next_line_number,
+                            fingerprint,
+                            stat.st_size,
+                            stat.st_mtime_ns,
+                        )
+                    )
+                    for record in state.records:
+                        index_file.write("%s %d %d\n" % (record.day.isoformat(), record.offset, record.line_number))
+                os.replace(tmp_filename, self._index_filename())
+            except BaseException:
+                os.unlink(tmp_filename)
+                raise
+        except OSError:
+            # The index is an optimization, failing to write it is not an error
+            pass
+
+
+def _line_day(line: bytes) -> Optional[datetime.date]:
+    match = LINE_DATE_REGEX.match(line)
+    if match is None:
+        return None
+
+    try:
+        return datetime.date(*map(int, match.groups()))
+    except ValueError:
+        return None
+
+
+def _parse_header(header: List[str]) -> Optional[IndexHeader]:
+    if " ".join(header[:-5]) != INDEX_HEADER:
+        return None
+
+    end_offset, next_line_number, fingerprint, size, mtime_ns = header[-5:]
+    return IndexHeader(
+        end_offset=int(end_offset),
+        next_line_number=int(next_line_number),
+        fingerprint=fingerprint,
+        size=int(size),
+        mtime_ns=int(mtime_ns),
+    )
+
+
+def _parse_record(line: str) -> IndexRecord:
+    day, offset, line_number = line.split()
+    return IndexRecord(day=datetime.date.fromisoformat(day), offset=int(offset), line_number=int(line_number))
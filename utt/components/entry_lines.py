@@ -1,7 +1,40 @@
-from typing import List, Tuple
+import gzip
+import hashlib
+import locale
+import lzma
+import mmap
+import os
+import sys
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple
 
+from ..constants import STDIN_DATA_FILENAME
 from .data_filename import DataFilename
 
+CHECKSUM_BLOCK_SIZE = 64 * 1024
+FINGERPRINT_BLOCK_SIZE = 4096
+REVERSE_BLOCK_SIZE = 64 * 1024
+
+# Data files with these suffixes are decompressed on the fly
+COMPRESSED_FILE_OPENERS = {
+    ".gz": gzip.open,
+    ".xz": lzma.open,
+}
+
+
+class BlockChecksums(NamedTuple):
+    size: int
+    # Checksums of the blocks aligned on the start of the file
+    head: List[bytes]
+    # Checksums of the blocks aligned on the end of the file, last block first
+    tail: List[bytes]
+
+
+class EntryLinesTail(NamedTuple):
+    lines: List[bytes]
+    first_line_number: int
+    partial_line: Optional[bytes]
+    end_offset: int
+
 
 class EntryLines:
     def __init__(self, data_filename: DataFilename):
@@ -13,6 +46,311 @@ class EntryLines:
         except IOError:
             return []
 
+    def read_from(self, offset: int, line_number: int) -> EntryLinesTail:
+        """Read the lines that start at byte `offset`, as bytes.
+
+        `line_number` is the line number of the first line read.
+        Complete lines are returned separately from a trailing line
+        that is not terminated by a newline yet, so that callers can
+        resume reading from `end_offset` later on.
+        """
+        try:
+            if not self.seekable():
+                data = self._read_sequentially(offset)
+            else:
+                with open(self._data_filename, "rb") as entry_file:
+                    entry_file.seek(offset)
+                    data = entry_file.read()
+        except IOError:
+            return EntryLinesTail(lines=[], first_line_number=line_number, partial_line=None, end_offset=offset)
+
+        lines = data.split(b"\n")
+        partial_line = lines.pop()
+
+        return EntryLinesTail(
+            lines=lines,
+            first_line_number=line_number,
+            partial_line=partial_line or None,
+            end_offset=offset + len(data) - len(partial_line),
+        )
+
+    def seekable(self) -> bool:
+        """Whether the data file can be read from any offset.
+
+        The data is read from the standard input if the data filename
+        is '-'. It can then only be read once, from the start.
+        Compressed data files can be read any number of times, but only
+        sequentially.
+        """
+        return self._data_filename != STDIN_DATA_FILENAME and not is_compressed(self._data_filename)
+
+    def size(self) -> int:
+        try:
+            return os.path.getsize(self._data_filename)
+        except OSError:
+            return 0
+
+    def complete_size(self) -> int:
+        """Return the offset of the end of the last line terminated by a newline."""
+        try:
+            with open(self._data_filename, "rb") as entry_file:
+                mapping = mmap.mmap(entry_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, ValueError):
+            # mmap raises ValueError on empty files
+            return 0
+
+        with mapping:
+            return mapping.rfind(b"\n") + 1
+
+    def lines_at(self, offset: int) -> Iterator[Tuple[int, bytes]]:
+        """Yield (offset, line) for each line starting at or after byte `offset`.
+
+        If `offset` falls in the middle of a line, reading resumes at the
+        beginning of the next line. The data file is memory-mapped and
+        lines are yielded as bytes, so that callers only decode what
+        they need.
+        """
+        if not self.seekable():
+            yield from self._sequential_lines(offset)
+            return
+
+        try:
+            with open(self._data_filename, "rb") as entry_file:
+                mapping = mmap.mmap(entry_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (IOError, ValueError):
+            # mmap raises ValueError on empty files
+            return
+
+        with mapping:
+            size = len(mapping)
+            position = offset
+            if offset > 0:
+                position = mapping.find(b"\n", offset - 1) + 1 or size
+
+            while position < size:
+                line_end = mapping.find(b"\n", position) + 1 or size
+                yield position, mapping[position:line_end]
+                position = line_end
+
+    def reversed_lines(self, end: Optional[int] = None) -> Iterator[Tuple[int, str]]:
+        """Yield (offset, line) for each line, from the last line to the first.
+
+        The file is read backwards by blocks, so the cost of reading the
+        last lines does not depend on the size of the file. Lines are
+        yielded without their line terminator. If `end` is given, only
+        the bytes before it are read.
+        """
+        encoding = locale.getpreferredencoding(False)
+        if not self.seekable():
+            for line_offset, line in reversed(list(self._sequential_lines(0))):
+                if end is not None:
+                    if line_offset >= end:
+                        continue
+                    line = line[: end - line_offset]
+                yield line_offset, line.rstrip(b"\n").decode(encoding)
+            return
+
+        try:
+            entry_file = open(self._data_filename, "rb")
+        except IOError:
+            return
+
+        with entry_file:
+            position = entry_file.seek(0, os.SEEK_END)
+            if end is not None:
+                position = min(position, end)
+            remainder = b""
+            at_end_of_file = True
+
+            while position > 0:
+                block_size = min(REVERSE_BLOCK_SIZE, position)
+                position -= block_size
+                entry_file.seek(position)
+                block = entry_file.read(block_size) + remainder
+
+                line_end = position + len(block)
+                lines = block.split(b"\n")
+                # The first line may start in the previous block
+                remainder = lines.pop(0)
+                if at_end_of_file and lines and not lines[-1]:
+                    # The newline at the end of the file does not start a new line
+                    lines.pop()
+                    line_end -= 1
+                at_end_of_file = False
+
+                for line in reversed(lines):
+                    yield line_end - len(line), line.decode(encoding)
+                    line_end -= len(line) + 1
+
+            if remainder or not at_end_of_file:
+                yield 0, remainder.decode(encoding)
+
+    def count_lines(self, offset: int) -> int:
+        """Return the number of lines before byte `offset`."""
+        count = 0
+        with open(self._data_filename, "rb") as entry_file:
+            while offset > 0:
+                block = entry_file.read(min(offset, 1024 * 1024))
+                if not block:
+                    break
+                count += block.count(b"\n")
+                offset -= len(block)
+        return count
+
     def _get_lines(self) -> List[Tuple[int, str]]:
+        if not self.seekable():
+            encoding = locale.getpreferredencoding(False)
+            return [
+                (line_number, line.decode(encoding))
+                for line_number, (_, line) in enumerate(self._sequential_lines(0), 1)
+            ]
+
         with open(self._data_filename) as entry_file:
             return list(enumerate(entry_file, 1))
+
+    def _read_sequentially(self, offset: int) -> bytes:
+        if self._data_filename == STDIN_DATA_FILENAME:
+            return _read_stdin(offset)
+
+        with open_data_file(self._data_filename) as entry_file:
+            return entry_file.read()[offset:]
+
+    def _sequential_lines(self, offset: int) -> Iterator[Tuple[int, bytes]]:
+        if self._data_filename == STDIN_DATA_FILENAME:
+            yield from _stdin_lines(offset)
+            return
+
+        try:
+            entry_file = open_data_file(self._data_filename)
+        except IOError:
+            return
+
+        with entry_file:
+            position = 0
+            for line in entry_file:
+                if position >= offset:
+                    yield position, line
+                position += len(line)
+
+
+def _read_stdin(offset: int) -> bytes:
+    if offset:
+        raise ValueError("The standard input can only be read from the start")
+    return sys.stdin.buffer.read()
+
+
+def _stdin_lines(offset: int) -> Iterator[Tuple[int, bytes]]:
+    if offset:
+        raise ValueError("The standard input can only be read from the start")
+
+    position = 0
+    for line in sys.stdin.buffer:
+        yield position, line
+        position += len(line)
+
+
+def is_compressed(filename: str) -> bool:
+    return os.path.splitext(filename)[1] in COMPRESSED_FILE_OPENERS
+
+
+def open_data_file(filename: str, mode: str = "rb") -> BinaryIO:
+    """Open a data file, compressed or not, in binary mode."""
+    opener = COMPRESSED_FILE_OPENERS.get(os.path.splitext(filename)[1], open)
+    return opener(filename, mode)
+
+
+def data_file_fingerprint(filename: str, end_offset: int) -> Optional[str]:
+    """Fingerprint of the first `end_offset` bytes of a data file.
+
+    Only the first and last bytes of that region are hashed so that
+    the fingerprint is cheap to compute on large files.
+    """
+    try:
+        with open(filename, "rb") as data_file:
+            if os.fstat(data_file.fileno()).st_size < end_offset:
+                return None
+
+            head = data_file.read(min(FINGERPRINT_BLOCK_SIZE, end_offset))
+            tail_offset = max(0, end_offset - FINGERPRINT_BLOCK_SIZE)
+            data_file.seek(tail_offset)
+            tail = data_file.read(end_offset - tail_offset)
+    except OSError:
+        return None
+
+    return hashlib.sha1(head + tail).hexdigest()
+
+
+def data_file_checksum(filename: str, end_offset: int) -> Optional[str]:
+    """Checksum of the first `end_offset` bytes of a data file.
+
+    Unlike the fingerprint, every byte of the region is hashed.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    try:
+        with open(filename, "rb") as data_file:
+            size = end_offset
+            while size > 0:
+                block = data_file.read(min(size, CHECKSUM_BLOCK_SIZE))
+                if not block:
+                    return None
+                digest.update(block)
+                size -= len(block)
+    except OSError:
+        return None
+
+    return digest.hexdigest()
+
+
+def block_checksums(filename: str) -> BlockChecksums:
+    """Checksums of the blocks of a file, to find out later which part of it changed."""
+    try:
+        size = os.path.getsize(filename)
+    except OSError:
+        return BlockChecksums(size=0, head=[], tail=[])
+
+    # The first block aligned on the end of the file is the shortest
+    tail_first_block_size = size % CHECKSUM_BLOCK_SIZE or CHECKSUM_BLOCK_SIZE
+    return BlockChecksums(
+        size=size,
+        head=list(_block_checksums(filename, CHECKSUM_BLOCK_SIZE)),
+        tail=list(reversed(list(_block_checksums(filename, tail_first_block_size)))),
+    )
+
+
+def changed_region(before: BlockChecksums, after: BlockChecksums) -> Optional[Tuple[int, int]]:
+    """Region of a file that differs from when `before` was computed.
+
+    Returns the start and end offsets of the region in the file as it
+    is now (`after`), or None if it is unchanged. The bytes before and
+    after the region are the same as before, while the region itself
+    may have been shortened, lengthened or replaced.
+    """
+    if before == after:
+        return None
+
+    same_head_count = _common_prefix_length(before.head, after.head)
+    same_tail_count = _common_prefix_length(before.tail, after.tail)
+
+    start = min(same_head_count * CHECKSUM_BLOCK_SIZE, before.size, after.size)
+    # Unchanged blocks at the end may overlap the unchanged blocks at the
+    # start, in which case the bytes after `start` in the shortest of the
+    # two versions are the only ones counted as unchanged at the end
+    same_tail_size = min(same_tail_count * CHECKSUM_BLOCK_SIZE, min(before.size, after.size) - start)
+    return start, after.size - same_tail_size
+
+
+def _block_checksums(filename: str, first_block_size: int) -> Iterator[bytes]:
+    with open(filename, "rb") as data_file:
+        block = data_file.read(first_block_size)
+        while block:
+            yield hashlib.blake2b(block, digest_size=16).digest()
+            block = data_file.read(CHECKSUM_BLOCK_SIZE)
+
+
+def _common_prefix_length(a: List[bytes], b: List[bytes]) -> int:
+    length = 0
+    for x, y in zip(a, b):
+        if x != y:
+            break
+        length += 1
+    return length
@@ -1,45 +1,143 @@
+import datetime
+import locale
 import re
-from typing import Optional
+from typing import Optional, Union
 
 from dateutil.parser import parse
 
 from ..data_structures.entry import Entry
 from .local_timezone import LocalTimezone
+from .parse_config import ParseConfig
+from .timezone_cache import LocalizationCache, fixed_offset_timezone
 
-DATE_REGEX = r"(?P<date>\d{4}-\d{1,2}-\d{1,2}\s+\d{1,2}:\d{1,2})"
+DATE_REGEX = r"(?P<date>(?P<year>\d{4})-(?P<month>\d{1,2})-(?P<day>\d{1,2})\s+(?P<hour>\d{1,2}):(?P<minute>\d{1,2}))"
 TIMEZONE_REGEX = r"(?P<timezone>[+-]{1}\d{2}:{0,1}\d{2})"
 NAME_REGEX = r"\s+(?P<name>[^\s].*?)"
 COMMENT_REGEX = r"\s{2}#\s(?P<comment>.*$)?"
-WITH_TZ = re.compile("".join([DATE_REGEX, TIMEZONE_REGEX, NAME_REGEX, r"($|", COMMENT_REGEX, ")"]))
+# The timezone offset is optional: a line without one is in the local timezone
+ENTRY_REGEX = re.compile("".join([DATE_REGEX, "(", TIMEZONE_REGEX, ")?", NAME_REGEX, r"($|", COMMENT_REGEX, ")"]))
 
-WITHOUT_TZ = re.compile("".join([DATE_REGEX, NAME_REGEX, r"($|", COMMENT_REGEX, ")"]))
+# Same as above, for lines read as bytes
+ENTRY_BYTES_REGEX = re.compile(ENTRY_REGEX.pattern.encode("ascii"))
+# What follows the date and the timezone offset of an entry
+NAME_BYTES_REGEX = re.compile("".join([NAME_REGEX, r"($|", COMMENT_REGEX, ")"]).encode("ascii"))
+
+# The date of an entry written as YYYY-MM-DD HH:MM, followed by
+# whitespace, to parse it apart from the name and the comment
+DATE_FIRST_BYTES_REGEX = re.compile(
+    "".join([r"(\d{4})-(\d{2})-(\d{2}) (\d{2}):(\d{2})(?:", TIMEZONE_REGEX, r")?(?=\s)"]).encode("ascii")
+)
+
+
+class LazyEntry(Entry):
+    """An entry whose name and comment are parsed when first accessed.
+
+    `text` is what follows the date and the timezone offset on the line,
+    as bytes in `encoding`.
+    """
+
+    def __init__(self, entry_datetime: datetime.datetime, text: bytes, encoding: str):
+        self.datetime = entry_datetime
+        self.is_current_entry = False
+        self._text = text
+        self._encoding = encoding
+
+    def __getattr__(self, attribute):
+        # Only called for attributes that are not set yet
+        if attribute not in ("name", "comment"):
+            raise AttributeError(attribute)
+
+        name, comment = NAME_BYTES_REGEX.match(self._text).group("name", "comment")
+        self.name = name.decode(self._encoding)
+        self.comment = None if comment is None else comment.decode(self._encoding)
+        return getattr(self, attribute)
 
 
 class EntryParser:
-    def __init__(self, local_timezone: LocalTimezone):
-        self._local_timezone = local_timezone
+    def __init__(self, local_timezone: LocalTimezone, lazy: bool = False):
+        self._localization_cache = LocalizationCache(local_timezone)
+        self._encoding = locale.getpreferredencoding(False)
+        self._lazy = lazy
+
+    def parse(self, string: Union[str, bytes]) -> Optional[Entry]:
+        """Parse an entry from a line.
+
+        The line may also be given as bytes (in the encoding of the data
+        file), in which case only the name and the comment are decoded.
+        In lazy mode, only the date of a line written as bytes is parsed
+        here, if it's in the usual YYYY-MM-DD HH:MM format, and its name
+        and comment are parsed when first accessed.
+        """
+        if isinstance(string, bytes):
+            if self._lazy:
+                entry = self._parse_date_first(string)
+                if entry is not None:
+                    return entry
+
+            match = ENTRY_BYTES_REGEX.match(string)
+        else:
+            match = ENTRY_REGEX.match(string)
+
+        if match is None:
+            return None
+
+        year, month, day, hour, minute, timezone = match.group("year", "month", "day", "hour", "minute", "timezone")
+        try:
+            date = datetime.datetime(int(year), int(month), int(day), int(hour), int(minute))
+            if timezone is not None:
+                date = date.replace(tzinfo=fixed_offset_timezone(timezone))
+        except ValueError:
+            # Out of range dates and offsets are left to dateutil, which
+            # reports them or handles offsets of a day or more
+            date = self._parse_date(match)
+
+        if date.tzinfo is None:
+            date = self._localization_cache.localize(date)
+
+        name = self._decode(match.group("name"))
+        comment = self._decode(match.group("comment"))
+        return Entry(date, name, False, comment=comment)
 
-    def parse(self, string: str) -> Optional[Entry]:
-        match_wo_tz = WITHOUT_TZ.match(string)
-        match_w_tz = WITH_TZ.match(string)
-        match = match_w_tz if match_w_tz is not None else match_wo_tz
+    def _parse_date_first(self, line: bytes) -> Optional[Entry]:
+        """Parse the date of a line into a LazyEntry.
 
+        None is returned if the date is not in the usual format, even if
+        the line is a valid entry, so that it's parsed as a whole instead.
+        """
+        match = DATE_FIRST_BYTES_REGEX.match(line)
         if match is None:
             return None
 
-        groupdict = match.groupdict()
+        # The name is after the whitespace that follows the date, and
+        # can't span several lines
+        date_end = match.end()
+        text = line[date_end:]
+        if text.isspace() or b"\n" in text:
+            return None
 
-        if "date" not in groupdict or "name" not in groupdict:
+        year, month, day, hour, minute, timezone = match.groups()
+        try:
+            date = datetime.datetime(int(year), int(month), int(day), int(hour), int(minute))
+            if timezone is None:
+                date = self._localization_cache.localize(date)
+            else:
+                date = date.replace(tzinfo=fixed_offset_timezone(timezone))
+        except ValueError:
             return None
 
-        date_str = groupdict["date"]
-        if "timezone" in groupdict:
-            date_str += groupdict["timezone"].replace(":", "")
-            date = parse(date_str)
-        else:
-            date = parse(date_str)
-            date = self._local_timezone.localize(date)
+        return LazyEntry(date, text, self._encoding)
 
-        name = groupdict["name"]
-        comment = groupdict.get("comment")
-        return Entry(date, name, False, comment=comment)
+    def _parse_date(self, match) -> datetime.datetime:
+        date_str = self._decode(match.group("date"))
+        if match.group("timezone") is not None:
+            date_str += self._decode(match.group("timezone")).replace(":", "")
+        return parse(date_str)
+
+    def _decode(self, value):
+        if isinstance(value, bytes):
+            return value.decode(self._encoding)
+        return value
+
+
+def entry_parser(local_timezone: LocalTimezone, parse_config: ParseConfig) -> EntryParser:
+    return EntryParser(local_timezone, lazy=parse_config.lazy())
@@ -0,0 +1,54 @@
+import heapq
+import itertools
+import pickle
+import tempfile
+from typing import BinaryIO, Callable, Iterable, Iterator, List, TypeVar
+
+T = TypeVar("T")
+
+# Number of items sorted in memory at once
+RUN_SIZE = 100000
+
+
+def external_sort(items: Iterable[T], key: Callable[[T], object], run_size: int = RUN_SIZE) -> Iterator[T]:
+    """Sort items that may not fit in memory.
+
+    Items are sorted in runs of `run_size`, which are spilled to
+    temporary files and merged as the sorted items are consumed, so
+    that at most `run_size` items are held in memory. The sort is
+    stable. Items must be picklable.
+    """
+    items = iter(items)
+    run = sorted(itertools.islice(items, run_size), key=key)
+    if len(run) < run_size:
+        # Everything fits in a single run
+        yield from run
+        return
+
+    run_files = []
+    try:
+        while run:
+            run_files.append(_spill(run))
+            run = sorted(itertools.islice(items, run_size), key=key)
+
+        # Runs are merged in input order, which keeps the sort stable
+        yield from heapq.merge(*[_load(run_file) for run_file in run_files], key=key)
+    finally:
+        for run_file in run_files:
+            run_file.close()
+
+
+def _spill(run: List[T]) -> BinaryIO:
+    run_file = tempfile.TemporaryFile()
+    for item in run:
+        pickle.dump(item, run_file, pickle.HIGHEST_PROTOCOL)
+    run_file.seek(0)
+    return run_file
+
+
+def _load(run_file: BinaryIO) -> Iterator[T]:
+    while True:
+        try:
+            yield pickle.load(run_file)
+        except EOFError:
+            return
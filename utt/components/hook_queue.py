@@ -0,0 +1,139 @@
+import argparse
+import contextlib
+import hashlib
+import locale
+import os
+import subprocess
+import sys
+from typing import Iterator, List
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover
+    # Not available on Windows, where hooks are run right away
+    fcntl = None
+
+from ..data_structures.entry import Entry
+from .cache_dirname import CacheDirname
+from .data_filename import DataFilename
+from .entry_parser import EntryParser
+from .hooks import Hooks
+
+
+class HookQueue:
+    """Queue of the entries added to the data file, to be passed to the hooks.
+
+    Adding an entry doesn't wait for the hooks: the entries are queued
+    in the cache directory and a background worker (`utt hooks --run`)
+    is started to pass them to the hooks. Entries added while the
+    worker is running are passed in the same batch.
+    """
+
+    def __init__(
+        self,
+        hooks: Hooks,
+        cache_dirname: CacheDirname,
+        data_filename: DataFilename,
+        args: argparse.Namespace,
+        entry_parser: EntryParser,
+    ):
+        self._hooks = hooks
+        self._cache_dirname = cache_dirname
+        self._data_filename = data_filename
+        self._args = args
+        self._entry_parser = entry_parser
+        self._encoding = locale.getpreferredencoding(False)
+
+    def schedule(self, entries: List[Entry]) -> None:
+        """Queue entries that were added and start a worker to pass them to the hooks."""
+        if not self._hooks or not entries:
+            return
+
+        os.makedirs(self._cache_dirname, exist_ok=True)
+        with self._locked_queue() as fd:
+            os.write(fd, "".join(str(entry) + "\n" for entry in entries).encode(self._encoding))
+
+        self._start_worker()
+
+    def take(self) -> List[Entry]:
+        """Remove the queued entries and return them."""
+        try:
+            with self._locked_queue() as fd:
+                blocks = list(iter(lambda: os.read(fd, 1024 * 1024), b""))
+                os.ftruncate(fd, 0)
+        except FileNotFoundError:
+            return []
+
+        lines = b"".join(blocks).decode(self._encoding).splitlines()
+        return [self._entry_parser.parse(line) for line in lines if line]
+
+    def pending(self) -> bool:
+        try:
+            return os.path.getsize(self._queue_filename()) > 0
+        except OSError:
+            return False
+
+    @contextlib.contextmanager
+    def worker_lock(self, blocking: bool = True) -> Iterator[bool]:
+        """Lock held by the worker passing the entries to the hooks.
+
+        Yields whether the lock was acquired, which is always the case
+        if `blocking` is true.
+        """
+        os.makedirs(self._cache_dirname, exist_ok=True)
+        fd = os.open(self._queue_filename() + ".lock", os.O_RDWR | os.O_CREAT, 0o666)
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(fd, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+                except BlockingIOError:
+                    yield False
+                    return
+            yield True
+        finally:
+            os.close(fd)
+
+    def log_filename(self) -> str:
+        return os.path.join(self._cache_dirname, "hooks-%s.log" % self._key())
+
+    def _start_worker(self) -> None:
+        command = [sys.executable, "-m", "utt", "--data", os.path.abspath(self._data_filename)]
+        if self._args.timezone is not None:
+            command += ["--timezone", str(self._args.timezone)]
+        if self._args.timezone_engine is not None:
+            command += ["--timezone-engine", self._args.timezone_engine]
+        command += ["hooks", "--run"]
+
+        if fcntl is None:
+            subprocess.call(command)
+            return
+
+        try:
+            with open(self.log_filename(), "a") as log_file:
+                subprocess.Popen(
+                    command + ["--background"],
+                    stdin=subprocess.DEVNULL,
+                    stdout=log_file,
+                    stderr=log_file,
+                    start_new_session=True,
+                )
+        except OSError:
+            # The entries stay queued until the next worker is started
+            pass
+
+    @contextlib.contextmanager
+    def _locked_queue(self) -> Iterator[int]:
+        fd = os.open(self._queue_filename(), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o666)
+        try:
+            if fcntl is not None:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            yield fd
+        finally:
+            # Closing the file releases the lock
+            os.close(fd)
+
+    def _queue_filename(self) -> str:
+        return os.path.join(self._cache_dirname, "hooks-%s.queue" % self._key())
+
+    def _key(self) -> str:
+        return hashlib.sha1(os.path.abspath(self._data_filename).encode("utf-8")).hexdigest()
@@ -0,0 +1,5 @@
+import typing
+
+from ..hook import Hook
+
+Hooks = typing.List[Hook]
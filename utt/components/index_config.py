@@ -0,0 +1,14 @@
+import configparser
+
+
+class IndexConfig:
+    def __init__(self, enabled):
+        self._enabled = enabled
+
+    def enabled(self):
+        return self._enabled
+
+
+def index_config(config: configparser.ConfigParser) -> IndexConfig:
+    enabled = config.getboolean("index", "enabled")
+    return IndexConfig(enabled)
@@ -0,0 +1,39 @@
+import typing
+from typing import Optional
+
+from ..data_structures.entry import Entry
+from .data_segments import DataSegments, last_segment_entry
+from .entries import Entries
+from .entry_lines import EntryLines
+from .entry_parser import EntryParser
+from .sqlite_storage import SQLiteStorage
+
+LastEntry = typing.NewType("LastEntry", Optional[Entry])
+
+
+def last_entry(
+    entry_lines: EntryLines, entry_parser: EntryParser, data_segments: DataSegments, sqlite_storage: SQLiteStorage
+) -> LastEntry:
+    """Last valid entry of the data file, or None if there is none.
+
+    The data file is read backwards, so commands that only need the
+    last entry don't depend on the size of the data file.
+    """
+    if sqlite_storage.enabled():
+        return LastEntry(sqlite_storage.last_entry())
+
+    if data_segments.enabled():
+        return LastEntry(last_segment_entry(data_segments, entry_parser))
+
+    for _, line in entry_lines.reversed_lines():
+        entry = entry_parser.parse(line.strip())
+        if entry is not None:
+            return LastEntry(entry)
+
+    # All entries may have been archived
+    return LastEntry(last_segment_entry(data_segments, entry_parser))
+
+
+def entries_last_entry(entries: Entries) -> LastEntry:
+    """Last entry of the Entries component, used instead of `last_entry` when a plugin overrides Entries."""
+    return LastEntry(entries[-1] if entries else None)
@@ -5,11 +5,31 @@ import pytz
 import tzlocal
 from pytz.tzinfo import DstTzInfo
 
+from .timezone_config import ZONEINFO_ENGINE, TimezoneConfig, check_engine
+
 LocalTimezone = typing.NewType("LocalTimezone", DstTzInfo)
 
 
-def local_timezone(args: argparse.Namespace) -> LocalTimezone:
+def local_timezone(args: argparse.Namespace, timezone_config: TimezoneConfig) -> LocalTimezone:
+    if timezone_engine(args, timezone_config) == ZONEINFO_ENGINE:
+        return LocalTimezone(_zoneinfo_timezone(str(args.timezone) if args.timezone else tzlocal.get_localzone_name()))
+
     if args.timezone:
         return LocalTimezone(args.timezone)
 
     return LocalTimezone(pytz.timezone(tzlocal.get_localzone_name()))
+
+
+def timezone_engine(args: argparse.Namespace, timezone_config: TimezoneConfig) -> str:
+    if args.timezone_engine is None:
+        return timezone_config.engine()
+
+    check_engine(args.timezone_engine)
+    return args.timezone_engine
+
+
+def _zoneinfo_timezone(name):
+    # zoneinfo is not available before Python 3.9, where the engine is rejected
+    from .zoneinfo_timezone import ZoneInfoTimezone
+
+    return ZoneInfoTimezone(name)
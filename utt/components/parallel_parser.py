@@ -0,0 +1,129 @@
+import concurrent.futures
+import itertools
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple, TypeVar
+
+from ..data_structures.entry import Entry
+from .entry_lines import EntryLines
+from .entry_parser import EntryParser
+from .parse_config import ParseConfig
+from .parse_log import _parse_log
+
+T = TypeVar("T")
+
+# Below this number of bytes, starting worker processes costs more than it saves
+PARALLEL_PARSE_SIZE = 1024 * 1024
+# Smallest number of bytes parsed by a worker at once
+MIN_CHUNK_SIZE = 256 * 1024
+# Number of chunks per worker, so that workers that finish early take more
+CHUNKS_PER_WORKER = 4
+
+
+class ParsedLines(NamedTuple):
+    entries: List[Entry]
+    line_count: int
+
+
+class ParallelParser:
+    """Parse large parts of a data file in several processes.
+
+    The part is split into chunks of lines, which are parsed by worker
+    processes and joined in order. Each chunk is parsed without knowing
+    the entries before it or its line numbers, so a chunk that fails to
+    parse, or that starts before the end of the chunk before it, is
+    parsed again in this process, with absolute line numbers, to raise
+    the same error as if the lines had been parsed in sequence.
+    """
+
+    def __init__(self, parse_config: ParseConfig, entry_parser: EntryParser):
+        self._parse_config = parse_config
+        self._entry_parser = entry_parser
+
+    def enabled(self, size: int) -> bool:
+        """Whether parsing `size` bytes is faster in several processes."""
+        return self._parse_config.workers() > 1 and size >= PARALLEL_PARSE_SIZE
+
+    def parse(
+        self,
+        entry_lines: EntryLines,
+        start: int,
+        end: int,
+        line_number: int,
+        previous_entry: Optional[Entry] = None,
+    ) -> ParsedLines:
+        """Parse the lines that start between byte `start` and byte `end`.
+
+        `end` is the start of a line, or the end of the last line
+        terminated by a newline. `line_number` is the line number of
+        the first line.
+        """
+        parsed_chunks = []
+        line_count = 0
+        for chunk_start, chunk_end, future in self.map_chunks(_parse_chunk, entry_lines, start, end):
+            try:
+                entries, chunk_line_count = future.result()
+                if previous_entry is not None and entries and previous_entry.datetime > entries[0].datetime:
+                    raise ValueError("The chunk starts before the end of the previous one")
+            except Exception:
+                # Raise the error with the line number it has in the data file
+                _parse_chunk(
+                    entry_lines,
+                    self._entry_parser,
+                    chunk_start,
+                    chunk_end,
+                    line_number + line_count,
+                    previous_entry,
+                )
+                raise
+
+            parsed_chunks.append(entries)
+            line_count += chunk_line_count
+            previous_entry = entries[-1] if entries else previous_entry
+
+        return ParsedLines(entries=list(itertools.chain.from_iterable(parsed_chunks)), line_count=line_count)
+
+    def map_chunks(
+        self, chunk_function: Callable[..., T], entry_lines: EntryLines, start: int, end: int
+    ) -> Iterator[Tuple[int, int, "concurrent.futures.Future[T]"]]:
+        """Call `chunk_function` on chunks of lines in worker processes.
+
+        The lines that start between byte `start` and byte `end` are
+        split into chunks, and `chunk_function(entry_lines,
+        entry_parser, chunk_start, chunk_end)` is called for each one.
+        The bounds of the chunks are yielded in order, along with the
+        future result of `chunk_function`. `chunk_function` must be
+        defined at the top level of a module, so that worker processes
+        can find it.
+        """
+        workers = self._parse_config.workers()
+        chunk_size = max(MIN_CHUNK_SIZE, (end - start) // (workers * CHUNKS_PER_WORKER) + 1)
+        chunks = [(offset, min(offset + chunk_size, end)) for offset in range(start, end, chunk_size)]
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(workers, len(chunks) or 1)) as executor:
+            futures = [
+                executor.submit(chunk_function, entry_lines, self._entry_parser, chunk_start, chunk_end)
+                for chunk_start, chunk_end in chunks
+            ]
+            try:
+                for (chunk_start, chunk_end), future in zip(chunks, futures):
+                    yield chunk_start, chunk_end, future
+            finally:
+                # The chunks are not all needed if an error is raised
+                for future in futures:
+                    future.cancel()
+
+
+def _parse_chunk(
+    entry_lines: EntryLines,
+    entry_parser: EntryParser,
+    start: int,
+    end: int,
+    line_number: int = 1,
+    previous_entry: Optional[Entry] = None,
+) -> Tuple[List[Entry], int]:
+    """Parse the lines that start between byte `start` and byte `end`.
+
+    Returns the entries and the number of lines parsed.
+    """
+    lines = itertools.takewhile(lambda offset_line: offset_line[0] < end, entry_lines.lines_at(start))
+    numbered_lines = [(line_number, line) for line_number, (_, line) in enumerate(lines, line_number)]
+    return list(_parse_log(numbered_lines, entry_parser, previous_entry)), len(numbered_lines)
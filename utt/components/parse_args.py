@@ -7,6 +7,7 @@ import pytz
 
 from ..__version__ import VERSION
 from .commands import Commands
+from .timezone_config import ENGINES as TIMEZONE_ENGINES
 
 
 def parse_args(commands: Commands) -> argparse.Namespace:
@@ -16,12 +17,24 @@ def parse_args(commands: Commands) -> argparse.Namespace:
         " tracking application written in Python.",
     )
 
-    parser.add_argument("--data", dest="data_filename")
+    parser.add_argument(
+        "--data",
+        dest="data_filenames",
+        action="append",
+        help="data file, '-' for the standard input. Repeat it or use a glob pattern to report on several files",
+    )
 
     parser.add_argument("--now", dest="now", type=parse_datetime)
 
     parser.add_argument("--timezone", dest="timezone", type=pytz.timezone)
 
+    parser.add_argument(
+        "--timezone-engine",
+        dest="timezone_engine",
+        choices=TIMEZONE_ENGINES,
+        help="library that computes the UTC offsets of the local timezone (default: timezone.engine of the config)",
+    )
+
     parser.add_argument(
         "--version",
         action="version",
@@ -35,7 +48,11 @@ def parse_args(commands: Commands) -> argparse.Namespace:
         command.add_args(sub_parser)
 
     argcomplete.autocomplete(parser, append_space=False)
-    return parser.parse_args()
+    args = parser.parse_args()
+
+    # For plugins written when --data could only be given once
+    args.data_filename = args.data_filenames[0] if args.data_filenames else None
+    return args
 
 
 def parse_datetime(datetimestring):
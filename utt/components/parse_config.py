@@ -0,0 +1,25 @@
+import configparser
+import os
+
+
+class ParseConfig:
+    def __init__(self, workers, lazy=True):
+        self._workers = workers
+        self._lazy = lazy
+
+    def workers(self):
+        return self._workers
+
+    def lazy(self):
+        return self._lazy
+
+
+def parse_config(config: configparser.ConfigParser) -> ParseConfig:
+    lazy = config.getboolean("parse", "lazy")
+    workers = config.get("parse", "workers")
+    if workers == "auto":
+        return ParseConfig(os.cpu_count() or 1, lazy)
+
+    if not workers.isdigit() or int(workers) < 1:
+        raise ValueError("Invalid number of parse workers '%s', expected 'auto' or a positive integer" % workers)
+    return ParseConfig(int(workers), lazy)
@@ -0,0 +1,91 @@
+import collections
+import heapq
+import locale
+from typing import Generator, Iterable, Iterator, Optional, Tuple, Union
+
+from ..data_structures.entry import Entry
+from .data_filename import DataFilename
+from .entry_lines import EntryLines
+from .entry_parser import EntryParser
+
+
+def _parse_log(
+    lines: Iterable[Tuple[int, Union[str, bytes]]],
+    entry_parser: EntryParser,
+    previous_entry: Optional[Entry] = None,
+    skip_partial_line: bool = False,
+) -> Generator[Entry, None, None]:
+    """Parse numbered lines into entries.
+
+    If `skip_partial_line` is true, lines are expected to end with a
+    newline, and an invalid line that doesn't is skipped: it's the
+    last line of the file, which may still be being written by `add`.
+    """
+    for line_number, line in lines:
+        try:
+            parsed_line = _parse_line(previous_entry, line_number, line.strip(), entry_parser)
+        except SyntaxError:
+            if skip_partial_line and not _is_terminated(line):
+                continue
+            raise
+
+        if parsed_line is not None:
+            previous_entry, entry = parsed_line
+            yield entry
+
+
+def _parse_line(previous_entry: Entry, line_number: int, line: Union[str, bytes], entry_parser: EntryParser):
+    # Ignore empty lines
+    if not line:
+        return None
+
+    new_entry = entry_parser.parse(line)
+    if new_entry is None:
+        if isinstance(line, bytes):
+            line = line.decode(locale.getpreferredencoding(False), errors="replace")
+        raise SyntaxError("Invalid syntax at line %d: %s" % (line_number, line))
+
+    if previous_entry and previous_entry.datetime > new_entry.datetime:
+        raise Exception("Error line %d. Not in chronological order: %s > %s" % (line_number, previous_entry, new_entry))
+    previous_entry = new_entry
+    return previous_entry, new_entry
+
+
+def _is_terminated(line: Union[str, bytes]) -> bool:
+    return line.endswith(b"\n" if isinstance(line, bytes) else "\n")
+
+
+def parse_data_file(
+    filename: str, entry_parser: EntryParser, offset: int = 0, previous_entry: Optional[Entry] = None
+) -> Generator[Entry, None, None]:
+    """Parse a data file from byte `offset`.
+
+    Errors are prefixed with the filename, since entries may come from
+    several files.
+    """
+    entry_lines = EntryLines(DataFilename(filename))
+    lines = ((line_number, line) for line_number, (_, line) in enumerate(entry_lines.lines_at(offset), 1))
+
+    try:
+        yield from _parse_log(lines, entry_parser, previous_entry, skip_partial_line=True)
+    except Exception as err:
+        if offset > 0:
+            # Line numbers are only known relative to `offset`. Parse the
+            # file again with absolute line numbers so that the error
+            # message points to the right line.
+            first_line_number = entry_lines.count_lines(offset) + 1
+            lines = enumerate((line for _, line in entry_lines.lines_at(offset)), first_line_number)
+            try:
+                collections.deque(_parse_log(lines, entry_parser, previous_entry, skip_partial_line=True), maxlen=0)
+            except Exception as absolute_err:
+                err = absolute_err
+        raise type(err)("%s: %s" % (filename, err)) from err
+
+
+def merge_logs(logs: Iterable[Iterable[Entry]]) -> Iterator[Entry]:
+    """Merge logs that are each in chronological order.
+
+    The logs are read as the merged entries are consumed. Entries with
+    the same datetime are taken from the logs in order.
+    """
+    return heapq.merge(*logs, key=lambda entry: entry.datetime)
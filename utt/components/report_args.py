@@ -80,6 +80,13 @@ def parse_absolute_date(datestring):
     return datetime.datetime.strptime(datestring, "%Y-%m-%d").date()
 
 
+def parse_positive_integer(string):
+    number = int(string)
+    if number <= 0:
+        raise argparse.ArgumentTypeError("%s is not a positive number" % string)
+    return number
+
+
 def parse_relative_day(today, datestring):
     """Parses day like 'today' or 'yesterday'.
 
@@ -0,0 +1,326 @@
+import collections
+import datetime
+import itertools
+import typing
+from typing import Iterable, List, Optional
+
+from ..data_structures.entry import Entry
+from .data_filename import DataFilename
+from .data_filenames import DataFilenames
+from .data_segments import DataSegments, parse_segments
+from .entries import Entries, cached_entries
+from .entries_cache import EntriesCache
+from .entry_index import EntryIndex
+from .entry_lines import EntryLines
+from .entry_parser import EntryParser
+from .local_timezone import LocalTimezone
+from .parallel_parser import ParallelParser
+from .parse_log import _parse_log, merge_logs, parse_data_file
+from .report_args import ReportArgs
+from .sqlite_storage import SQLiteStorage
+
+ReportEntries = typing.NewType("ReportEntries", List[Entry])
+
+# Below this size, the data file is scanned instead of bisected
+LINEAR_SCAN_SIZE = 64 * 1024
+# From this size, or from half of the data file, the entries of a range
+# are read from the cache of the entries of the whole data file
+WIDE_RANGE_SIZE = 1024 * 1024
+
+
+def report_entries(
+    report_args: ReportArgs,
+    local_timezone: LocalTimezone,
+    entry_lines: EntryLines,
+    entry_parser: EntryParser,
+    entry_index: EntryIndex,
+    data_segments: DataSegments,
+    sqlite_storage: SQLiteStorage,
+    data_filenames: DataFilenames,
+    parallel_parser: ParallelParser,
+    entries_cache: EntriesCache,
+) -> ReportEntries:
+    """Entries needed to report on `report_args.range`.
+
+    With several data files, each file is read from its last entries
+    before the start of the range and the files are merged
+    chronologically. With the SQLite layout, the entries are queried by
+    timestamp. With the segmented layout, only the segments overlapping
+    the range are read. Otherwise, the data file is read from the entry
+    found in its index or, if there is no usable index, by bisecting the
+    data file (entries are in chronological order) to find the last
+    entries before the start of the range. It is then parsed up to the
+    first entry after the end of the range, unless the range spans a
+    large part of the data file, in which case the entries of the data
+    file are read from the cache and only the lines appended since the
+    cache was stored are parsed. Archived entries are only read if the
+    range reaches back into them. The surrounding entries are kept so
+    that activities overlapping the range boundaries and the current
+    activity are the same as if the whole file had been parsed.
+    """
+    start_datetime, end_datetime = _range_datetimes(report_args, local_timezone)
+
+    if len(data_filenames) > 1:
+        logs = [
+            parse_data_file(filename, entry_parser, _start_offset(filename, entry_parser, start_datetime))
+            for filename in data_filenames
+        ]
+        return ReportEntries(_take_range(merge_logs(logs), start_datetime, end_datetime))
+
+    if sqlite_storage.enabled():
+        return ReportEntries(
+            _take_range(sqlite_storage.range(start_datetime, end_datetime), start_datetime, end_datetime)
+        )
+
+    if data_segments.enabled():
+        segments = data_segments.overlapping(start_datetime, end_datetime)
+        return ReportEntries(
+            _take_range(parse_segments(data_segments, segments, entry_parser), start_datetime, end_datetime)
+        )
+
+    if not entry_lines.seekable():
+        entries = _stream_range(entry_lines, entry_parser, start_datetime, end_datetime)
+    else:
+        entries = _data_file_range(
+            report_args,
+            entry_lines,
+            entry_parser,
+            entry_index,
+            entries_cache,
+            parallel_parser,
+            start_datetime,
+            end_datetime,
+        )
+
+    archives = data_segments.archives()
+    if archives and sum(1 for entry in entries if entry.datetime < start_datetime) < 2:
+        # The range reaches back into the entries moved out of the data
+        # file by `utt archive`. Only the archives that overlap it are
+        # read.
+        segments = data_segments.overlapping(start_datetime, end_datetime)
+        archived_entries = parse_segments(data_segments, segments, entry_parser)
+        entries = _take_range(itertools.chain(archived_entries, entries), start_datetime, end_datetime)
+
+    return ReportEntries(entries)
+
+
+def entries_report_entries(entries: Entries, report_args: ReportArgs, local_timezone: LocalTimezone) -> ReportEntries:
+    """Entries needed to report on `report_args.range`, taken from the Entries component.
+
+    Used instead of `report_entries` when a plugin overrides Entries, so
+    that reports are made of the plugin's entries.
+    """
+    start_datetime, end_datetime = _range_datetimes(report_args, local_timezone)
+    return ReportEntries(_take_range(entries, start_datetime, end_datetime))
+
+
+def _range_datetimes(report_args: ReportArgs, local_timezone: LocalTimezone):
+    start_datetime = local_timezone.localize(
+        datetime.datetime(report_args.range.start.year, report_args.range.start.month, report_args.range.start.day)
+    )
+    end_datetime = local_timezone.localize(
+        datetime.datetime(report_args.range.end.year, report_args.range.end.month, report_args.range.end.day)
+        + datetime.timedelta(days=1)
+    )
+    return start_datetime, end_datetime
+
+
+def _data_file_range(
+    report_args: ReportArgs,
+    entry_lines: EntryLines,
+    entry_parser: EntryParser,
+    entry_index: EntryIndex,
+    entries_cache: EntriesCache,
+    parallel_parser: ParallelParser,
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+) -> List[Entry]:
+    start_record = entry_index.start_record(report_args.range.start)
+    if start_record is not None:
+        offset, line_number = start_record.offset, start_record.line_number
+    else:
+        offset, line_number = find_offset(entry_lines, entry_parser, start_datetime), None
+
+    if entries_cache.enabled() and _is_wide_range(entry_lines, entry_parser, offset, end_datetime):
+        entries = cached_entries(entry_lines, entry_parser, entries_cache, parallel_parser)
+        return _take_range(entries, start_datetime, end_datetime)
+
+    if line_number is not None:
+        return _parse_data_file_range(entry_lines, entry_parser, parallel_parser, offset, line_number, end_datetime)
+
+    try:
+        return _parse_data_file_range(entry_lines, entry_parser, parallel_parser, offset, 1, end_datetime)
+    except Exception:
+        # Line numbers are only known relative to `offset`. Parse the
+        # range again with absolute line numbers so that the error
+        # message points to the right line.
+        line_number = entry_lines.count_lines(offset) + 1
+        _parse_data_file_range(entry_lines, entry_parser, parallel_parser, offset, line_number, end_datetime)
+        raise
+
+
+def _is_wide_range(
+    entry_lines: EntryLines, entry_parser: EntryParser, offset: int, end_datetime: datetime.datetime
+) -> bool:
+    """Whether the entries from byte `offset` to `end_datetime` are a large part of the data file."""
+    size = entry_lines.size()
+    wide_range_size = min(WIDE_RANGE_SIZE, size // 2)
+    if size - offset < wide_range_size:
+        return False
+
+    return find_offset(entry_lines, entry_parser, end_datetime) - offset >= wide_range_size
+
+
+def _parse_data_file_range(
+    entry_lines: EntryLines,
+    entry_parser: EntryParser,
+    parallel_parser: ParallelParser,
+    offset: int,
+    line_number: int,
+    end_datetime: datetime.datetime,
+) -> List[Entry]:
+    """Parse the data file from byte `offset` through the first entry at or after `end_datetime`."""
+    # The end of the range is only looked for if the rest of the data
+    # file is large enough to be parsed in parallel
+    if parallel_parser.enabled(entry_lines.size() - offset):
+        end_offset = max(offset, find_offset(entry_lines, entry_parser, end_datetime))
+        if parallel_parser.enabled(end_offset - offset):
+            # The entries before the second to last entry before the end
+            # of the range are all in the range. They are parsed in
+            # parallel, and the rest up to the first entry after the
+            # range in sequence.
+            parsed = parallel_parser.parse(entry_lines, offset, end_offset, line_number)
+            return parsed.entries + _parse_range(
+                entry_lines,
+                entry_parser,
+                end_offset,
+                line_number + parsed.line_count,
+                end_datetime,
+                _last(parsed.entries),
+            )
+
+    return _parse_range(entry_lines, entry_parser, offset, line_number, end_datetime)
+
+
+def _start_offset(filename: str, entry_parser: EntryParser, start_datetime: datetime.datetime) -> int:
+    entry_lines = EntryLines(DataFilename(filename))
+    if not entry_lines.seekable():
+        return 0
+
+    return find_offset(entry_lines, entry_parser, start_datetime)
+
+
+def find_offset(entry_lines: EntryLines, entry_parser: EntryParser, start_datetime: datetime.datetime) -> int:
+    """Return the offset of the second to last entry before `start_datetime`.
+
+    The last entry before `start_datetime` is the start of the activity
+    overlapping the start of the range, and the one before it is needed
+    so that the activity ending at that entry is known as well. Returns
+    0 if there are not enough entries before `start_datetime`.
+    """
+    low, high = 0, entry_lines.size()
+    while high - low > LINEAR_SCAN_SIZE:
+        middle = (low + high) // 2
+        next_entry = _next_entry(entry_lines, entry_parser, middle)
+        if next_entry is None or next_entry[1].datetime >= start_datetime:
+            high = middle
+        else:
+            low = middle
+
+    offsets = [0, 0]
+    for line_offset, entry in _entries_at(entry_lines, entry_parser, low):
+        if entry.datetime >= start_datetime:
+            break
+        offsets = [offsets[-1], line_offset]
+
+    if low == 0 or offsets[0] >= low:
+        return offsets[0]
+
+    return _previous_entry_offset(entry_lines, entry_parser, offsets[1])
+
+
+def _previous_entry_offset(entry_lines: EntryLines, entry_parser: EntryParser, offset: int) -> int:
+    window = LINEAR_SCAN_SIZE
+    while True:
+        low = max(0, offset - window)
+        previous_offsets = [
+            line_offset for line_offset, _ in _entries_at(entry_lines, entry_parser, low, end_offset=offset)
+        ]
+        if previous_offsets:
+            return previous_offsets[-1]
+        if low == 0:
+            return 0
+        window *= 2
+
+
+def _next_entry(entry_lines: EntryLines, entry_parser: EntryParser, offset: int):
+    return next(_entries_at(entry_lines, entry_parser, offset), None)
+
+
+def _entries_at(entry_lines: EntryLines, entry_parser: EntryParser, offset: int, end_offset: Optional[int] = None):
+    for line_offset, line in entry_lines.lines_at(offset):
+        if end_offset is not None and line_offset >= end_offset:
+            return
+        entry = entry_parser.parse(line.strip())
+        if entry is not None:
+            yield line_offset, entry
+
+
+def _parse_range(
+    entry_lines: EntryLines,
+    entry_parser: EntryParser,
+    offset: int,
+    line_number: int,
+    end_datetime: datetime.datetime,
+    previous_entry: Optional[Entry] = None,
+) -> List[Entry]:
+    lines = ((line_number + i, line) for i, (_, line) in enumerate(entry_lines.lines_at(offset)))
+    return _take_through(_parse_log(lines, entry_parser, previous_entry, skip_partial_line=True), end_datetime)
+
+
+def _stream_range(
+    entry_lines: EntryLines,
+    entry_parser: EntryParser,
+    start_datetime: datetime.datetime,
+    end_datetime: datetime.datetime,
+) -> List[Entry]:
+    """Same as _parse_range, for data that can only be read sequentially.
+
+    Only the last two entries before the range are kept in memory.
+    """
+    lines = ((line_number, line) for line_number, (_, line) in enumerate(entry_lines.lines_at(0), 1))
+    taken = _take_range(_parse_log(lines, entry_parser, skip_partial_line=True), start_datetime, end_datetime)
+
+    # Read the rest of the input so that the writing end of a pipe is
+    # not interrupted
+    collections.deque(lines, maxlen=0)
+    return taken
+
+
+def _take_range(
+    entries: Iterable[Entry], start_datetime: datetime.datetime, end_datetime: datetime.datetime
+) -> List[Entry]:
+    """Take the entries from `start_datetime` through the first entry
+    at or after `end_datetime`, along with the last two entries before
+    `start_datetime`."""
+    entries = iter(entries)
+    before_start = collections.deque(maxlen=2)
+    for entry in entries:
+        if entry.datetime >= start_datetime:
+            return list(before_start) + _take_through(itertools.chain([entry], entries), end_datetime)
+        before_start.append(entry)
+
+    return list(before_start)
+
+
+def _take_through(entries: Iterable[Entry], end_datetime: datetime.datetime) -> List[Entry]:
+    taken = []
+    for entry in entries:
+        taken.append(entry)
+        if entry.datetime >= end_datetime:
+            break
+    return taken
+
+
+def _last(entries: List[Entry]) -> Optional[Entry]:
+    return entries[-1] if entries else None
@@ -0,0 +1,194 @@
+import datetime
+import itertools
+import locale
+import os
+import sqlite3
+from typing import Iterator, List, Optional, Tuple
+
+from ..constants import SQLITE_FILENAME, SQLITE_FILENAME_SUFFIX, STDIN_DATA_FILENAME
+from ..data_structures.entry import Entry
+from .data_filename import DataFilename
+from .entry_lines import EntryLines
+from .entry_parser import EntryParser
+from .parse_log import _parse_line, _parse_log
+from .storage_config import SQLITE_LAYOUT, StorageConfig
+
+SCHEMA_VERSION = 1
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id INTEGER PRIMARY KEY,
+    timestamp INTEGER NOT NULL,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_timestamp ON entries (timestamp, id);
+"""
+
+# Timestamps are computed when entries are stored. Entries without a
+# timezone offset are in the local timezone, which may have changed
+# since, so range queries start this much earlier.
+TIMESTAMP_MARGIN = datetime.timedelta(days=1)
+
+IMPORT_BATCH_SIZE = 10000
+
+
+class SQLiteStorage:
+    """SQLite storage layout.
+
+    Entries are stored in a SQLite database (utt.sqlite) as lines of
+    the text format, along with their UTC timestamp. The timestamp
+    column is indexed, so reports only read the entries of their range.
+
+    The SQLite layout is used if it is enabled in the config or if the
+    data filename ends with .sqlite.
+    """
+
+    def __init__(self, data_filename: DataFilename, storage_config: StorageConfig, entry_parser: EntryParser):
+        self._data_filename = data_filename
+        self._storage_config = storage_config
+        self._entry_parser = entry_parser
+        self._connection = None
+
+    def enabled(self) -> bool:
+        if self._data_filename == STDIN_DATA_FILENAME:
+            return False
+
+        return self._storage_config.layout() == SQLITE_LAYOUT or self._data_filename.endswith(SQLITE_FILENAME_SUFFIX)
+
+    def filename(self) -> str:
+        if self._data_filename.endswith(SQLITE_FILENAME_SUFFIX):
+            return self._data_filename
+
+        if os.path.isdir(self._data_filename):
+            return os.path.join(self._data_filename, SQLITE_FILENAME)
+
+        return os.path.join(os.path.dirname(self._data_filename), SQLITE_FILENAME)
+
+    def entries(self) -> Iterator[Entry]:
+        cursor = self._connect().execute("SELECT id, line FROM entries ORDER BY timestamp, id")
+        return _parse_log(cursor, self._entry_parser)
+
+    def range(self, start_datetime: datetime.datetime, end_datetime: datetime.datetime) -> Iterator[Entry]:
+        """Entries from a few before `start_datetime` through the first after `end_datetime`.
+
+        The caller is responsible for taking the exact range out of them.
+        """
+        connection = self._connect()
+        start_timestamp = _timestamp(start_datetime - TIMESTAMP_MARGIN)
+
+        before_start = connection.execute(
+            "SELECT id, line FROM entries WHERE timestamp < ? ORDER BY timestamp DESC, id DESC LIMIT 2",
+            (start_timestamp,),
+        ).fetchall()
+        from_start = connection.execute(
+            "SELECT id, line FROM entries WHERE timestamp >= ? ORDER BY timestamp, id",
+            (start_timestamp,),
+        )
+
+        return _parse_log(itertools.chain(reversed(before_start), from_start), self._entry_parser)
+
+    def last_entry(self) -> Optional[Entry]:
+        row = (
+            self._connect().execute("SELECT id, line FROM entries ORDER BY timestamp DESC, id DESC LIMIT 1").fetchone()
+        )
+        if row is None:
+            return None
+
+        return next(_parse_log([row], self._entry_parser))
+
+    def reversed_entries(self) -> Iterator[Entry]:
+        """Entries from the last to the first."""
+        cursor = self._connect().execute("SELECT line FROM entries ORDER BY timestamp DESC, id DESC")
+        for (line,) in cursor:
+            # Invalid lines are skipped, as they are in the data file
+            entry = self._entry_parser.parse(line)
+            if entry is not None:
+                yield entry
+
+    def add(self, entry: Entry, line: str) -> None:
+        """Store `entry`, written as `line` in the text format."""
+        self.add_all([(entry, line)])
+
+    def add_all(self, entries: List[Tuple[Entry, str]]) -> None:
+        """Store entries along with their line in the text format, in one transaction.
+
+        Entries are queried in timestamp order, so an entry before the
+        last entry stored would not be where it was added: the entries
+        must be in chronological order and not before the last entry.
+        """
+        with self._connect() as connection:
+            # The last entry can't change until the entries are stored
+            connection.execute("BEGIN IMMEDIATE")
+            _check_chronological_order(self.last_entry(), [entry for entry, _ in entries])
+            connection.executemany(
+                "INSERT INTO entries (timestamp, line) VALUES (?, ?)",
+                [(_timestamp(entry.datetime), line) for entry, line in entries],
+            )
+
+    def count(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def import_file(self, filename: str, replace: bool = False) -> int:
+        """Store the entries of a text data file. Returns the number of entries.
+
+        If `replace` is true, the entries already stored are replaced.
+        """
+        rows = self._rows(filename)
+        count = 0
+
+        with self._connect() as connection:
+            if replace:
+                connection.execute("DELETE FROM entries")
+
+            while True:
+                batch = list(itertools.islice(rows, IMPORT_BATCH_SIZE))
+                if not batch:
+                    break
+                connection.executemany("INSERT INTO entries (timestamp, line) VALUES (?, ?)", batch)
+                count += len(batch)
+
+        return count
+
+    def export_file(self, filename: str) -> None:
+        """Write the entries to a text data file, one day per paragraph."""
+        cursor = self._connect().execute("SELECT line FROM entries ORDER BY timestamp, id")
+        previous_entry = None
+
+        with open(filename, "x") as data_file:
+            for (line,) in cursor:
+                entry = self._entry_parser.parse(line)
+                if previous_entry is not None and previous_entry.datetime.date() != entry.datetime.date():
+                    data_file.write("\n")
+                data_file.write(line + "\n")
+                previous_entry = entry
+
+    def _rows(self, filename: str):
+        previous_entry = None
+        for line_number, (_, line) in enumerate(EntryLines(DataFilename(filename)).lines_at(0), 1):
+            line = line.strip()
+            parsed_line = _parse_line(previous_entry, line_number, line, self._entry_parser)
+            if parsed_line is not None:
+                previous_entry, entry = parsed_line
+                yield _timestamp(entry.datetime), line.decode(locale.getpreferredencoding(False))
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is None:
+            os.makedirs(os.path.dirname(os.path.abspath(self.filename())), exist_ok=True)
+            connection = sqlite3.connect(self.filename())
+            version = connection.execute("PRAGMA user_version").fetchone()[0]
+            if version not in (0, SCHEMA_VERSION):
+                raise Exception("Unsupported database schema version: %s" % version)
+            connection.executescript(SCHEMA)
+            connection.execute("PRAGMA user_version = %d" % SCHEMA_VERSION)
+            self._connection = connection
+        return self._connection
+
+
+def _check_chronological_order(last_entry: Optional[Entry], new_entries: List[Entry]) -> None:
+    for previous_entry, new_entry in zip([last_entry] + new_entries, new_entries):
+        if previous_entry is not None and previous_entry.datetime > new_entry.datetime:
+            raise Exception("Not in chronological order: %s > %s" % (previous_entry, new_entry))
+
+
+def _timestamp(value: datetime.datetime) -> int:
+    return int(value.timestamp())
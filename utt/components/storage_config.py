@@ -0,0 +1,26 @@
+import configparser
+
+SINGLE_FILE_LAYOUT = "single"
+SEGMENTED_LAYOUT = "segmented"
+SQLITE_LAYOUT = "sqlite"
+LAYOUTS = [SINGLE_FILE_LAYOUT, SEGMENTED_LAYOUT, SQLITE_LAYOUT]
+
+
+class StorageConfig:
+    def __init__(self, layout, fsync=False):
+        self._layout = layout
+        self._fsync = fsync
+
+    def layout(self):
+        return self._layout
+
+    def fsync(self):
+        return self._fsync
+
+
+def storage_config(config: configparser.ConfigParser) -> StorageConfig:
+    layout = config.get("storage", "layout")
+    if layout not in LAYOUTS:
+        raise ValueError("Invalid storage layout '%s', expected one of: %s" % (layout, ", ".join(LAYOUTS)))
+    fsync = config.getboolean("storage", "fsync")
+    return StorageConfig(layout, fsync)
@@ -0,0 +1,63 @@
+import datetime
+import functools
+from typing import Dict, Optional, Tuple, Union
+
+from .local_timezone import LocalTimezone
+
+ONE_DAY = datetime.timedelta(days=1)
+ONE_HOUR = datetime.timedelta(hours=1)
+ONE_MINUTE = datetime.timedelta(minutes=1)
+
+
+@functools.lru_cache(maxsize=None)
+def fixed_offset_timezone(offset: Union[str, bytes]) -> datetime.timezone:
+    """Timezone of an offset like +0100 or -09:30.
+
+    The same timezone is returned for every entry written with the same
+    offset. Raises ValueError if the offset is a day or more.
+    """
+    if isinstance(offset, bytes):
+        offset = offset.decode("ascii")
+    offset = offset.replace(":", "")
+
+    delta = datetime.timedelta(hours=int(offset[1:3]), minutes=int(offset[3:5]))
+    return datetime.timezone(-delta if offset[0] == "-" else delta)
+
+
+class LocalizationCache:
+    """Localization of naive datetimes in the local timezone, memoized.
+
+    `localize` only picks the tzinfo of a naive datetime (its UTC
+    offset, DST and name), so a tzinfo found for the first and the last
+    minute of a day is given to every datetime of that day. On days with
+    a DST transition, tzinfos are memoized per hour in the same way, and
+    datetimes of an hour with a transition in it are localized one by
+    one.
+    """
+
+    def __init__(self, local_timezone: LocalTimezone):
+        self._local_timezone = local_timezone
+        self._tzinfos: Dict[Tuple[datetime.datetime, datetime.timedelta], Optional[datetime.tzinfo]] = {}
+
+    def localize(self, naive_datetime: datetime.datetime) -> datetime.datetime:
+        tzinfo = self._tzinfo(naive_datetime.replace(hour=0, minute=0, second=0, microsecond=0), ONE_DAY)
+        if tzinfo is None:
+            tzinfo = self._tzinfo(naive_datetime.replace(minute=0, second=0, microsecond=0), ONE_HOUR)
+        if tzinfo is None:
+            return self._local_timezone.localize(naive_datetime)
+
+        return naive_datetime.replace(tzinfo=tzinfo)
+
+    def _tzinfo(self, start: datetime.datetime, duration: datetime.timedelta) -> Optional[datetime.tzinfo]:
+        """The tzinfo of the minutes from `start` for `duration`, if it's the same for all."""
+        key = (start, duration)
+        try:
+            return self._tzinfos[key]
+        except KeyError:
+            pass
+
+        tzinfo = self._local_timezone.localize(start).tzinfo
+        if self._local_timezone.localize(start + duration - ONE_MINUTE).tzinfo is not tzinfo:
+            tzinfo = None
+        self._tzinfos[key] = tzinfo
+        return tzinfo
@@ -1,14 +1,32 @@
 import configparser
+import sys
+
+PYTZ_ENGINE = "pytz"
+ZONEINFO_ENGINE = "zoneinfo"
+ENGINES = [PYTZ_ENGINE, ZONEINFO_ENGINE]
 
 
 class TimezoneConfig:
-    def __init__(self, enabled):
+    def __init__(self, enabled, engine=PYTZ_ENGINE):
         self._enabled = enabled
+        self._engine = engine
 
     def enabled(self):
         return self._enabled
 
+    def engine(self):
+        return self._engine
+
 
 def timezone_config(config: configparser.ConfigParser) -> TimezoneConfig:
     enabled = config.getboolean("timezone", "enabled")
-    return TimezoneConfig(enabled)
+    engine = config.get("timezone", "engine")
+    check_engine(engine)
+    return TimezoneConfig(enabled, engine)
+
+
+def check_engine(engine: str) -> None:
+    if engine not in ENGINES:
+        raise ValueError("Invalid timezone engine '%s', expected one of: %s" % (engine, ", ".join(ENGINES)))
+    if engine == ZONEINFO_ENGINE and sys.version_info < (3, 9):
+        raise ValueError("Invalid timezone engine '%s', it requires Python 3.9 or later" % engine)
@@ -0,0 +1,47 @@
+import datetime
+import functools
+import zoneinfo
+
+
+class ZoneInfoTimezone(zoneinfo.ZoneInfo):
+    """A zoneinfo timezone that localizes naive datetimes as pytz does.
+
+    `localize` attaches a fixed-offset tzinfo, named after the period
+    (e.g. BST), rather than the zone itself, so that comparing and
+    subtracting localized datetimes is done in UTC as with pytz.
+    """
+
+    def localize(self, dt: datetime.datetime, is_dst: bool = False) -> datetime.datetime:
+        if dt.tzinfo is not None:
+            raise ValueError("Not naive datetime (tzinfo is already set)")
+
+        local_dt = dt.replace(tzinfo=self)
+        later_local_dt = dt.replace(tzinfo=self, fold=1)
+        if local_dt.utcoffset() != later_local_dt.utcoffset() and _exists(local_dt):
+            # Ambiguous time, when clocks are wound back: the period with
+            # the requested DST, or else the latest (by UTC) unless is_dst
+            candidates = [candidate for candidate in (local_dt, later_local_dt) if bool(candidate.dst()) == is_dst]
+            if len(candidates) == 1:
+                local_dt = candidates[0]
+            elif not is_dst:
+                local_dt = later_local_dt
+        # A time skipped when clocks are wound forward keeps the offset
+        # of before the transition (fold=0), as pytz does with is_dst=False
+
+        return _in_period_timezone(local_dt)
+
+    def normalize(self, dt: datetime.datetime) -> datetime.datetime:
+        return _in_period_timezone(dt.astimezone(self))
+
+
+def _exists(local_dt: datetime.datetime) -> bool:
+    return local_dt.astimezone(datetime.timezone.utc).astimezone(local_dt.tzinfo).replace(fold=0) == local_dt
+
+
+def _in_period_timezone(local_dt: datetime.datetime) -> datetime.datetime:
+    return local_dt.replace(tzinfo=_period_timezone(local_dt.utcoffset(), local_dt.tzname()), fold=0)
+
+
+@functools.lru_cache(maxsize=None)
+def _period_timezone(offset: datetime.timedelta, name: str) -> datetime.timezone:
+    return datetime.timezone(offset, name)
@@ -1,3 +1,6 @@
+CACHE_HOME_DEFAULT_DIRNAME = "~/.cache"
+CACHE_HOME_ENV_VAR_NAME = "XDG_CACHE_HOME"
+CACHE_HOME_SUB_DIRNAME = "utt"
 CONFIG_FILENAME = "utt.cfg"
 DATA_CONFIG_DEFAULT_DIRNAME = "~/.config"
 DATA_CONFIG_ENV_VAR_NAME = "XDG_DATA_CONFIG"
@@ -7,3 +10,9 @@ DATA_HOME_ENV_VAR_NAME = "XDG_DATA_HOME"
 DATA_HOME_SUB_DIRNAME = "utt"
 ENTRY_FILENAME = "utt.log"
 HELLO_ENTRY_NAME = "hello"
+INDEX_FILENAME_SUFFIX = ".idx"
+SEGMENTS_MANIFEST_FILENAME = "manifest.json"
+SEGMENT_FILENAME_FORMAT = "%Y-%m.log"
+SQLITE_FILENAME = "utt.sqlite"
+SQLITE_FILENAME_SUFFIX = ".sqlite"
+STDIN_DATA_FILENAME = "-"
@@ -0,0 +1,10 @@
+from dataclasses import dataclass
+from typing import Callable, List
+
+from .data_structures.entry import Entry
+
+
+@dataclass
+class Hook:
+    name: str
+    handler_class: Callable[..., Callable[[List[Entry]], None]]
@@ -0,0 +1,118 @@
+import argparse
+import datetime
+import os
+import shutil
+import tempfile
+
+from ..api import _v1
+from ..components.data_file_lock import locked_data_file  # Private API
+from ..components.data_segments import ARCHIVE_SUFFIXES  # Private API
+from ..components.report_args import parse_absolute_date  # Private API
+from ..constants import STDIN_DATA_FILENAME  # Private API
+
+
+class ArchiveHandler:
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        data_filename: _v1._private.DataFilename,
+        data_filenames: _v1._private.DataFilenames,
+        data_segments: _v1._private.DataSegments,
+        entry_parser: _v1._private.EntryParser,
+        entries_cache: _v1._private.EntriesCache,
+        entry_index: _v1._private.EntryIndex,
+        local_timezone: _v1._private.LocalTimezone,
+        sqlite_storage: _v1._private.SQLiteStorage,
+        output: _v1.Output,
+    ):
+        self._args = args
+        self._data_filename = data_filename
+        self._data_filenames = data_filenames
+        self._data_segments = data_segments
+        self._entry_parser = entry_parser
+        self._entries_cache = entries_cache
+        self._entry_index = entry_index
+        self._local_timezone = local_timezone
+        self._sqlite_storage = sqlite_storage
+        self._output = output
+
+    def __call__(self):
+        if len(self._data_filenames) > 1:
+            raise Exception("Cannot archive several data files")
+
+        if self._data_filename == STDIN_DATA_FILENAME:
+            raise Exception("Cannot archive the standard input")
+        if self._sqlite_storage.enabled():
+            raise Exception("Cannot archive entries stored in a SQLite database")
+
+        # Only whole months are archived
+        before = self._local_timezone.localize(datetime.datetime(self._args.before.year, self._args.before.month, 1))
+        suffix = ARCHIVE_SUFFIXES[self._args.compression]
+
+        if self._data_segments.enabled():
+            archives = self._data_segments.archive_segments(before, suffix)
+        else:
+            archives = self._archive_data_file(before, suffix)
+
+        if not archives:
+            print("Nothing to archive before %s" % before.strftime("%Y-%m-%d"), file=self._output)
+            return
+
+        for archive in archives:
+            print(
+                "Archived %d entries to %s" % (archive.entry_count, self._data_segments.path(archive)),
+                file=self._output,
+            )
+
+    def _archive_data_file(self, before, suffix):
+        if not os.path.exists(self._data_filename):
+            return []
+
+        # Entries added while the data file is rewritten would be lost
+        with locked_data_file(self._data_filename):
+            archives, offset = self._data_segments.archive_file(self._data_filename, self._entry_parser, before, suffix)
+            if not archives:
+                return archives
+
+            _remove_head(self._data_filename, offset)
+
+        self._entries_cache.invalidate()
+        self._entry_index.rebuild()
+        return archives
+
+
+def _remove_head(filename, offset):
+    """Remove the first `offset` bytes of a file, atomically."""
+    with open(filename, "rb") as data_file:
+        data_file.seek(offset)
+        data = data_file.read().lstrip(b"\n")
+
+    fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(filename))
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+        shutil.copymode(filename, tmp_filename)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        os.unlink(tmp_filename)
+        raise
+
+
+def add_args(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--before",
+        type=parse_absolute_date,
+        required=True,
+        help="archive the months that end before this date (YYYY-MM-DD)",
+    )
+    parser.add_argument(
+        "--compression",
+        choices=sorted(ARCHIVE_SUFFIXES),
+        default="gzip",
+        help="compression format of the archives",
+    )
+
+
+archive_command = _v1.Command("archive", "Move past months into compressed archives", ArchiveHandler, add_args)
+
+_v1.register_command(archive_command)
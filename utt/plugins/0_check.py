@@ -0,0 +1,138 @@
+import argparse
+import datetime
+import functools
+import json
+import sys
+
+from ..api import _v1
+from ..components.check_log import LogCheck, check_chunk, compare_entries  # Private API
+from ..components.data_filename import DataFilename  # Private API
+from ..components.entry_lines import EntryLines  # Private API
+from ..components.report_args import parse_positive_integer  # Private API
+
+DEFAULT_MAX_GAP_HOURS = 12
+
+
+class CheckHandler:
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        data_filename: _v1._private.DataFilename,
+        data_filenames: _v1._private.DataFilenames,
+        data_segments: _v1._private.DataSegments,
+        entry_parser: _v1._private.EntryParser,
+        parallel_parser: _v1._private.ParallelParser,
+        sqlite_storage: _v1._private.SQLiteStorage,
+        output: _v1.Output,
+    ):
+        self._args = args
+        self._data_filename = data_filename
+        self._data_filenames = data_filenames
+        self._data_segments = data_segments
+        self._entry_parser = entry_parser
+        self._parallel_parser = parallel_parser
+        self._sqlite_storage = sqlite_storage
+        self._output = output
+        self._max_gap = datetime.timedelta(hours=args.max_gap)
+
+    def __call__(self):
+        if self._sqlite_storage.enabled():
+            raise Exception("Cannot check entries stored in a SQLite database")
+
+        problem_count = 0
+        for filename, problem in self._problems():
+            problem_count += 1
+            if self._args.json:
+                record = {
+                    "filename": filename,
+                    "line": problem.line_number,
+                    "problem": problem.kind,
+                    "message": problem.message,
+                }
+                print(json.dumps(record), file=self._output)
+            else:
+                print("%s:%d: %s" % (filename, problem.line_number, problem.message), file=self._output)
+
+        if problem_count:
+            if not self._args.json:
+                print("%d problem%s found" % (problem_count, "" if problem_count == 1 else "s"), file=self._output)
+            sys.exit(1)
+
+    def _problems(self):
+        """Problems of each data file, along with the name of the file."""
+        if len(self._data_filenames) > 1:
+            # Each file is in chronological order on its own
+            for filename in self._data_filenames:
+                yield from self._check_file(filename, None)
+            return
+
+        if self._data_segments.enabled():
+            filenames = [self._data_segments.path(segment) for segment in self._data_segments.segments()]
+        else:
+            # Entries moved out of the data file by `utt archive` come before it
+            filenames = [self._data_segments.path(segment) for segment in self._data_segments.archives()]
+            filenames.append(self._data_filename)
+
+        previous_entry = None
+        for filename in filenames:
+            previous_entry = yield from self._check_file(filename, previous_entry)
+
+    def _check_file(self, filename, previous_entry):
+        """Yield the problems of a data file and return its last entry."""
+        entry_lines = EntryLines(DataFilename(filename))
+        if entry_lines.seekable() and self._parallel_parser.enabled(entry_lines.size()):
+            return (yield from self._check_file_in_parallel(filename, entry_lines, previous_entry))
+
+        log_check = LogCheck(self._entry_parser, self._max_gap, previous_entry)
+        numbered_lines = enumerate((line for _, line in entry_lines.lines_at(0)), 1)
+        for problem in log_check.check(numbered_lines):
+            yield filename, problem
+        return log_check.previous_entry
+
+    def _check_file_in_parallel(self, filename, entry_lines, previous_entry):
+        line_count = 0
+        chunks = self._parallel_parser.map_chunks(
+            functools.partial(check_chunk, max_gap=self._max_gap), entry_lines, 0, entry_lines.size()
+        )
+        for _, _, future in chunks:
+            chunk = future.result()
+            problems = [problem._replace(line_number=line_count + problem.line_number) for problem in chunk.problems]
+            if chunk.first_entry is not None:
+                # The first entry of the chunk is only compared to the entry before it here
+                problems.extend(
+                    compare_entries(
+                        previous_entry,
+                        chunk.first_entry,
+                        line_count + chunk.first_entry_line_number,
+                        self._max_gap,
+                    )
+                )
+                previous_entry = chunk.last_entry
+
+            for problem in sorted(problems, key=lambda problem: problem.line_number):
+                yield filename, problem
+            line_count += chunk.line_count
+
+        return previous_entry
+
+
+def add_args(parser: argparse.ArgumentParser):
+    parser.add_argument(
+        "--max-gap",
+        type=parse_positive_integer,
+        metavar="HOURS",
+        default=DEFAULT_MAX_GAP_HOURS,
+        help="report entries more than HOURS after the previous entry, unless they are hello entries "
+        "(default: %d)" % DEFAULT_MAX_GAP_HOURS,
+    )
+    parser.add_argument("--json", action="store_true", help="print the problems as JSON Lines")
+
+
+check_command = _v1.Command(
+    "check",
+    "Report the invalid lines, the entries out of order, at the same time or after a long gap",
+    CheckHandler,
+    add_args,
+)
+
+_v1.register_command(check_command)
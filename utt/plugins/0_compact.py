@@ -0,0 +1,195 @@
+import argparse
+import filecmp
+import locale
+import os
+import shutil
+import tempfile
+
+from ..api import _v1
+from ..components.data_file_lock import locked_data_file  # Private API
+from ..components.data_filename import DataFilename  # Private API
+from ..components.entry_lines import EntryLines, is_compressed  # Private API
+from ..components.parse_log import _parse_line  # Private API
+from ..constants import STDIN_DATA_FILENAME  # Private API
+
+
+class CompactHandler:
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        data_filename: _v1._private.DataFilename,
+        data_filenames: _v1._private.DataFilenames,
+        data_segments: _v1._private.DataSegments,
+        entry_parser: _v1._private.EntryParser,
+        entries_cache: _v1._private.EntriesCache,
+        entry_index: _v1._private.EntryIndex,
+        local_timezone: _v1._private.LocalTimezone,
+        sqlite_storage: _v1._private.SQLiteStorage,
+        timezone_config: _v1._private.TimezoneConfig,
+        output: _v1.Output,
+    ):
+        self._args = args
+        self._data_filename = data_filename
+        self._data_filenames = data_filenames
+        self._data_segments = data_segments
+        self._entry_parser = entry_parser
+        self._entries_cache = entries_cache
+        self._entry_index = entry_index
+        self._local_timezone = local_timezone
+        self._sqlite_storage = sqlite_storage
+        self._timezone_config = timezone_config
+        self._output = output
+
+    def __call__(self):
+        if len(self._data_filenames) > 1:
+            raise Exception("Cannot compact several data files")
+
+        if self._data_filename == STDIN_DATA_FILENAME:
+            raise Exception("Cannot compact the standard input")
+        if is_compressed(self._data_filename):
+            raise Exception("Cannot compact a compressed data file")
+        if self._sqlite_storage.enabled():
+            raise Exception("Cannot compact entries stored in a SQLite database")
+
+        if self._data_segments.enabled():
+            # Archives are not modified after they are written
+            filenames = [
+                self._data_segments.path(segment)
+                for segment in self._data_segments.segments()
+                if not is_compressed(segment.filename)
+            ]
+        else:
+            filenames = [self._data_filename] if os.path.exists(self._data_filename) else []
+
+        compactions = [_Compaction(filename, self._entry_parser, self._canonical_entry) for filename in filenames]
+        for compaction in compactions:
+            compaction.run()
+
+        if not any(compaction.changed for compaction in compactions):
+            print("%s is already compact" % self._data_filename, file=self._output)
+            return
+
+        if self._data_segments.enabled():
+            self._data_segments.rebuild(self._entry_parser)
+        else:
+            self._entries_cache.invalidate()
+            self._entry_index.rebuild()
+
+        print(
+            "Compacted %d entries, %d lines rewritten, %d redundant hello entries removed"
+            % (
+                sum(compaction.entry_count for compaction in compactions),
+                sum(compaction.rewritten_count for compaction in compactions),
+                sum(compaction.removed_count for compaction in compactions),
+            ),
+            file=self._output,
+        )
+
+    def _canonical_entry(self, entry):
+        """Entry as `add` writes it: without timezone offset, in local time, if timezones are disabled.
+
+        The offset is kept if the local time would be read back as
+        another time, like the first of the times repeated when clocks
+        are wound back.
+        """
+        if self._timezone_config.enabled():
+            return entry
+
+        local_datetime = entry.datetime.astimezone(self._local_timezone).replace(tzinfo=None)
+        if self._local_timezone.localize(local_datetime) != entry.datetime:
+            return entry
+
+        return _v1.Entry(
+            local_datetime,
+            entry.name,
+            entry.is_current_entry,
+            comment=entry.comment,
+        )
+
+
+class _Compaction:
+    """Rewrite of a data file in the canonical format.
+
+    Every entry is written on a line formatted like `add` does, days
+    are separated by exactly one empty line, and a hello entry followed
+    by another one is removed, unless it has a comment: the time
+    between them is not reported either way.
+    """
+
+    def __init__(self, filename, entry_parser, canonical_entry):
+        self._filename = filename
+        self._entry_parser = entry_parser
+        self._canonical_entry = canonical_entry
+        self._encoding = locale.getpreferredencoding(False)
+        self.entry_count = 0
+        self.rewritten_count = 0
+        self.removed_count = 0
+        self.changed = False
+
+    def run(self):
+        # Entries added while the data file is rewritten would be lost
+        with locked_data_file(self._filename):
+            self._rewrite()
+
+    def _rewrite(self):
+        fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(self._filename))
+        try:
+            with os.fdopen(fd, "wb") as tmp_file:
+                previous_entry = None
+                for entry, line in self._entry_lines():
+                    if previous_entry is not None and previous_entry.datetime.date() != entry.datetime.date():
+                        tmp_file.write(b"\n")
+                    tmp_file.write(line + b"\n")
+                    previous_entry = entry
+                    self.entry_count += 1
+
+            self.changed = not filecmp.cmp(self._filename, tmp_filename, shallow=False)
+            if self.changed:
+                shutil.copymode(self._filename, tmp_filename)
+                os.replace(tmp_filename, self._filename)
+            else:
+                os.unlink(tmp_filename)
+        except BaseException:
+            if os.path.exists(tmp_filename):
+                os.unlink(tmp_filename)
+            raise
+
+    def _entry_lines(self):
+        """Entries to keep and their canonical line."""
+        pending_hello = None
+        for entry, line in self._parsed_lines():
+            if pending_hello is not None:
+                if entry.name == _v1.HELLO_ENTRY_NAME and not pending_hello[0].comment:
+                    self.removed_count += 1
+                else:
+                    yield pending_hello
+                pending_hello = None
+
+            if entry.name == _v1.HELLO_ENTRY_NAME:
+                pending_hello = (entry, line)
+            else:
+                yield entry, line
+
+        if pending_hello is not None:
+            yield pending_hello
+
+    def _parsed_lines(self):
+        previous_entry = None
+        for line_number, (_, original_line) in enumerate(EntryLines(DataFilename(self._filename)).lines_at(0), 1):
+            parsed_line = _parse_line(previous_entry, line_number, original_line.strip(), self._entry_parser)
+            if parsed_line is None:
+                continue
+
+            previous_entry, entry = parsed_line
+            entry = self._canonical_entry(entry)
+            line = str(entry).encode(self._encoding)
+            if line != original_line.rstrip(b"\r\n"):
+                self.rewritten_count += 1
+            yield entry, line
+
+
+compact_command = _v1.Command(
+    "compact", "Rewrite the data in the format written by add", CompactHandler, lambda p: None
+)
+
+_v1.register_command(compact_command)
@@ -0,0 +1,87 @@
+import argparse
+import os
+
+from ..api import _v1
+from ..components.storage_config import LAYOUTS, SEGMENTED_LAYOUT, SQLITE_LAYOUT  # Private API
+from ..constants import ENTRY_FILENAME, SQLITE_FILENAME_SUFFIX  # Private API
+
+
+class ConvertHandler:
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        data_filename: _v1._private.DataFilename,
+        data_filenames: _v1._private.DataFilenames,
+        data_segments: _v1._private.DataSegments,
+        entry_parser: _v1._private.EntryParser,
+        sqlite_storage: _v1._private.SQLiteStorage,
+        output: _v1.Output,
+    ):
+        self._args = args
+        self._data_filename = data_filename
+        self._data_filenames = data_filenames
+        self._data_segments = data_segments
+        self._entry_parser = entry_parser
+        self._sqlite_storage = sqlite_storage
+        self._output = output
+
+    def __call__(self):
+        if len(self._data_filenames) > 1:
+            raise Exception("Cannot convert several data files")
+
+        if self._args.to == SEGMENTED_LAYOUT:
+            self._to_segmented()
+        elif self._args.to == SQLITE_LAYOUT:
+            self._to_sqlite()
+        else:
+            self._to_single_file()
+
+    def _to_segmented(self):
+        if os.path.isdir(self._data_filename) or self._data_segments.segments() != self._data_segments.archives():
+            raise Exception("Data is already segmented in %s" % self._data_segments.dirname())
+
+        segments = self._data_segments.import_file(self._data_filename, self._entry_parser)
+        print(
+            "Converted %s into %d segments in %s" % (self._data_filename, len(segments), self._data_segments.dirname()),
+            file=self._output,
+        )
+        print('Set "layout = segmented" in the [storage] section of your config to use them', file=self._output)
+
+    def _to_sqlite(self):
+        if os.path.isdir(self._data_filename) or self._data_filename.endswith(SQLITE_FILENAME_SUFFIX):
+            raise Exception("%s is not a single data file" % self._data_filename)
+
+        if self._sqlite_storage.count():
+            raise Exception("%s already contains entries" % self._sqlite_storage.filename())
+
+        count = self._sqlite_storage.import_file(self._data_filename)
+        print(
+            "Converted %s into %d entries in %s" % (self._data_filename, count, self._sqlite_storage.filename()),
+            file=self._output,
+        )
+        print('Set "layout = sqlite" in the [storage] section of your config to use them', file=self._output)
+
+    def _to_single_file(self):
+        filename = self._data_filename
+        if os.path.isdir(filename) or filename.endswith(SQLITE_FILENAME_SUFFIX):
+            filename = os.path.join(os.path.dirname(self._sqlite_storage.filename()), ENTRY_FILENAME)
+
+        if os.path.exists(filename):
+            raise Exception("%s already exists" % filename)
+
+        if self._sqlite_storage.enabled():
+            self._sqlite_storage.export_file(filename)
+            print("Converted %s into %s" % (self._sqlite_storage.filename(), filename), file=self._output)
+            return
+
+        self._data_segments.export_file(filename)
+        print("Converted %s into %s" % (self._data_segments.dirname(), filename), file=self._output)
+
+
+def add_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--to", choices=LAYOUTS, required=True, help="storage layout to convert the data to")
+
+
+convert_command = _v1.Command("convert", "Convert data to another storage layout", ConvertHandler, add_args)
+
+_v1.register_command(convert_command)
@@ -1,20 +1,241 @@
 import argparse
 import os
 import subprocess
+import tempfile
 
 from ..api import _v1
+from ..components.data_file_lock import locked_data_file  # Private API
+from ..components.entry_lines import block_checksums, changed_region, is_compressed  # Private API
+from ..components.parse_log import _parse_line, _parse_log  # Private API
+from ..components.report_args import parse_absolute_date, parse_positive_integer  # Private API
+from ..constants import ENTRY_FILENAME, STDIN_DATA_FILENAME  # Private API
 
 
 class EditHandler:
-    def __init__(self, args: argparse.Namespace, data_filename: _v1._private.DataFilename):
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        data_filename: _v1._private.DataFilename,
+        data_filenames: _v1._private.DataFilenames,
+        entries_cache: _v1._private.EntriesCache,
+        entry_index: _v1._private.EntryIndex,
+        entry_lines: _v1._private.EntryLines,
+        data_segments: _v1._private.DataSegments,
+        entry_parser: _v1._private.EntryParser,
+        sqlite_storage: _v1._private.SQLiteStorage,
+    ):
         self._args = args
         self._data_filename = data_filename
+        self._data_filenames = data_filenames
+        self._entries_cache = entries_cache
+        self._entry_index = entry_index
+        self._entry_lines = entry_lines
+        self._data_segments = data_segments
+        self._entry_parser = entry_parser
+        self._sqlite_storage = sqlite_storage
 
     def __call__(self):
+        if len(self._data_filenames) > 1:
+            raise Exception("Cannot edit several data files")
+
+        if (self._args.since is not None or self._args.last is not None) and os.path.exists(self._data_filename):
+            self._edit_window()
+            return
+
+        if self._sqlite_storage.enabled():
+            self._edit_database()
+            return
+
+        if self._data_segments.enabled():
+            self._edit_last_segment()
+            return
+
+        before = block_checksums(self._data_filename)
         _run_editor(_editor(), self._data_filename)
 
+        region = changed_region(before, block_checksums(self._data_filename))
+        if region is None:
+            self._entry_index.update()
+            return
+
+        self._revalidate(*region)
+
+    def _edit_last_segment(self):
+        segments = self._data_segments.segments()
+        if not segments:
+            raise Exception("No segment to edit in %s" % self._data_segments.dirname())
+
+        filename = self._data_segments.path(segments[-1])
+        before = block_checksums(filename)
+        _run_editor(_editor(), filename)
+
+        if changed_region(before, block_checksums(filename)) is not None:
+            self._data_segments.refresh(segments[-1], self._entry_parser)
+
+    def _edit_database(self):
+        # The entries are edited in the text format and imported back
+        with tempfile.TemporaryDirectory() as dirname:
+            filename = os.path.join(dirname, ENTRY_FILENAME)
+            self._sqlite_storage.export_file(filename)
+            before = block_checksums(filename)
+            _run_editor(_editor(), filename)
+
+            if changed_region(before, block_checksums(filename)) is not None:
+                self._sqlite_storage.import_file(filename, replace=True)
+
+    def _revalidate(self, start, end):
+        """Check the entries of the data file changed between byte `start` and `end`.
+
+        The cache and the index are only invalidated from the line of
+        `start`, and the entries are checked from there through the
+        first entry after `end`.
+        """
+        line_start = self._line_start(start)
+        self._entries_cache.invalidate_from(line_start)
+        self._entry_index.invalidate_from(line_start)
+
+        previous_entry = self._previous_entry(line_start)
+        first_line_number = self._entry_lines.count_lines(line_start) + 1
+        lines = enumerate(self._entry_lines.lines_at(line_start), first_line_number)
+
+        try:
+            for line_number, (line_offset, line) in lines:
+                parsed_line = _parse_line(previous_entry, line_number, line.strip(), self._entry_parser)
+                if parsed_line is not None:
+                    previous_entry, _ = parsed_line
+                    if line_offset >= end:
+                        break
+        except Exception as err:
+            raise type(err)("%s: %s" % (self._data_filename, err)) from err
+
+    def _line_start(self, offset):
+        if offset == 0:
+            return 0
+
+        with open(self._data_filename, "rb") as data_file:
+            data_file.seek(offset - 1)
+            if data_file.read(1) == b"\n":
+                return offset
+
+        line_offset, _ = next(self._entry_lines.reversed_lines(offset))
+        return line_offset
+
+    def _previous_entry(self, offset):
+        """Last entry before byte `offset`."""
+        for _, line in self._entry_lines.reversed_lines(offset):
+            entry = self._entry_parser.parse(line.strip())
+            if entry is not None:
+                return entry
+
+        return None
+
+    def _edit_window(self):
+        """Edit the last entries of the data file only.
+
+        They are copied to a temporary file, which is spliced back into
+        the data file at the offset of the first of them once it's
+        edited, so that the entries before are not rewritten. The
+        temporary file is only removed once the data file is written.
+        """
+        if (
+            self._data_filename == STDIN_DATA_FILENAME
+            or is_compressed(self._data_filename)
+            or self._sqlite_storage.enabled()
+            or self._data_segments.enabled()
+        ):
+            raise Exception("--since and --last are only supported with a single data file")
+
+        offset, previous_entry = self._window_start()
+        with open(self._data_filename, "rb") as data_file:
+            data_file.seek(offset)
+            window = data_file.read()
+
+        fd, window_filename = tempfile.mkstemp(prefix="utt-edit-", suffix=".log")
+        with os.fdopen(fd, "wb") as window_file:
+            window_file.write(window)
+
+        _run_editor(_editor(), window_filename)
+
+        with open(window_filename, "rb") as window_file:
+            edited_window = window_file.read()
+
+        if edited_window != window:
+            try:
+                lines = enumerate(edited_window.splitlines(keepends=True), 1)
+                for _ in _parse_log(lines, self._entry_parser, previous_entry):
+                    pass
+                _splice(self._data_filename, offset, window, edited_window)
+            except Exception as err:
+                raise Exception("%s\nThe edited entries are kept in %s" % (err, window_filename)) from err
+
+            line_start = self._line_start(offset)
+            self._entries_cache.invalidate_from(line_start)
+            self._entry_index.invalidate_from(line_start)
+
+        os.unlink(window_filename)
+
+    def _window_start(self):
+        """Offset of the first line of the window, and the entry before it."""
+        offset = self._entry_lines.size()
+        entry_count = 0
+
+        for line_offset, line in self._entry_lines.reversed_lines():
+            line = line.strip()
+            if not line:
+                continue
+
+            # Invalid lines are part of the window, so that they can be
+            # fixed, but don't count as entries
+            entry = self._entry_parser.parse(line)
+            if entry is not None:
+                if not self._in_window(entry, entry_count):
+                    return offset, entry
+                entry_count += 1
+
+            offset = line_offset
+
+        return offset, None
+
+    def _in_window(self, entry, entry_count):
+        if self._args.since is not None:
+            return entry.datetime.date() >= self._args.since
+
+        return entry_count < self._args.last
+
+
+def _splice(filename, offset, window, edited_window):
+    """Replace the data file from byte `offset`, which holds `window`, with `edited_window`.
+
+    The data file is locked like when entries are added and must not
+    have been modified in the meantime. Only the bytes from `offset`
+    are written, in place, and the file is then truncated after them.
+    """
+    with locked_data_file(filename, os.O_RDWR) as fd, open(fd, "r+b", closefd=False) as data_file:
+        data_file.seek(offset)
+        if data_file.read() != window:
+            raise Exception("%s was modified while it was being edited" % filename)
+
+        # The window may start at the end of a last line without newline
+        if offset > 0 and edited_window and os.pread(fd, 1, offset - 1) != b"\n":
+            edited_window = b"\n" + edited_window
+
+        data_file.seek(offset)
+        data_file.write(edited_window)
+        data_file.flush()
+        os.ftruncate(fd, offset + len(edited_window))
+
+
+def add_args(parser: argparse.ArgumentParser):
+    window_group = parser.add_mutually_exclusive_group()
+    window_group.add_argument(
+        "--since",
+        type=parse_absolute_date,
+        help="only edit the entries from this date (YYYY-MM-DD)",
+    )
+    window_group.add_argument("--last", type=parse_positive_integer, metavar="N", help="only edit the last N entries")
+
 
-edit_command = _v1.Command("edit", "Edit task log using your system's default editor", EditHandler, lambda p: None)
+edit_command = _v1.Command("edit", "Edit task log using your system's default editor", EditHandler, add_args)
 
 _v1.register_command(edit_command)
 
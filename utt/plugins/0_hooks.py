@@ -0,0 +1,78 @@
+import argparse
+import time
+import traceback
+
+from ..api import _v1
+
+# Time the background worker waits for more entries before running the hooks
+BATCH_DELAY = 1.0
+
+
+class HooksHandler:
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        hooks: _v1._private.Hooks,
+        hook_queue: _v1._private.HookQueue,
+        output: _v1.Output,
+    ):
+        self._args = args
+        self._hooks = hooks
+        self._hook_queue = hook_queue
+        self._output = output
+
+    def __call__(self):
+        if self._args.run:
+            self._run()
+            return
+
+        for hook in self._hooks:
+            print(hook.name, file=self._output)
+
+        if self._hook_queue.pending():
+            print(
+                "Entries are waiting to be passed to the hooks, errors are logged to %s"
+                % self._hook_queue.log_filename(),
+                file=self._output,
+            )
+
+    def _run(self):
+        delay = BATCH_DELAY if self._args.background else 0
+
+        # The worker that runs the hooks releases its lock once the queue
+        # is empty. Entries queued in the meantime are taken by whichever
+        # worker last releases the lock.
+        while True:
+            with self._hook_queue.worker_lock(blocking=not self._args.background) as acquired:
+                if not acquired:
+                    return
+
+                time.sleep(delay)
+                delay = 0
+                entries = self._hook_queue.take()
+                while entries:
+                    self._run_hooks(entries)
+                    entries = self._hook_queue.take()
+
+            if not self._hook_queue.pending():
+                return
+
+    def _run_hooks(self, entries):
+        for hook in self._hooks:
+            try:
+                _v1._private.container[hook.handler_class](entries)
+            except Exception:
+                # A failing hook doesn't prevent the others from running
+                print("Hook %s failed:" % hook.name, file=self._output)
+                traceback.print_exc(file=self._output)
+
+
+def add_args(parser: argparse.ArgumentParser):
+    parser.add_argument("--run", action="store_true", help="pass the entries added since they last ran to the hooks")
+    # Used by the worker started in the background after entries are added
+    parser.add_argument("--background", action="store_true", help=argparse.SUPPRESS)
+
+
+hooks_command = _v1.Command("hooks", "List the hooks run after entries are added, or run them", HooksHandler, add_args)
+
+_v1.register_command(hooks_command)
@@ -0,0 +1,111 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+
+from dateutil.parser import isoparse
+
+from ..api import _v1
+from ..components.external_sort import external_sort  # Private API
+from ..constants import STDIN_DATA_FILENAME  # Private API
+
+FORMATS = ["csv", "jsonl"]
+FORMAT_EXTENSIONS = {".csv": "csv", ".json": "jsonl", ".jsonl": "jsonl"}
+
+
+class ImportHandler:
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        add_entry: _v1._private.AddEntry,
+        local_timezone: _v1._private.LocalTimezone,
+        output: _v1.Output,
+    ):
+        self._args = args
+        self._add_entry = add_entry
+        self._local_timezone = local_timezone
+        self._output = output
+
+    def __call__(self):
+        import_format = self._args.format or _format_from_filename(self._args.filename)
+
+        with _open(self._args.filename) as import_file:
+            records = _read_csv(import_file) if import_format == "csv" else _read_jsonl(import_file)
+            entries = (self._entry(number, record) for number, record in records)
+            if self._args.sort:
+                entries = external_sort(entries, key=lambda entry: entry.datetime)
+            entries = list(entries)
+
+        self._add_entry.add_all(entries)
+        print("Imported %d entries" % len(entries), file=self._output)
+
+    def _entry(self, number, record):
+        """Entry of a record, localized like the entries added with `add`."""
+        try:
+            entry_datetime = isoparse(record["datetime"].strip())
+            name = record["name"].strip()
+            comment = (record.get("comment") or "").strip() or None
+        except (AttributeError, KeyError, TypeError, ValueError) as err:
+            raise ValueError("Invalid record %d: %s" % (number, err)) from err
+
+        if not name or "\n" in name or (comment and "\n" in comment):
+            raise ValueError("Invalid record %d: the name must be a single non-empty line" % number)
+
+        if entry_datetime.tzinfo is None:
+            entry_datetime = self._local_timezone.localize(entry_datetime)
+        else:
+            entry_datetime = entry_datetime.astimezone(self._local_timezone)
+
+        return _v1.Entry(entry_datetime, name, False, comment=comment)
+
+
+def _format_from_filename(filename):
+    import_format = FORMAT_EXTENSIONS.get(os.path.splitext(filename)[1])
+    if import_format is None:
+        raise Exception("Cannot guess the format of %s, use --format" % filename)
+    return import_format
+
+
+def _open(filename):
+    if filename == STDIN_DATA_FILENAME:
+        return io.TextIOWrapper(sys.stdin.buffer, newline="")
+    return open(filename, newline="")
+
+
+def _read_csv(import_file):
+    # The header is line 1
+    return enumerate(csv.DictReader(import_file), 2)
+
+
+def _read_jsonl(import_file):
+    for number, line in enumerate(import_file, 1):
+        if not line.strip():
+            continue
+
+        try:
+            yield number, json.loads(line)
+        except ValueError as err:
+            raise ValueError("Invalid record %d: %s" % (number, err)) from err
+
+
+def add_args(parser: argparse.ArgumentParser):
+    parser.add_argument("filename", help="file to import, '-' for the standard input")
+    parser.add_argument(
+        "--format",
+        choices=FORMATS,
+        help="format of the file, guessed from its extension by default."
+        " CSV files have a header with datetime, name and comment (optional) columns."
+        " JSON Lines have one object per line with the same keys",
+    )
+    parser.add_argument(
+        "--sort",
+        action="store_true",
+        help="sort the entries into chronological order, instead of requiring them to be sorted",
+    )
+
+
+import_command = _v1.Command("import", "Import entries from a CSV or JSON Lines file", ImportHandler, add_args)
+
+_v1.register_command(import_command)
@@ -0,0 +1,117 @@
+import argparse
+import heapq
+import itertools
+import json
+
+from ..api import _v1
+from ..components.data_filename import DataFilename  # Private API
+from ..components.data_segments import reversed_segment_entries  # Private API
+from ..components.entry_lines import EntryLines  # Private API
+from ..components.report_args import parse_absolute_date, parse_positive_integer  # Private API
+
+DEFAULT_ENTRY_COUNT = 10
+
+
+class LogHandler:
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        data_filenames: _v1._private.DataFilenames,
+        entry_lines: _v1._private.EntryLines,
+        entry_parser: _v1._private.EntryParser,
+        data_segments: _v1._private.DataSegments,
+        sqlite_storage: _v1._private.SQLiteStorage,
+        timezone_config: _v1._private.TimezoneConfig,
+        output: _v1.Output,
+    ):
+        self._args = args
+        self._data_filenames = data_filenames
+        self._entry_lines = entry_lines
+        self._entry_parser = entry_parser
+        self._data_segments = data_segments
+        self._sqlite_storage = sqlite_storage
+        self._timezone_config = timezone_config
+        self._output = output
+
+    def __call__(self):
+        if self._args.since is not None:
+            entries = itertools.takewhile(
+                lambda entry: entry.datetime.date() >= self._args.since, self._reversed_entries()
+            )
+        else:
+            entries = itertools.islice(self._reversed_entries(), self._args.last)
+
+        for entry in reversed(list(entries)):
+            entry = _localize(self._timezone_config, entry)
+            if self._args.json:
+                print(json.dumps(_record(entry)), file=self._output)
+            else:
+                print(entry, file=self._output)
+
+    def _reversed_entries(self):
+        """Entries from the last to the first, read from the end of the data."""
+        if len(self._data_filenames) > 1:
+            return heapq.merge(
+                *[
+                    _reversed_entries(EntryLines(DataFilename(filename)), self._entry_parser)
+                    for filename in self._data_filenames
+                ],
+                key=lambda entry: entry.datetime,
+                reverse=True,
+            )
+
+        if self._sqlite_storage.enabled():
+            return self._sqlite_storage.reversed_entries()
+
+        if self._data_segments.enabled():
+            return reversed_segment_entries(self._data_segments, self._data_segments.segments(), self._entry_parser)
+
+        # Entries moved out of the data file by `utt archive` come before it
+        return itertools.chain(
+            _reversed_entries(self._entry_lines, self._entry_parser),
+            reversed_segment_entries(self._data_segments, self._data_segments.archives(), self._entry_parser),
+        )
+
+
+def _reversed_entries(entry_lines, entry_parser):
+    for _, line in entry_lines.reversed_lines():
+        entry = entry_parser.parse(line.strip())
+        if entry is not None:
+            yield entry
+
+
+def _localize(timezone_config, entry):
+    if timezone_config.enabled():
+        return entry
+
+    return _v1.Entry(entry.datetime.replace(tzinfo=None), entry.name, entry.is_current_entry, comment=entry.comment)
+
+
+def _record(entry):
+    """Entry as a JSON object, in the format read by `utt import`."""
+    record = {"datetime": entry.datetime.isoformat(), "name": entry.name}
+    if entry.comment:
+        record["comment"] = entry.comment
+    return record
+
+
+def add_args(parser: argparse.ArgumentParser):
+    window_group = parser.add_mutually_exclusive_group()
+    window_group.add_argument(
+        "--since",
+        type=parse_absolute_date,
+        help="list the entries from this date (YYYY-MM-DD)",
+    )
+    window_group.add_argument(
+        "--last",
+        type=parse_positive_integer,
+        metavar="N",
+        default=DEFAULT_ENTRY_COUNT,
+        help="list the last N entries (default: %d)" % DEFAULT_ENTRY_COUNT,
+    )
+    parser.add_argument("--json", action="store_true", help="print the entries as JSON Lines")
+
+
+log_command = _v1.Command("log", "List the most recent entries", LogHandler, add_args)
+
+_v1.register_command(log_command)
@@ -0,0 +1,131 @@
+import argparse
+import itertools
+import os
+import shutil
+import tempfile
+
+from ..api import _v1
+from ..components.data_file_lock import locked_data_file  # Private API
+from ..components.entry_lines import EntryLines, is_compressed  # Private API
+from ..components.external_sort import external_sort  # Private API
+from ..components.parse_log import _parse_line  # Private API
+from ..constants import STDIN_DATA_FILENAME  # Private API
+
+
+class SortHandler:
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        data_filename: _v1._private.DataFilename,
+        data_filenames: _v1._private.DataFilenames,
+        data_segments: _v1._private.DataSegments,
+        entry_parser: _v1._private.EntryParser,
+        entries_cache: _v1._private.EntriesCache,
+        entry_index: _v1._private.EntryIndex,
+        sqlite_storage: _v1._private.SQLiteStorage,
+        output: _v1.Output,
+    ):
+        self._args = args
+        self._data_filename = data_filename
+        self._data_filenames = data_filenames
+        self._data_segments = data_segments
+        self._entry_parser = entry_parser
+        self._entries_cache = entries_cache
+        self._entry_index = entry_index
+        self._sqlite_storage = sqlite_storage
+        self._output = output
+
+    def __call__(self):
+        if len(self._data_filenames) > 1:
+            raise Exception("Cannot sort several data files")
+
+        if self._data_filename == STDIN_DATA_FILENAME:
+            raise Exception("Cannot sort the standard input")
+        if is_compressed(self._data_filename):
+            raise Exception("Cannot sort a compressed data file")
+        if self._sqlite_storage.enabled():
+            raise Exception("Entries stored in a SQLite database are always sorted")
+        if self._data_segments.enabled():
+            raise Exception("Cannot sort segmented data, convert it to a single file first")
+
+        if not os.path.exists(self._data_filename):
+            print("%s is already in chronological order" % self._data_filename, file=self._output)
+            return
+
+        # Entries added while the data file is sorted would be lost
+        with locked_data_file(self._data_filename):
+            lines = _UnsortedEntries(self._data_filename, self._entry_parser)
+            sorted_lines = external_sort(lines, key=lambda entry_line: entry_line[0].datetime)
+
+            # The data file has been read entirely once the first line is sorted
+            first_line = next(sorted_lines, None)
+            if not lines.out_of_order_count:
+                sorted_lines.close()
+                print("%s is already in chronological order" % self._data_filename, file=self._output)
+                return
+
+            _write_sorted_lines(self._data_filename, first_line, sorted_lines)
+
+        self._entries_cache.invalidate()
+        self._entry_index.rebuild()
+
+        print(
+            "Sorted %d entries, %d were out of order" % (lines.entry_count, lines.out_of_order_count),
+            file=self._output,
+        )
+
+
+class _UnsortedEntries:
+    """Entries of a data file along with their line, in file order.
+
+    Entries are not required to be in chronological order, but those
+    that are earlier than the entry before them are counted.
+    """
+
+    def __init__(self, data_filename, entry_parser):
+        self._data_filename = data_filename
+        self._entry_parser = entry_parser
+        self.entry_count = 0
+        self.out_of_order_count = 0
+
+    def __iter__(self):
+        previous_entry = None
+        for line_number, (_, line) in enumerate(EntryLines(self._data_filename).lines_at(0), 1):
+            line = line.strip()
+            parsed_line = _parse_line(None, line_number, line, self._entry_parser)
+            if parsed_line is None:
+                continue
+
+            _, entry = parsed_line
+            self.entry_count += 1
+            if previous_entry is not None and previous_entry.datetime > entry.datetime:
+                self.out_of_order_count += 1
+            previous_entry = entry
+
+            yield entry, line
+
+
+def _write_sorted_lines(filename, first_line, sorted_lines):
+    """Replace a data file with sorted lines, atomically.
+
+    Days are separated by an empty line, like entries added with `add`.
+    """
+    fd, tmp_filename = tempfile.mkstemp(dir=os.path.dirname(filename))
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            previous_entry = None
+            for entry, line in itertools.chain([first_line], sorted_lines):
+                if previous_entry is not None and previous_entry.datetime.date() != entry.datetime.date():
+                    tmp_file.write(b"\n")
+                tmp_file.write(line + b"\n")
+                previous_entry = entry
+        shutil.copymode(filename, tmp_filename)
+        os.replace(tmp_filename, filename)
+    except BaseException:
+        os.unlink(tmp_filename)
+        raise
+
+
+sort_command = _v1.Command("sort", "Sort entries into chronological order", SortHandler, lambda p: None)
+
+_v1.register_command(sort_command)
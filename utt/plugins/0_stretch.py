@@ -3,6 +3,7 @@ import copy
 
 from ..api import _v1
 from ..components.add_entry import AddEntry  # Private API
+from ..components.last_entry import LastEntry  # Private API
 from ..components.timezone_config import TimezoneConfig  # Private API
 
 
@@ -12,21 +13,21 @@ class StretchHandler:
         args: argparse.Namespace,
         now: _v1.Now,
         add_entry: AddEntry,
-        entries: _v1.Entries,
+        last_entry: LastEntry,
         timezone_config: TimezoneConfig,
         output: _v1.Output,
     ):
         self._args = args
         self._now = now
         self._add_entry = add_entry
-        self._entries = entries
+        self._last_entry = last_entry
         self._timezone_config = timezone_config
         self._output = output
 
     def __call__(self):
-        if not self._entries:
+        if self._last_entry is None:
             raise Exception("No entry to stretch")
-        latest_entry = self._entries[-1]
+        latest_entry = self._last_entry
         new_entry = _v1.Entry(self._now, latest_entry.name, False, comment=latest_entry.comment)
         self._add_entry(new_entry)
         print("stretched " + str(_localize(self._timezone_config, latest_entry)), file=self._output)
@@ -0,0 +1,125 @@
+import argparse
+import concurrent.futures
+import csv
+import functools
+import io
+import os
+
+from ..api import _v1
+from ..components.parse_config import ParseConfig  # Private API
+from ..constants import ENTRY_FILENAME  # Private API
+
+
+class TeamReportHandler:
+    def __init__(
+        self,
+        args: argparse.Namespace,
+        parse_config: _v1._private.ParseConfig,
+        output: _v1.Output,
+    ):
+        self._args = args
+        self._parse_config = parse_config
+        self._output = output
+
+    def __call__(self):
+        user_data_filenames = _user_data_filenames(self._args.dirname)
+        if not user_data_filenames:
+            raise Exception("No data file in %s" % self._args.dirname)
+
+        users = [user for user, _ in user_data_filenames]
+        reports = self._reports([data_filename for _, data_filename in user_data_filenames])
+
+        if self._args.csv_section:
+            _write_csv_reports(users, reports, self._output)
+        else:
+            for user, report in zip(users, reports):
+                print("{:=^80}".format(" " + user + " "), file=self._output)
+                self._output.write(report)
+
+    def _reports(self, data_filenames):
+        """The report of each data file, rendered in a worker process."""
+        workers = min(self._parse_config.workers(), len(data_filenames))
+        render_report = functools.partial(_render_report, self._args, lazy_parse=self._parse_config.lazy())
+        if workers == 1:
+            return [render_report(data_filename) for data_filename in data_filenames]
+
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_load_plugins) as executor:
+            return list(executor.map(render_report, data_filenames))
+
+
+def _user_data_filenames(dirname):
+    """(user, data filename) for each `USER.log` and `USER/utt.log` in `dirname`, by user."""
+    user_data_filenames = []
+    for name in sorted(os.listdir(dirname)):
+        path = os.path.join(dirname, name)
+        if os.path.isfile(path) and name.endswith(".log"):
+            user_data_filenames.append((name[: -len(".log")], path))
+        elif os.path.isfile(os.path.join(path, ENTRY_FILENAME)):
+            user_data_filenames.append((name, os.path.join(path, ENTRY_FILENAME)))
+    return user_data_filenames
+
+
+def _load_plugins():
+    # Worker processes that don't start as a copy of this one only
+    # know of the components registered by the plugins once they are
+    # loaded again
+    from ..main import load_plugins  # Private API
+
+    load_plugins()
+
+
+def _render_report(args, data_filename, lazy_parse):
+    """Render the report of a data file, as `utt report --data data_filename` does."""
+    args = argparse.Namespace(**vars(args))
+    args.data_filename = data_filename
+    args.data_filenames = [data_filename]
+    output = io.StringIO()
+
+    container = _v1._private.create_container()
+    for interface, constructor in _v1._private.components.items():
+        container[interface] = constructor
+    container[argparse.Namespace] = args
+    container[_v1.Output] = output
+    # The data files are already parsed in parallel
+    container[ParseConfig] = ParseConfig(1, lazy_parse)
+
+    if args.csv_section:
+        view = container[_v1._private.CSVReportView]
+    else:
+        view = container[_v1.ReportView]
+    view.render(output)
+    return output.getvalue()
+
+
+def _write_csv_reports(users, reports, output):
+    """Join the CSV reports of the users, with a first column for the user."""
+    writer = csv.writer(output)
+    header_written = False
+    for user, report in zip(users, reports):
+        rows = list(csv.reader(io.StringIO(report)))
+        if not rows or len(rows[0]) == 1:
+            # No activities for this time range
+            continue
+
+        header, rows = rows[0], rows[1:]
+        if not header_written:
+            writer.writerow(["User"] + header)
+            header_written = True
+        for row in rows:
+            writer.writerow([user] + row)
+
+    if not header_written:
+        print(" -- No activities for this time range --", file=output)
+
+
+def add_args(parser: argparse.ArgumentParser):
+    parser.add_argument("dirname", metavar="DIR", help="directory of the data files, USER.log or USER/utt.log")
+    # Same arguments as `utt report`
+    _v1._private.commands["report"].add_args(parser)
+
+
+team_report_command = _v1.Command(
+    "team-report", "Summarize the tasks of each data file of a directory", TeamReportHandler, add_args
+)
+
+_v1.register_command(team_report_command)